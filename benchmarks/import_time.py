@@ -0,0 +1,51 @@
+"""Measure cold import time of espyn
+
+Each statement is timed in a fresh interpreter (best of N), so module
+caches from earlier runs do not hide import cost. Exits non-zero if
+``import espyn`` exceeds the budget.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat N] [--budget MS]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+STATEMENTS = (
+    "import espyn",
+    "from espyn import League",
+    "from espyn import jsonlib",
+)
+
+
+def import_time(statement: str) -> float:
+    # wall-clock seconds of statement, measured inside the child
+    code = ("import time; t = time.perf_counter(); {}; "
+            "print(time.perf_counter() - t)".format(statement))
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return float(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=20.,
+                        help="budget for 'import espyn' in ms")
+    args = parser.parse_args()
+    results = dict()
+    for statement in STATEMENTS:
+        best = min(import_time(statement) for _ in range(args.repeat))
+        results[statement] = best * 1e3
+        print(f"{statement:<28} {best * 1e3:8.2f} ms")
+    if results["import espyn"] > args.budget:
+        print(f"'import espyn' exceeds budget of {args.budget:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
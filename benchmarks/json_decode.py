@@ -0,0 +1,43 @@
+"""Compare JSON backends decoding the bundled fixture payloads
+
+Reports the best-of-N time to decode each file in ``tests/data`` from
+bytes with every installed backend, plus the previous text-mode path
+(``json.loads(raw.decode())``) for reference.
+
+Usage::
+
+    python benchmarks/json_decode.py [--repeat N]
+"""
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from espyn import jsonlib  # noqa: E402
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for fname in sorted(os.listdir(DATA_DIR)):
+        with open(os.path.join(DATA_DIR, fname), "rb") as f:
+            raw = f.read()
+        print(f"{fname} ({len(raw) / 1024:,.0f} KiB)")
+        cases = [("json (str)", lambda: json.loads(raw.decode()))]
+        for name in jsonlib.available_backends():
+            loads = jsonlib.BACKENDS[name]()[0]
+            cases.append((name, lambda loads=loads: loads(raw)))
+        for name, func in cases:
+            best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print(f"  {name:<12} {best * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
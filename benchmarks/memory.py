@@ -0,0 +1,66 @@
+"""Measure resident bytes per hydrated league with tracemalloc
+
+Builds leagues from the bundled fixtures (``tests/data``) through a
+`LocalCache`, loads the matchup 10 boxscores, and reports the memory
+still allocated while the leagues are alive. Transient allocations
+(e.g. JSON decoding) are excluded since they are freed after loading.
+
+Usage::
+
+    python benchmarks/memory.py [--leagues N] [--keep-raw]
+"""
+import os
+import gc
+import sys
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from espyn import League  # noqa: E402
+from espyn.caches import LocalCache  # noqa: E402
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+LEAGUE_ID, SEASON, MATCHUP_NUM = 1603206, 2020, 10
+
+
+def hydrate(**kwargs):
+    league = League(LEAGUE_ID, SEASON, LocalCache(DATA_DIR), **kwargs)
+    league.get_matchups_by_number(MATCHUP_NUM, boxscore=True)
+    return league
+
+
+def measure(n_leagues, **kwargs):
+    """Get mean bytes retained per hydrated league
+
+    :param n_leagues: number of leagues to keep resident
+    :type n_leagues: int
+    :return: bytes per league
+    :rtype: float
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    leagues = [hydrate(**kwargs) for _ in range(n_leagues)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del leagues
+    return (after - before) / n_leagues
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leagues", type=int, default=5)
+    parser.add_argument("--keep-raw", action="store_true",
+                        help="retain raw API payloads on league and matchups")
+    args = parser.parse_args()
+    kwargs = {"keep_raw": True} if args.keep_raw else {}
+    per_league = measure(args.leagues, **kwargs)
+    print(f"{per_league / 1024:,.1f} KiB per hydrated league "
+          f"({args.leagues} leagues, keep_raw={args.keep_raw})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Time core operations on the bundled fixtures and compare to a baseline
+
+Cases use ``tests/data/2020_1603206.json`` (league) and
+``2020_1603206_sp10.json`` (scoring period 10), plus scaled variants
+of the scoring period whose schedule entries are repeated ``N`` times
+and a synthetic 20-team league with two-week matchups ("syn20").
+Each case is called in ``N`` loops long enough (``--min-time``) for
+timer resolution and scheduling jitter not to dominate sub-millisecond
+cases, with a fresh setup per call, and reports the median time per
+call; cache cases also report throughput in MiB/s.
+
+Each loop is preceded by a loop of a fixed pure-Python calibration
+workload, and the median ratio of the case's time per call to the
+calibration's is compared to ``benchmarks/baseline.json``. This absorbs
+some of the difference between machines and of drift in load during a
+run; baselines are still best regenerated with ``--save`` before
+comparing changes. A case regresses if its ratio exceeds its baseline's
+by more than the threshold (as a ratio), in which case the script
+exits non-zero.
+
+Usage::
+
+    python benchmarks/suite.py [--repeat N] [--min-time S] [--scale N ...]
+                               [--threshold R] [--save] [-k PATTERN]
+"""
+import os
+import sys
+import copy
+import json
+import timeit
+import statistics
+import argparse
+import tempfile
+import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from espyn import jsonlib  # noqa: E402
+from espyn.league import League  # noqa: E402
+from espyn.team_week import TeamWeek  # noqa: E402
+from espyn.caches import Cache, LocalCache  # noqa: E402
+from espyn.registry import PlayerRegistry  # noqa: E402
+from espyn.synthetic import SyntheticLeague  # noqa: E402
+
+
+HERE = os.path.dirname(__file__)
+DATA_DIR = os.path.join(HERE, "..", "tests", "data")
+BASELINE = os.path.join(HERE, "baseline.json")
+LEAGUE_ID, SEASON, SCORING_PERIOD, MATCHUP_NUM = 1603206, 2020, 10, 10
+# fixed "today" (after the fixture's season), so results do not
+# depend on when the suite runs
+AS_OF = datetime.date(2021, 2, 1)
+
+
+class MemoryCache(Cache):
+    """Cache of decoded payloads, so cases exclude file I/O and decoding"""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def load(self, scoring_period=None):
+        return self.payloads.get(scoring_period)
+
+    def save(self, data, scoring_period=None):
+        pass
+
+
+def read_fixture(scoring_period=None):
+    fname = f"{SEASON}_{LEAGUE_ID}"
+    if scoring_period is not None:
+        fname += f"_sp{scoring_period}"
+    with open(os.path.join(DATA_DIR, fname + ".json"), "rb") as f:
+        return jsonlib.loads(f.read())
+
+
+def scale_period(data, scale):
+    """Repeat a scoring period's schedule entries `scale` times"""
+    if scale == 1:
+        return data
+    res = dict(data)
+    res["schedule"] = [copy.deepcopy(i) for _ in range(scale)
+                       for i in data["schedule"]]
+    return res
+
+
+def boxscore_entries(data):
+    for item in data["schedule"]:
+        for side in ("home", "away"):
+            team = item.get(side)
+            if team and "rosterForCurrentScoringPeriod" in team:
+                yield team
+
+
+def make_cases(scale):
+    """Get benchmark cases for a scale factor
+
+    :return: case name to (setup, func, bytes processed or None);
+             `func` is called with the result of `setup`
+    """
+    league_data = read_fixture()
+    period = read_fixture(SCORING_PERIOD)
+    scaled = scale_period(period, scale)
+    payloads = {None: league_data, SCORING_PERIOD: period}
+    score_values = {i["statId"]: i["points"] for i in
+                    league_data["settings"]["scoringSettings"]["scoringItems"]}
+    tmp = tempfile.TemporaryDirectory()
+    disk = LocalCache(tmp.name)
+    disk.league = League(LEAGUE_ID, SEASON, MemoryCache(payloads))
+    raw_size = len(jsonlib.dumps(scaled))
+    disk.save(scaled, SCORING_PERIOD)
+
+    syn = SyntheticLeague(num_teams=20, matchup_length=2)
+    syn_payloads = {None: syn.league_data()}
+    for sp in syn.matchup_periods[1]:
+        syn_payloads[sp] = syn.scoring_period_data(sp)
+
+    def new_league(payloads=payloads):
+        return League(LEAGUE_ID, SEASON, MemoryCache(payloads),
+                      registry=PlayerRegistry(), as_of=AS_OF)
+
+    def hydrated_league():
+        league = new_league()
+        league._populate_boxscores(MATCHUP_NUM)
+        return league
+
+    def build_team_weeks(_):
+        return [TeamWeek(team, SCORING_PERIOD).slots
+                for team in boxscore_entries(scaled)]
+
+    def player_weeks():
+        return [pw for slots in build_team_weeks(None) for pw in slots]
+
+    def calculate_points(pws):
+        for pw in pws:
+            pw.calculate_points(score_values)
+
+    cases = {
+        "league_init": (lambda: None, lambda _: new_league(), None),
+        "populate_boxscores": (
+            new_league, lambda lg: lg._populate_boxscores(MATCHUP_NUM), None),
+        "league_to_json": (hydrated_league, lambda lg: lg.to_json(), None),
+        "league_init[syn20]": (
+            lambda: None, lambda _: new_league(syn_payloads), None),
+        "populate_boxscores[syn20]": (
+            lambda: new_league(syn_payloads),
+            lambda lg: lg._populate_boxscores(1), None),
+        f"team_week[x{scale}]": (lambda: None, build_team_weeks, None),
+        f"calculate_points[x{scale}]": (player_weeks, calculate_points, None),
+        f"cache_save[x{scale}]": (
+            lambda: None, lambda _: disk.save(scaled, SCORING_PERIOD),
+            raw_size),
+        f"cache_load[x{scale}]": (
+            lambda: None, lambda _: disk.load(SCORING_PERIOD), raw_size),
+        f"cache_load_matchups[x{scale}]": (
+            lambda: None,
+            lambda _: disk.load_matchups(SCORING_PERIOD, MATCHUP_NUM),
+            None),
+    }
+    return cases, tmp
+
+
+def calibrate(_):
+    # fixed interpreter-bound workload used to normalize timings
+    d = dict()
+    for i in range(20000):
+        d[i % 97] = d.get(i % 97, 0) + i
+
+
+def time_loop(setup, func, number):
+    # fresh setup before each call, so state-changing calls are
+    # repeatable; setups run before the timer starts
+    args = [setup() for _ in range(number)]
+    it = iter(args)
+    return timeit.timeit(lambda: func(next(it)), number=number)
+
+
+def loop_size(setup, func, min_time):
+    # calls per loop for it to last `min_time`, from a warm-up call
+    once = time_loop(setup, func, 1)
+    return max(1, int(min_time / max(once, 1e-9)) + 1)
+
+
+def time_case(setup, func, repeat, min_time):
+    """Time a case in `repeat` loops lasting at least `min_time` seconds
+
+    A calibration loop runs before each loop of the case, so that both
+    see the same machine speed.
+
+    :return: median seconds per call, and median ratio of the time per
+             call to that of the calibration workload
+    """
+    cal_number = loop_size(lambda: None, calibrate, min_time)
+    number = loop_size(setup, func, min_time)
+    secs, relative = [], []
+    for _ in range(repeat):
+        cal = time_loop(lambda: None, calibrate, cal_number) / cal_number
+        secs.append(time_loop(setup, func, number) / number)
+        relative.append(secs[-1] / cal)
+    return statistics.median(secs), statistics.median(relative)
+
+
+def run(scales, repeat, min_time, pattern=None):
+    """Run all cases, returning relative times keyed by case name"""
+    results = {}
+    for scale in scales:
+        cases, tmp = make_cases(scale)
+        with tmp:
+            for name, (setup, func, size) in cases.items():
+                if name in results or (pattern and pattern not in name):
+                    continue
+                secs, results[name] = time_case(setup, func, repeat,
+                                                min_time)
+                line = f"{name:<32} {secs * 1e3:9.3f} ms"
+                if size:
+                    line += f"  {size / secs / 2 ** 20:8.1f} MiB/s"
+                print(line)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print ratios to baseline, returning names of regressed cases"""
+    regressed = []
+    for name, relative in results.items():
+        if name not in baseline:
+            continue
+        ratio = relative / baseline[name]
+        flag = ""
+        if ratio > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {ratio:9.2f}x baseline{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="minimum seconds per timed loop")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--threshold", type=float, default=1.5)
+    parser.add_argument("--save", action="store_true",
+                        help="overwrite baseline with these results")
+    parser.add_argument("-k", dest="pattern",
+                        help="only run cases whose name contains PATTERN")
+    args = parser.parse_args()
+    results = run(args.scale, args.repeat, args.min_time, args.pattern)
+    if args.save:
+        with open(BASELINE, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return
+    if not os.path.exists(BASELINE):
+        return
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+    print()
+    if compare(results, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
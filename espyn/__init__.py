@@ -1,13 +1,63 @@
-from pkg_resources import get_distribution, DistributionNotFound
-
-try:
-    __version__ = get_distribution("espyn").version
-except DistributionNotFound:
-    pass
-
-from .league import League
-from .matchup import Matchup
-from .team import Team
-from .team_week import TeamWeek
-from .player_week import PlayerWeek
-from .player import Player
+"""ESPN fantasy football league data
+
+Model classes are imported on first access (PEP 562), so
+``import espyn`` stays cheap for tools that only need part of the
+package, e.g. ``from espyn import jsonlib``.
+"""
+import importlib
+
+# public name to defining submodule
+_LAZY = {
+    "League": "league",
+    "Matchup": "matchup",
+    "Team": "team",
+    "TeamWeek": "team_week",
+    "PlayerWeek": "player_week",
+    "Player": "player",
+}
+
+# __version__ is left out: it is unavailable if espyn is not installed
+__all__ = list(_LAZY)
+
+
+def _get_version():
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        # Python < 3.8
+        try:
+            from importlib_metadata import version, PackageNotFoundError
+        except ImportError:
+            return _get_version_pkg_resources()
+    try:
+        return version("espyn")
+    except PackageNotFoundError:
+        raise AttributeError("__version__") from None
+
+
+def _get_version_pkg_resources():
+    try:
+        import pkg_resources
+    except ImportError:
+        raise AttributeError("__version__") from None
+    try:
+        return pkg_resources.get_distribution("espyn").version
+    except pkg_resources.DistributionNotFound:
+        raise AttributeError("__version__") from None
+
+
+def __getattr__(name):
+    if name == "__version__":
+        value = _get_version()
+    elif name in _LAZY:
+        module = importlib.import_module("." + _LAZY[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,51 @@
+"""Command line interface
+
+Usage::
+
+    espyn serve [--port PORT] [--addr ADDR] [--cache-dir DIR]
+                [--capacity N] [--budget N]
+"""
+import argparse
+from typing import List, Optional
+
+
+def serve(args: argparse.Namespace) -> None:
+    from .server import make_server
+    from .budget import BoxscoreBudget
+    budget = None
+    if args.budget is not None:
+        budget = BoxscoreBudget(args.budget)
+    server = make_server(args.port, args.addr, cache_dir=args.cache_dir,
+                         capacity=args.capacity, budget=budget)
+    host, port = server.server_address[:2]
+    print("Serving league data on http://%s:%d/" % (host, port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="espyn")
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_serve = commands.add_parser(
+        "serve", help="serve league data as JSON over HTTP")
+    parser_serve.add_argument("--port", type=int, default=8000)
+    parser_serve.add_argument("--addr", default="127.0.0.1",
+                              help="address to bind")
+    parser_serve.add_argument("--cache-dir",
+                              help="directory for cached ESPN responses")
+    parser_serve.add_argument("--capacity", type=int, default=16,
+                              help="maximum number of leagues in memory")
+    parser_serve.add_argument("--budget", type=int,
+                              help="maximum number of boxscore stat lines "
+                                   "in memory")
+    parser_serve.set_defaults(func=serve)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
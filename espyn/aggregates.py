@@ -0,0 +1,377 @@
+"""Materialized season aggregates per player, team and position
+
+`SeasonAggregates` keeps season totals (points, points by lineup
+slot, projections and projection error) without hydrating every
+boxscore on each question::
+
+    aggs = league.aggregates()
+    aggs.by_player[4047365].points
+    aggs.by_position["RB"].mean_projection_error
+
+Each scoring period is reduced once to compact rows (one per rostered
+player-week) and the tables are rolled up from the rows of every
+period. Rows are persisted with a fingerprint of the period's cached
+payload; `refresh` recomputes only periods whose payload changed
+(e.g. live weeks refetched into the cache) and re-rolls only the
+table entries those periods touch.
+
+For leagues with a `LocalCache`, rows are persisted next to the
+cache files (``<season>_<league_id>_aggregates.json``). Caches without
+fingerprints (see :meth:`Cache.fingerprint`) cannot report changes;
+their periods are computed once and kept until `invalidate` is called.
+"""
+import os
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from . import jsonlib
+from .caches import LocalCache
+from .team_week import TeamWeek
+if TYPE_CHECKING:
+    from .league import League
+
+FORMAT_VERSION = 1
+TABLES = ("player", "team", "position")
+
+# (team ID, player ID, position, slot, points, projected points)
+Row = Tuple[int, int, str, str, Optional[float], Optional[float]]
+
+
+class Aggregate:
+    """Season totals of a group of player-weeks
+
+    Only player-weeks with points (i.e. not inactive) are counted.
+    """
+
+    __slots__ = ("weeks", "points", "points_by_slot", "projected_points",
+                 "projection_error", "projected_weeks")
+
+    def __init__(self) -> None:
+        self.weeks = 0
+        self.points = 0.
+        self.points_by_slot = dict()
+        self.projected_points = 0.
+        self.projection_error = 0.
+        self.projected_weeks = 0
+
+    def __repr__(self):
+        return "Aggregate : {} weeks : {:0.1f} points".format(
+            self.weeks, self.points)
+
+    def _add(self, row: Row) -> None:
+        _, _, _, slot, points, projected = row
+        if points is None:
+            return
+        self.weeks += 1
+        self.points += points
+        self.points_by_slot[slot] = self.points_by_slot.get(slot, 0.) + points
+        if projected is not None:
+            self.projected_points += projected
+            self.projection_error += projected - points
+            self.projected_weeks += 1
+
+    def _merge(self, other: "Aggregate") -> None:
+        self.weeks += other.weeks
+        self.points += other.points
+        for slot, points in other.points_by_slot.items():
+            self.points_by_slot[slot] = \
+                self.points_by_slot.get(slot, 0.) + points
+        self.projected_points += other.projected_points
+        self.projection_error += other.projection_error
+        self.projected_weeks += other.projected_weeks
+
+    @property
+    def mean_points(self) -> Optional[float]:
+        """Average points per week
+
+        :return: mean points (None if no weeks)
+        :rtype: Optional[float]
+        """
+        if not self.weeks:
+            return None
+        return self.points / self.weeks
+
+    @property
+    def mean_projection_error(self) -> Optional[float]:
+        """Average `PlayerWeek.projection_error`
+
+        :return: mean error, positive if projections too high (None if
+                 no projected weeks)
+        :rtype: Optional[float]
+        """
+        if not self.projected_weeks:
+            return None
+        return self.projection_error / self.projected_weeks
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get JSON-serializable dictionary representation
+
+        :return: dictionary representation of aggregate
+        :rtype: Dict[str, Any]
+        """
+        res = dict()
+        res["weeks"] = self.weeks
+        res["points"] = self.points
+        res["points_by_slot"] = dict(self.points_by_slot)
+        res["projected_points"] = self.projected_points
+        res["mean_points"] = self.mean_points
+        res["mean_projection_error"] = self.mean_projection_error
+        return res
+
+
+def _row_key(row: Row, table: str):
+    if table == "player":
+        return row[1]
+    if table == "team":
+        return row[0]
+    return row[2]
+
+
+def period_rows(data: Iterable[Dict[str, Any]], scoring_period: int,
+                registry=None, season: Optional[int] = None) -> List[Row]:
+    """Reduce a scoring period's schedule entries to aggregate rows
+
+    :param data: schedule entries with boxscores for the period
+    :type data: Iterable[Dict[str, Any]]
+    :param scoring_period: scoring period
+    :type scoring_period: int
+    :param registry: registry interning players
+    :type registry: Optional[PlayerRegistry]
+    :param season: season, under which stat lines are shared
+    :type season: Optional[int]
+    :return: one row per rostered player-week
+    :rtype: List[Tuple[int, int, str, str, Optional[float],
+                       Optional[float]]]
+    """
+    rows = []
+    for datum in data:
+        for side in ("home", "away"):
+            week_data = datum.get(side)
+            if not week_data or \
+                    "rosterForCurrentScoringPeriod" not in week_data:
+                continue
+            tw = TeamWeek(week_data, scoring_period, registry, season)
+            for pw in tw.iter_slots():
+                rows.append((tw.team_id, pw.player.player_id,
+                             pw.player.position, pw.slot, pw.points,
+                             pw.projected_points))
+    return rows
+
+
+class SeasonAggregates:
+    """Season aggregate tables of a league, maintained per scoring period
+
+    :param league: league to aggregate
+    :type league: League
+    :param path: file persisting period rows (defaults to the league's
+                 `LocalCache` directory; not persisted if None and the
+                 league has no `LocalCache`)
+    :type path: Optional[str]
+    """
+
+    def __init__(self, league: "League", path: Optional[str] = None) -> None:
+        self.league = league
+        cache = getattr(league, "cache", None)
+        if path is None and isinstance(cache, LocalCache):
+            path = os.path.join(
+                cache.cache_dir,
+                f"{league.season}_{league.league_id}_aggregates.json")
+        self.path = path
+        self._lock = threading.RLock()
+        # scoring period to (fingerprint, rows)
+        self._periods = dict()
+        # scoring period to table to key to the period's aggregate
+        self._partials = dict()
+        # table to key to scoring periods having rows of that key
+        self._keys = {t: dict() for t in TABLES}
+        self._tables = {t: dict() for t in TABLES}
+        self._load()
+
+    def __repr__(self):
+        return "SeasonAggregates {} ({}) : {} scoring periods".format(
+            self.league.league_id, self.league.season, len(self._periods))
+
+    @property
+    def scoring_periods(self) -> List[int]:
+        """Scoring periods included in the tables
+
+        :return: scoring periods, in order
+        :rtype: List[int]
+        """
+        return sorted(self._periods)
+
+    @property
+    def by_player(self) -> Dict[int, Aggregate]:
+        """Season totals keyed by player ID
+
+        :return: player ID to aggregate
+        :rtype: Dict[int, Aggregate]
+        """
+        return self._tables["player"]
+
+    @property
+    def by_team(self) -> Dict[int, Aggregate]:
+        """Season totals of rostered players keyed by fantasy team ID
+
+        :return: team ID to aggregate
+        :rtype: Dict[int, Aggregate]
+        """
+        return self._tables["team"]
+
+    @property
+    def by_position(self) -> Dict[str, Aggregate]:
+        """Season totals keyed by player position
+
+        :return: position to aggregate
+        :rtype: Dict[str, Aggregate]
+        """
+        return self._tables["position"]
+
+    def _default_periods(self):
+        # periods of the schedule up to the calendar's current week
+        league = self.league
+        week = league.calendar.week(league.season)
+        return [sp for num in league.schedule.matchup_nums
+                for sp in league.schedule.scoring_periods(num) if sp <= week]
+
+    def _fingerprint(self, scoring_period):
+        cache = getattr(self.league, "cache", None)
+        if cache is None:
+            return None
+        return cache.fingerprint(scoring_period)
+
+    def _is_stale(self, scoring_period):
+        entry = self._periods.get(scoring_period)
+        if entry is None:
+            return True
+        return entry[0] is not None and \
+            entry[0] != self._fingerprint(scoring_period)
+
+    def _compute(self, scoring_period):
+        league = self.league
+        fingerprint = self._fingerprint(scoring_period)
+        num = league.scoring_period_to_matchup_num(scoring_period)
+        data = league._get_matchup_data(scoring_period, num)
+        if fingerprint is None:
+            # payload was just fetched into the cache, if any
+            fingerprint = self._fingerprint(scoring_period)
+        return fingerprint, period_rows(data, scoring_period,
+                                        league.registry, league.season)
+
+    def _set_period(self, scoring_period, entry):
+        # replace a period's rows and re-roll the table entries it touches
+        old = self._partials.pop(scoring_period, None) or \
+            {t: dict() for t in TABLES}
+        if entry is None:
+            self._periods.pop(scoring_period, None)
+            new = {t: dict() for t in TABLES}
+        else:
+            self._periods[scoring_period] = entry
+            new = {t: dict() for t in TABLES}
+            for row in entry[1]:
+                for table in TABLES:
+                    key = _row_key(row, table)
+                    agg = new[table].get(key)
+                    if agg is None:
+                        agg = new[table][key] = Aggregate()
+                    agg._add(row)
+            self._partials[scoring_period] = new
+        for table in TABLES:
+            keys, totals = self._keys[table], self._tables[table]
+            for key in old[table]:
+                keys[key].discard(scoring_period)
+            for key in new[table]:
+                keys.setdefault(key, set()).add(scoring_period)
+            for key in old[table].keys() | new[table].keys():
+                periods = keys.get(key)
+                if not periods:
+                    keys.pop(key, None)
+                    totals.pop(key, None)
+                    continue
+                agg = Aggregate()
+                for sp in sorted(periods):
+                    agg._merge(self._partials[sp][table][key])
+                totals[key] = agg
+
+    def refresh(self, scoring_periods: Optional[Iterable[int]] = None
+                ) -> List[int]:
+        """Recompute periods that are missing or whose payload changed
+
+        Fetches boxscore data of missing periods if not cached.
+
+        :param scoring_periods: periods to include (defaults to the
+                                schedule's periods up to the current
+                                week)
+        :type scoring_periods: Optional[Iterable[int]]
+        :return: recomputed scoring periods, in order
+        :rtype: List[int]
+        """
+        if scoring_periods is None:
+            scoring_periods = self._default_periods()
+        with self._lock:
+            stale = [sp for sp in sorted(set(scoring_periods))
+                     if self._is_stale(sp)]
+            for sp in stale:
+                self._set_period(sp, self._compute(sp))
+            if stale:
+                self._save()
+        return stale
+
+    def invalidate(self, scoring_period: Optional[int] = None) -> None:
+        """Drop a period's rows (or all), so `refresh` recomputes them
+
+        :param scoring_period: scoring period (all periods if None)
+        :type scoring_period: Optional[int]
+        """
+        with self._lock:
+            periods = [scoring_period] if scoring_period is not None \
+                else list(self._periods)
+            for sp in periods:
+                self._set_period(sp, None)
+            self._save()
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                data = jsonlib.loads(f.read())
+            if data["version"] != FORMAT_VERSION or \
+                    data["league_id"] != self.league.league_id or \
+                    data["season"] != self.league.season:
+                return
+            periods = {int(sp): (entry["fingerprint"],
+                                 [tuple(row) for row in entry["rows"]])
+                       for sp, entry in data["periods"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        for sp in sorted(periods):
+            self._set_period(sp, periods[sp])
+
+    def _save(self):
+        if self.path is None:
+            return
+        data = dict(version=FORMAT_VERSION, league_id=self.league.league_id,
+                    season=self.league.season)
+        data["periods"] = {str(sp): {"fingerprint": fp, "rows": rows}
+                           for sp, (fp, rows) in self._periods.items()}
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(jsonlib.dumps(data))
+        os.replace(tmp, self.path)
+        logging.info(f"Wrote aggregates of {len(self._periods)} "
+                     "scoring periods.")
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get JSON-serializable dictionary representation
+
+        :return: dictionary representation of the tables
+        :rtype: Dict[str, Any]
+        """
+        res = dict()
+        res["scoring_periods"] = self.scoring_periods
+        for table in TABLES:
+            res[f"by_{table}"] = {str(k): v.to_json()
+                                  for k, v in self._tables[table].items()}
+        return res
@@ -0,0 +1,152 @@
+"""Memory budget for loaded boxscores
+
+A `League` keeps every boxscore it loads. Long-lived processes
+browsing many weeks can bound that memory with a `BoxscoreBudget`,
+which tracks the boxscores of each (league, matchup number) in
+least-recently-used order and evicts the oldest when the budget is
+exceeded. Evicted boxscores are reloaded (from the cache, if any) the
+next time they are requested::
+
+    budget = BoxscoreBudget(20000)
+    league = League(1603206, 2020, cache=cache, budget=budget)
+
+Sharing one budget between leagues gives a per-process budget.
+
+Sizes are counted in player stat lines (roster entries), which is
+proportional to the memory held by boxscores and cheap to compute
+when they are loaded.
+"""
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Iterable, TYPE_CHECKING
+
+from . import metrics
+if TYPE_CHECKING:
+    from .league import League
+    from .team_week import TeamWeek
+
+
+def team_week_size(team_week: "TeamWeek") -> int:
+    """Number of stat lines held by a boxscore
+
+    :param team_week: boxscore
+    :type team_week: TeamWeek
+    :return: number of roster entries (parsed or not)
+    :rtype: int
+    """
+    entries = team_week._entries
+    if entries is None:
+        return len(team_week._slots)
+    return len(entries)
+
+
+class BoxscoreBudget:
+    """Least-recently-used budget for boxscores of one or more leagues
+
+    :param max_size: maximum number of resident stat lines; the most
+                     recently used matchup number is kept even if it
+                     exceeds the budget alone
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 0:
+            raise ValueError("Budget must not be negative.")
+        self.max_size = max_size
+        self.evictions = 0
+        self._resident = 0
+        self._lock = threading.Lock()
+        # (id of league, matchup number) to [weakref to league, size]
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def resident(self) -> int:
+        """Number of resident stat lines
+
+        :return: resident size
+        :rtype: int
+        """
+        return self._resident
+
+    def add(self, league: "League", matchup_num: int,
+            team_weeks: Iterable["TeamWeek"]) -> None:
+        """Record loaded boxscores, evicting others if over budget
+
+        :param league: league whose boxscores were loaded
+        :type league: League
+        :param matchup_num: matchup number of boxscores
+        :type matchup_num: int
+        :param team_weeks: newly loaded boxscores
+        :type team_weeks: Iterable[TeamWeek]
+        """
+        size = sum(team_week_size(tw) for tw in team_weeks)
+        key = (id(league), matchup_num)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0]() is not league:
+                entry = self._entries[key] = [weakref.ref(league), 0]
+            entry[1] += size
+            self._entries.move_to_end(key)
+            self._resident += size
+            victims = self._pop_victims()
+        metrics.BOXSCORES_RESIDENT.inc(size)
+        self._evict(victims)
+
+    def touch(self, league: "League", matchup_num: int) -> None:
+        """Mark boxscores of a matchup number as recently used
+
+        :param league: league
+        :type league: League
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        """
+        key = (id(league), matchup_num)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def discard(self, league: "League", matchup_num: int) -> None:
+        """Stop tracking boxscores unloaded outside the budget
+
+        :param league: league
+        :type league: League
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        """
+        key = (id(league), matchup_num)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0]() is not league:
+                return
+            del self._entries[key]
+            self._resident -= entry[1]
+        metrics.BOXSCORES_RESIDENT.inc(-entry[1])
+
+    def _pop_victims(self):
+        # called with lock held; entries of collected leagues are
+        # dropped first, then least recently used ones
+        victims = []
+        for key, (ref, size) in list(self._entries.items()):
+            if ref() is None:
+                del self._entries[key]
+                self._resident -= size
+                metrics.BOXSCORES_RESIDENT.inc(-size)
+        while self._resident > self.max_size and len(self._entries) > 1:
+            (_, num), (ref, size) = self._entries.popitem(last=False)
+            self._resident -= size
+            self.evictions += 1
+            victims.append((ref, num, size))
+        return victims
+
+    def _evict(self, victims):
+        # leagues' locks are taken without holding the budget's lock
+        for ref, num, size in victims:
+            league = ref()
+            if league is not None:
+                league._evict_boxscores(num)
+            metrics.BOXSCORE_EVICTIONS.inc()
+            metrics.BOXSCORES_RESIDENT.inc(-size)
@@ -1,8 +1,9 @@
 import os
-import json
 import logging
-from typing import Any, Callable, Optional, TYPE_CHECKING
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
+from . import jsonlib, instrument, metrics
 if TYPE_CHECKING:
     from .league import League
 
@@ -42,6 +43,38 @@ class Cache:
         """
         raise NotImplementedError()
 
+    def load_matchups(self, scoring_period: int,
+                      matchup_num: int) -> Optional[List[Dict[str, Any]]]:
+        """Load one matchup number's schedule entries for a scoring period
+
+        The default implementation loads the whole cache entry and
+        filters its schedule; subclasses may avoid deserializing the
+        entries of other matchups.
+
+        :param scoring_period: scoring period to load
+        :type scoring_period: int
+        :param matchup_num: matchup number of entries to keep
+        :type matchup_num: int
+        :return: matching schedule entries, or None if cache misses
+        :rtype: Optional[List[Dict[str, Any]]]
+        """
+        data = self.load(scoring_period)
+        if not data:
+            return None
+        return select_matchups(data, matchup_num)
+
+    def fingerprint(self, scoring_period: int) -> Optional[Any]:
+        """Get a value that changes whenever a period's entry changes
+
+        The default implementation cannot detect changes.
+
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :return: JSON-serializable fingerprint, or None if unknown
+        :rtype: Optional[Any]
+        """
+        return None
+
     def _get_filename(self, scoring_period=None):
         season = self.league.season
         league_id = self.league.league_id
@@ -50,14 +83,196 @@ class Cache:
         return f"{season}_{league_id}_sp{scoring_period:02d}.json"
 
 
+def select_matchups(data: Dict[str, Any],
+                    matchup_num: int) -> List[Dict[str, Any]]:
+    """Get schedule entries of a matchup number from an API response
+
+    :param data: league API response
+    :type data: Dict[str, Any]
+    :param matchup_num: matchup number
+    :type matchup_num: int
+    :return: matching schedule entries
+    :rtype: List[Dict[str, Any]]
+    """
+    return [i for i in data["schedule"] if i["matchupPeriodId"] == matchup_num]
+
+
+def _dumps_indexed(data: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+    # serialize with the schedule last, recording the byte range of each
+    # schedule entry by matchup number so entries can be decoded alone
+    head = jsonlib.dumps({k: v for k, v in data.items() if k != "schedule"})
+    sep = b"," if len(head) > 2 else b""
+    parts = [head[:-1], sep, b'"schedule":[']
+    pos = sum(len(i) for i in parts)
+    ranges = dict()
+    for i, item in enumerate(data["schedule"]):
+        if i:
+            parts.append(b",")
+            pos += 1
+        raw = jsonlib.dumps(item)
+        tmp = ranges.setdefault(str(item["matchupPeriodId"]), [])
+        tmp.append([pos, pos + len(raw)])
+        parts.append(raw)
+        pos += len(raw)
+    parts.append(b"]}")
+    raw = b"".join(parts)
+    return raw, {"size": len(raw), "matchups": ranges}
+
+
+#: marks a stat entry whose stat line is in the shared stats file
+SHARED_STATS_KEY = "sharedStats"
+
+
+def _stat_entries(data):
+    # actual stat entries of every rostered player in a scoring
+    # period response, with the player's ID
+    for item in data.get("schedule", ()):
+        for side in ("home", "away"):
+            roster = (item.get(side) or {}).get("rosterForCurrentScoringPeriod")
+            for entry in (roster or {}).get("entries", ()):
+                player = entry.get("playerPoolEntry", {}).get("player", {})
+                stats = player.get("stats")
+                if stats and stats[0].get("statSourceId") == 0:
+                    yield player["id"], stats[0]
+
+
+def _strip_stats(data):
+    # copy of a scoring period response with actual stat lines
+    # replaced by references, and the removed stat lines by player ID;
+    # only containers on the path to stat entries are copied
+    lines = dict()
+
+    def strip_player(player):
+        stats = player.get("stats")
+        if not stats or stats[0].get("statSourceId") != 0 \
+                or "stats" not in stats[0]:
+            return player
+        real = {k: v for k, v in stats[0].items() if k != "stats"}
+        real[SHARED_STATS_KEY] = True
+        lines[str(player["id"])] = stats[0]["stats"]
+        return {**player, "stats": [real, *stats[1:]]}
+
+    def strip_side(side):
+        roster = side.get("rosterForCurrentScoringPeriod")
+        if not roster:
+            return side
+        entries = []
+        for entry in roster.get("entries", ()):
+            ppe = entry.get("playerPoolEntry")
+            if ppe and ppe.get("player"):
+                ppe = {**ppe, "player": strip_player(ppe["player"])}
+                entry = {**entry, "playerPoolEntry": ppe}
+            entries.append(entry)
+        roster = {**roster, "entries": entries}
+        return {**side, "rosterForCurrentScoringPeriod": roster}
+
+    schedule = []
+    for item in data["schedule"]:
+        item = dict(item)
+        for side in ("home", "away"):
+            if item.get(side):
+                item[side] = strip_side(item[side])
+        schedule.append(item)
+    return {**data, "schedule": schedule}, lines
+
+
 class LocalCache(Cache):
-    """Concrete `Cache` implementation to read/write local JSON files"""
+    """Concrete `Cache` implementation to read/write local JSON files
 
-    def __init__(self, cache_dir, ignore_cache=False):
+    Scoring period files are written with a sidecar index (``.idx``)
+    of each schedule entry's byte range, so `load_matchups` can read and
+    decode only the entries of the requested matchup number. Files
+    without a valid index (one recording the file's current size and
+    modification time) are loaded in full.
+
+    With `shared_stats`, players' actual stat lines are written once
+    per season and scoring period to a stats file shared by every
+    league in the directory (e.g. ``2020_stats_sp10.json``), and league
+    files only reference them. Entries whose stat line is missing from
+    the stats file are treated as cache misses.
+
+    :param cache_dir: existing directory of cache files
+    :type cache_dir: str
+    :param ignore_cache: whether loads always miss
+    :type ignore_cache: bool
+    :param shared_stats: whether to write stat lines to shared stats
+                         files (files written either way can be read)
+    :type shared_stats: bool
+    """
+
+    def __init__(self, cache_dir, ignore_cache=False, shared_stats=False):
         if not os.path.exists(cache_dir):
             raise ValueError("The given cache directory does not exist.")
         self.cache_dir = cache_dir
         self.ignore_cache = ignore_cache
+        self.shared_stats = shared_stats
+        # stats file path to ((mtime, size), decoded stat lines)
+        self._stat_files = dict()
+
+    def _stats_path(self, scoring_period):
+        fname = f"{self.league.season}_stats_sp{scoring_period:02d}.json"
+        return os.path.join(self.cache_dir, fname)
+
+    def _load_stats(self, scoring_period):
+        fpath = self._stats_path(scoring_period)
+        try:
+            st = os.stat(fpath)
+        except OSError:
+            return dict()
+        cached = self._stat_files.get(fpath)
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        with open(fpath, "rb") as f:
+            raw = f.read()
+        with instrument.span("decode", bytes=len(raw)):
+            lines = jsonlib.loads(raw)
+        # keep only the latest file decoded
+        self._stat_files = {fpath: ((st.st_mtime_ns, st.st_size), lines)}
+        return lines
+
+    def _save_stats(self, scoring_period, lines):
+        if not lines:
+            return
+        fpath = self._stats_path(scoring_period)
+        try:
+            merged = dict(self._load_stats(scoring_period))
+        except (OSError, ValueError):
+            merged = dict()
+        # rewrite only if a line is new or corrected
+        if all(merged.get(k) == v for k, v in lines.items()):
+            return
+        merged.update(lines)
+        # write whole file then rename, so readers never see it partly
+        # written; a concurrent writer's new lines may be lost, in
+        # which case their leagues' entries miss and are refetched
+        tmp = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(jsonlib.dumps(merged))
+        os.replace(tmp, fpath)
+        logging.info(f"Wrote {len(lines)} stat lines to local cache.")
+
+    def _restore_stats(self, items, scoring_period):
+        # fill referenced stat lines in place; False if any is missing
+        lines = None
+        for player_id, real in _stat_entries({"schedule": items}):
+            if not real.pop(SHARED_STATS_KEY, False):
+                continue
+            if lines is None:
+                lines = self._load_stats(scoring_period)
+            stats = lines.get(str(player_id))
+            if stats is None:
+                return False
+            real["stats"] = stats
+        return True
+
+    def fingerprint(self, scoring_period):
+        fpath = os.path.join(self.cache_dir,
+                             self._get_filename(scoring_period))
+        try:
+            st = os.stat(fpath)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
 
     def load(self, scoring_period=None):
         if self.ignore_cache:
@@ -65,18 +280,73 @@ class LocalCache(Cache):
         fname = self._get_filename(scoring_period)
         fpath = os.path.join(self.cache_dir, fname)
         try:
-            with open(fpath, "r") as f:
-                data = json.load(f)
+            with open(fpath, "rb") as f:
+                raw = f.read()
+            with instrument.span("decode", bytes=len(raw)):
+                data = jsonlib.loads(raw)
+            if scoring_period is not None and "schedule" in data:
+                if not self._restore_stats(data["schedule"], scoring_period):
+                    return None
             logging.info(f"Read file {fname} from local cache.")
             return data
         except:
             return None
 
+    def _load_index(self, fpath):
+        try:
+            with open(fpath + ".idx", "rb") as f:
+                index = jsonlib.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        # ignore index if data file was rewritten without it; size alone
+        # misses rewrites of the same length
+        try:
+            st = os.stat(fpath)
+            if [st.st_mtime_ns, st.st_size] != \
+                    [index.get("mtime"), index["size"]]:
+                return None
+        except (OSError, KeyError, TypeError):
+            return None
+        return index
+
+    def load_matchups(self, scoring_period, matchup_num):
+        if self.ignore_cache:
+            return None
+        fpath = os.path.join(self.cache_dir, self._get_filename(scoring_period))
+        index = self._load_index(fpath)
+        if index is None:
+            return super().load_matchups(scoring_period, matchup_num)
+        res = []
+        with open(fpath, "rb") as f:
+            for start, end in index["matchups"].get(str(matchup_num), []):
+                f.seek(start)
+                raw = f.read(end - start)
+                with instrument.span("decode", bytes=len(raw)):
+                    res.append(jsonlib.loads(raw))
+        try:
+            if not self._restore_stats(res, scoring_period):
+                return None
+        except (OSError, ValueError):
+            return None
+        return res
+
     def save(self, data, scoring_period=None):
         fname = self._get_filename(scoring_period)
         fpath = os.path.join(self.cache_dir, fname)
-        with open(fpath, "w") as f:
-            json.dump(data, f)
+        index = None
+        if scoring_period is not None and "schedule" in data:
+            if self.shared_stats:
+                data, lines = _strip_stats(data)
+                self._save_stats(scoring_period, lines)
+            raw, index = _dumps_indexed(data)
+        else:
+            raw = jsonlib.dumps(data)
+        with open(fpath, "wb") as f:
+            f.write(raw)
+        if index is not None:
+            index["mtime"] = os.stat(fpath).st_mtime_ns
+            with open(fpath + ".idx", "wb") as f:
+                f.write(jsonlib.dumps(index))
         logging.info(f"Wrote file {fname} to local cache.")
 
 
@@ -105,13 +375,22 @@ def cache_operation(func: Callable) -> Callable:
         if cache is None:
             return func(*args)
         # otherwise, try returning data from cache
-        data = cache.load(*args[1:])
+        league = args[0]
+        attrs = dict(cache=type(cache).__name__,
+                     league_id=getattr(league, "league_id", None),
+                     season=getattr(league, "season", None),
+                     scoring_period=args[1] if len(args) > 1 else None)
+        with instrument.span("cache.load", **attrs) as span:
+            data = cache.load(*args[1:])
+            span.set(hit=bool(data))
+        metrics.record_cache(attrs["cache"], bool(data))
         if data:
             return data
         # if the cache missed, call the wrapped function,
         # then write the data to the cache
         data = func(*args)
-        cache.save(data, *args[1:])
+        with instrument.span("cache.save", **attrs):
+            cache.save(data, *args[1:])
         return data
 
     return wrapped
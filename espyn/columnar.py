@@ -0,0 +1,309 @@
+import os
+import csv
+import math
+from array import array
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple, Union, TYPE_CHECKING)
+
+from .constants import STAT_CODES
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+if TYPE_CHECKING:
+    from .league import League
+
+
+# column kinds: int64 ("i"), float64 with NaN for null ("d"),
+# boolean ("b"), and strings/nullable values kept as lists ("s")
+_KINDS = {"i": "q", "d": "d", "b": "b"}
+
+TEAM_COLUMNS = (
+    ("league_id", "i"), ("season", "i"), ("team_id", "i"),
+    ("team_abbrev", "s"), ("team_location", "s"), ("team_nickname", "s"),
+    ("owner", "s"), ("division_id", "i"), ("points_for", "d"),
+    ("points_against", "d"), ("wins", "i"), ("losses", "i"), ("ties", "i"),
+    ("winning_pct", "d"), ("acquisitions", "i"), ("draft_position", "i"),
+)
+MATCHUP_COLUMNS = (
+    ("league_id", "i"), ("season", "i"), ("matchup_num", "i"),
+    ("home_team_id", "i"), ("away_team_id", "s"), ("home_score", "d"),
+    ("away_score", "d"), ("winner", "s"), ("is_bye", "b"),
+    ("is_playoff", "b"), ("num_weeks", "i"),
+)
+TEAM_WEEK_COLUMNS = (
+    ("league_id", "i"), ("season", "i"), ("matchup_num", "i"),
+    ("team_id", "i"), ("scoring_period", "i"), ("points", "d"),
+)
+PLAYER_WEEK_COLUMNS = (
+    ("league_id", "i"), ("season", "i"), ("matchup_num", "i"),
+    ("team_id", "i"), ("scoring_period", "i"), ("player_id", "i"),
+    ("player_name", "s"), ("position", "s"), ("pro_team", "s"),
+    ("slot", "s"), ("points", "d"), ("projected_points", "d"),
+)
+
+
+def _new_column(kind: str, length: int = 0):
+    if kind == "s":
+        return [None] * length
+    return array(_KINDS[kind], bytes(array(_KINDS[kind]).itemsize * length))
+
+
+def _null_float(value):
+    return math.nan if value is None else value
+
+
+def stat_column_name(code: int) -> str:
+    """Get player-week table column name for a stat code
+
+    :param code: ESPN stat code
+    :type code: int
+    :return: column name, e.g. "stat_rush_yds" or "stat_213"
+    :rtype: str
+    """
+    return "stat_{}".format(STAT_CODES.get(code, code))
+
+
+class ColumnTable:
+    """Column-oriented table backed by typed arrays
+
+    Numeric columns are `array.array` instances (floats use NaN for
+    missing values); string columns are lists.
+
+    :param name: table name
+    :type name: str
+    :param schema: column names and kinds ("i", "d", "b" or "s")
+    :type schema: Sequence[Tuple[str, str]]
+    """
+
+    def __init__(self, name: str, schema: Sequence[Tuple[str, str]]) -> None:
+        self.name = name
+        self.kinds = dict(schema)
+        self.columns = {col: _new_column(kind) for col, kind in schema}
+        self.num_rows = 0
+
+    def __repr__(self):
+        return "ColumnTable {} : {} rows x {} columns".format(
+            self.name, self.num_rows, len(self.columns))
+
+    @property
+    def column_names(self) -> List[str]:
+        """Column names in order
+
+        :return: column names
+        :rtype: List[str]
+        """
+        return list(self.columns)
+
+    def append(self, values: Sequence[Any]) -> None:
+        """Append a row of values in column order
+
+        :param values: one value per column
+        :type values: Sequence[Any]
+        """
+        for col, value in zip(self.columns.values(), values):
+            col.append(value)
+        self.num_rows += 1
+
+    def add_column(self, name: str, kind: str, values=None) -> None:
+        """Add a column to the table
+
+        :param name: column name
+        :type name: str
+        :param kind: column kind
+        :type kind: str
+        :param values: one value per row (defaults to zeros, or None
+                       for string columns)
+        """
+        if values is None:
+            values = _new_column(kind, self.num_rows)
+        if len(values) != self.num_rows:
+            raise ValueError("Column length does not match table.")
+        self.kinds[name] = kind
+        self.columns[name] = values
+
+    def iter_rows(self, start: int = 0,
+                  stop: Optional[int] = None) -> Iterator[Tuple]:
+        """Iterate over rows as tuples
+
+        :param start: first row
+        :type start: int
+        :param stop: row to stop before (defaults to end of table)
+        :type stop: Optional[int]
+        :return: row tuples in column order
+        :rtype: Iterator[Tuple]
+        """
+        cols = [c[start:stop] for c in self.columns.values()]
+        return zip(*cols)
+
+
+def _player_week_table(rows) -> ColumnTable:
+    table = ColumnTable("player_weeks", PLAYER_WEEK_COLUMNS)
+    stat_cols = dict()  # stat code to column array
+    for keys, pw in rows:
+        stats = pw._coded_stats
+        for code in stats:
+            if code not in stat_cols:
+                # zero-filled for rows without the stat so far
+                stat_cols[code] = _new_column("d", table.num_rows)
+        for code, col in stat_cols.items():
+            col.append(stats.get(code, 0.))
+        player = pw.player
+        table.append((
+            *keys, player.player_id, player.full_name, player.position,
+            pw.pro_team_during_match or player.pro_team, pw.slot,
+            _null_float(pw.points), _null_float(pw.projected_points),
+        ))
+    for code in sorted(stat_cols):
+        table.add_column(stat_column_name(code), "d", stat_cols[code])
+    return table
+
+
+def build_tables(leagues: Union["League", Iterable["League"]]
+                 ) -> Dict[str, ColumnTable]:
+    """Build teams, matchups, team-weeks and player-weeks tables
+
+    Only boxscores already loaded contribute team-week and player-week
+    rows; see :meth:`League.load_boxscores`. Player-weeks have one
+    column per stat code seen in any stat line (see
+    :func:`stat_column_name`), with zero for stats missing from a line.
+
+    :param leagues: league or iterable of leagues
+    :type leagues: Union[League, Iterable[League]]
+    :return: tables keyed by name ("teams", "matchups", "team_weeks",
+             "player_weeks")
+    :rtype: Dict[str, ColumnTable]
+    """
+    if hasattr(leagues, "league_id"):
+        leagues = [leagues]
+    teams = ColumnTable("teams", TEAM_COLUMNS)
+    matchups = ColumnTable("matchups", MATCHUP_COLUMNS)
+    team_weeks = ColumnTable("team_weeks", TEAM_WEEK_COLUMNS)
+    player_rows = []
+    for league in leagues:
+        lkeys = (league.league_id, league.season)
+        for t in league.teams:
+            teams.append((
+                *lkeys, t.team_id, t.team_abbrev, t.team_location,
+                t.team_nickname, t.owner, t.division_id, t.points_for,
+                t.points_against, t.wins, t.losses, t.ties, t.winning_pct,
+                t.acquisitions, t.draft_position,
+            ))
+        for m in sorted(league._matchups, key=lambda i: i.matchup_num):
+            matchups.append((
+                *lkeys, m.matchup_num, m.home_team_id, m.away_team_id,
+                m.home_score, _null_float(m.away_score), m.winner,
+                m.is_bye, m.is_playoff, m.num_weeks,
+            ))
+            for tw in m.loaded_team_weeks():
+                wkeys = (*lkeys, m.matchup_num, tw.team_id, tw.scoring_period)
+                team_weeks.append((*wkeys, tw.points))
+                player_rows.extend((wkeys, pw) for pw in tw.iter_slots())
+    return {
+        "teams": teams,
+        "matchups": matchups,
+        "team_weeks": team_weeks,
+        "player_weeks": _player_week_table(player_rows),
+    }
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet export "
+                          "(pip install espyn[arrow]).")
+
+
+def to_arrow(tables: Dict[str, ColumnTable]) -> Dict[str, "pa.Table"]:
+    """Convert column tables to Arrow tables
+
+    :param tables: tables from :func:`build_tables`
+    :type tables: Dict[str, ColumnTable]
+    :return: Arrow tables keyed by name
+    :rtype: Dict[str, pyarrow.Table]
+
+    :raise: ImportError if pyarrow is not installed
+    """
+    _require_pyarrow()
+    types = {"i": pa.int64(), "d": pa.float64(), "b": pa.bool_(), "s": None}
+    res = dict()
+    for name, table in tables.items():
+        arrays = []
+        for col, values in table.columns.items():
+            kind = table.kinds[col]
+            if kind == "b":
+                values = [bool(i) for i in values]
+            arrays.append(pa.array(values, type=types[kind],
+                                   from_pandas=kind == "d"))
+        res[name] = pa.Table.from_arrays(arrays, names=table.column_names)
+    return res
+
+
+def write_parquet(tables: Dict[str, ColumnTable],
+                  directory: str) -> List[str]:
+    """Write each table to a Parquet file in a directory
+
+    :param tables: tables from :func:`build_tables`
+    :type tables: Dict[str, ColumnTable]
+    :param directory: existing output directory
+    :type directory: str
+    :return: paths of written files
+    :rtype: List[str]
+
+    :raise: ImportError if pyarrow is not installed
+    """
+    paths = []
+    for name, table in to_arrow(tables).items():
+        path = os.path.join(directory, f"{name}.parquet")
+        pq.write_table(table, path)
+        paths.append(path)
+    return paths
+
+
+def write_csv(tables: Dict[str, ColumnTable], directory: str,
+              chunk_size: int = 10000) -> List[str]:
+    """Write each table to a CSV file in a directory
+
+    Rows are written in chunks of `chunk_size` to bound the memory
+    used converting columns to rows. Missing floats are written as
+    empty fields.
+
+    :param tables: tables from :func:`build_tables`
+    :type tables: Dict[str, ColumnTable]
+    :param directory: existing output directory
+    :type directory: str
+    :param chunk_size: rows per chunk
+    :type chunk_size: int
+    :return: paths of written files
+    :rtype: List[str]
+    """
+    paths = []
+    for name, table in tables.items():
+        path = os.path.join(directory, f"{name}.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(table.column_names)
+            for start in range(0, table.num_rows, chunk_size):
+                rows = table.iter_rows(start, start + chunk_size)
+                writer.writerows(
+                    ["" if isinstance(v, float) and math.isnan(v) else v
+                     for v in row] for row in rows)
+        paths.append(path)
+    return paths
+
+
+def export_tables(leagues: Union["League", Iterable["League"]],
+                  directory: str) -> List[str]:
+    """Export leagues as Parquet files, or CSV if pyarrow is missing
+
+    :param leagues: league or iterable of leagues
+    :type leagues: Union[League, Iterable[League]]
+    :param directory: existing output directory
+    :type directory: str
+    :return: paths of written files
+    :rtype: List[str]
+    """
+    tables = build_tables(leagues)
+    if pa is None:
+        return write_csv(tables, directory)
+    return write_parquet(tables, directory)
@@ -23,6 +23,11 @@ SLOTS = {
     24: "EDR"  # edge rusher
 }
 
+# slots whose players do not contribute to a team's score
+BENCH_SLOT_IDS = (20, 21)
+# injured reserve slot, whose players cannot be started
+INJURED_SLOT_ID = 21
+
 POSITIONS = {
     1: "QB",
     2: "RB",
@@ -0,0 +1,120 @@
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Union, TYPE_CHECKING
+
+from . import jsonlib
+if TYPE_CHECKING:
+    from .league import League
+
+
+def _as_leagues(leagues):
+    # accept a single league as well as any iterable of leagues
+    if hasattr(leagues, "league_id"):
+        return [leagues]
+    return leagues
+
+
+def iter_records(leagues: Union["League", Iterable["League"]],
+                 boxscores: bool = False) -> Iterator[Dict[str, Any]]:
+    """Generate flat export records for one or more leagues
+
+    Each record has a `type` of "league", "team", "matchup", and, when
+    `boxscores` is set, "team_week" and "player_week". Child records
+    carry the `league_id` and `season` (and matchup number, team ID and
+    scoring period where relevant) of their parents instead of being
+    nested, so records can be written as they are produced.
+
+    Leagues are consumed lazily, so passing a generator keeps only one
+    league resident at a time. Player-weeks are parsed from boxscores
+    without being retained (see :meth:`TeamWeek.iter_slots`), and
+    boxscores loaded for the export are unloaded again once their
+    matchup number's records are produced, so only one matchup
+    number's boxscores are resident at a time. Boxscores loaded before
+    the export stay loaded.
+
+    :param leagues: league or iterable of leagues to export
+    :type leagues: Union[League, Iterable[League]]
+    :param boxscores: whether to load and export boxscores of completed
+                      matchups (will require Internet connection if
+                      data are not cached)
+    :type boxscores: bool
+    :return: export records
+    :rtype: Iterator[Dict[str, Any]]
+    """
+    for league in _as_leagues(leagues):
+        keys = {"league_id": league.league_id, "season": league.season}
+        yield {
+            "type": "league", **keys,
+            "league_name": league.name,
+            "league_size": league.size,
+            "reg_season_weeks": league.reg_season_weeks,
+            "total_matchups": league.total_matchups,
+        }
+        for team in league.teams:
+            yield {"type": "team", **keys, **team.to_json(scores=False)}
+        cm = league.current_matchup_num()
+        for num in league.schedule.matchup_nums:
+            # boxscores are loaded one matchup number at a time
+            load = boxscores and num < cm
+            unload = load and not all(
+                m.boxscore_loaded
+                for m in league.schedule.matchups_by_number(num))
+            try:
+                yield from _matchup_records(league, keys, num, load)
+            finally:
+                if unload:
+                    league._unload_boxscores(num)
+
+
+def _matchup_records(league, keys, num, load):
+    matchups = league.get_matchups_by_number(num, boxscore=load)
+    for m in sorted(matchups, key=lambda i: i.home_team_id):
+        yield {"type": "matchup", **keys, **m.to_json(boxscores=False)}
+        if not load:
+            continue
+        for tw in m.loaded_team_weeks():
+            week_keys = {**keys, "matchup_num": num, "team_id": tw.team_id,
+                         "scoring_period": tw.scoring_period}
+            yield {"type": "team_week", **week_keys, "points": tw.points}
+            for pw in tw.iter_slots():
+                yield {"type": "player_week", **week_keys, **pw.to_json()}
+
+
+def iter_ndjson(leagues: Union["League", Iterable["League"]],
+                boxscores: bool = False) -> Iterator[bytes]:
+    """Generate newline-delimited JSON lines for one or more leagues
+
+    See :func:`iter_records` for the records produced.
+
+    :param leagues: league or iterable of leagues to export
+    :type leagues: Union[League, Iterable[League]]
+    :param boxscores: whether to export boxscores
+    :type boxscores: bool
+    :return: UTF-8 encoded lines, each ending with a newline
+    :rtype: Iterator[bytes]
+    """
+    for record in iter_records(leagues, boxscores):
+        yield jsonlib.dumps(record) + b"\n"
+
+
+def write_ndjson(leagues: Union["League", Iterable["League"]],
+                 fp: BinaryIO, boxscores: bool = False) -> int:
+    """Stream newline-delimited JSON records to a binary file object
+
+    Works with any object having a `write` method accepting bytes,
+    e.g. ``open(path, "wb")`` or ``socket.makefile("wb")``. Records
+    are written as they are generated, so memory use does not grow
+    with the number of leagues exported.
+
+    :param leagues: league or iterable of leagues to export
+    :type leagues: Union[League, Iterable[League]]
+    :param fp: writable binary file object
+    :type fp: BinaryIO
+    :param boxscores: whether to export boxscores
+    :type boxscores: bool
+    :return: number of records written
+    :rtype: int
+    """
+    count = 0
+    for line in iter_ndjson(leagues, boxscores):
+        fp.write(line)
+        count += 1
+    return count
@@ -0,0 +1,224 @@
+"""Timed spans around network, cache, decoding and construction
+
+Code paths that load league data are wrapped in named spans carrying
+attributes such as league ID, season, scoring period, byte counts and
+cache hits. Spans are dispatched to registered observers; with no
+observers registered, `span` returns a shared no-op span, so the
+instrumented paths cost little more than a function call.
+
+Spans emitted by espyn:
+
+- ``league.construct``: building teams and matchups from league data
+- ``boxscores.load``: loading one matchup number's boxscores
+- ``fetch``: requesting league or scoring period data from ESPN
+- ``http.request``: reading an API response
+- ``decode``: deserializing JSON (attribute ``bytes``)
+- ``cache.load``, ``cache.load_matchups``, ``cache.save``: cache
+  operations (attributes ``cache`` and ``hit``)
+- ``team_week.parse``: parsing a team's player stat lines
+
+Example::
+
+    from espyn import instrument
+    instrument.add_observer(instrument.LoggingObserver())
+"""
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+_observers: Tuple["Observer", ...] = ()
+
+
+class Observer:
+    """Base class for span observers
+
+    Subclasses override `on_start` and/or `on_end`; both are called in
+    the thread running the span.
+    """
+
+    def on_start(self, span: "Span") -> None:
+        """Called when a span starts
+
+        :param span: started span
+        :type span: Span
+        """
+
+    def on_end(self, span: "Span") -> None:
+        """Called when a span ends
+
+        :param span: ended span, with `duration` set
+        :type span: Span
+        """
+
+
+class Span:
+    """Timed operation with attributes
+
+    Used as a context manager; `duration` (seconds) is set on exit,
+    and the ``error`` attribute is set if an exception was raised.
+
+    :param name: span name
+    :type name: str
+    :param attributes: initial attributes
+    :type attributes: Dict[str, Any]
+    """
+
+    __slots__ = ("name", "attributes", "start", "duration", "_observers",
+                 "_context")
+
+    def __init__(self, name: str, attributes: Dict[str, Any],
+                 observers: Tuple[Observer, ...] = ()) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.start = None
+        self.duration = None
+        self._observers = observers
+        # per-observer state, e.g. tracer spans
+        self._context = dict()
+
+    def __repr__(self):
+        return "Span {} : {}".format(self.name, self.attributes)
+
+    def set(self, **attributes) -> None:
+        """Set attributes of the span
+
+        :param attributes: attribute names and values
+        """
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        for observer in self._observers:
+            observer.on_start(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        for observer in reversed(self._observers):
+            observer.on_end(self)
+        return False
+
+
+class _NullSpan:
+    # returned when no observers are registered
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attributes) -> Span:
+    """Create a span to be used as a context manager
+
+    :param name: span name
+    :type name: str
+    :param attributes: initial attributes
+    :return: span (a shared no-op span if no observers are registered)
+    :rtype: Span
+    """
+    if not _observers:
+        return _NULL_SPAN
+    return Span(name, attributes, _observers)
+
+
+def add_observer(observer: Observer) -> None:
+    """Register an observer for all subsequently started spans
+
+    :param observer: observer
+    :type observer: Observer
+    """
+    global _observers
+    _observers = _observers + (observer,)
+
+
+def remove_observer(observer: Observer) -> None:
+    """Unregister an observer
+
+    :param observer: registered observer
+    :type observer: Observer
+
+    :raise: ValueError if observer is not registered
+    """
+    global _observers
+    if observer not in _observers:
+        raise ValueError("Observer is not registered.")
+    _observers = tuple(i for i in _observers if i is not observer)
+
+
+def enabled() -> bool:
+    """Whether any observers are registered
+
+    :return: whether spans are recorded
+    :rtype: bool
+    """
+    return bool(_observers)
+
+
+class LoggingObserver(Observer):
+    """Log each span's duration and attributes when it ends
+
+    :param logger: logger to use (defaults to the "espyn" logger)
+    :type logger: Optional[logging.Logger]
+    :param level: logging level
+    :type level: int
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None,
+                 level: int = logging.DEBUG) -> None:
+        self.logger = logger or logging.getLogger("espyn")
+        self.level = level
+
+    def on_end(self, span):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        attrs = " ".join("{}={}".format(k, v)
+                         for k, v in span.attributes.items())
+        self.logger.log(self.level, "%s %.2f ms %s", span.name,
+                        span.duration * 1e3, attrs)
+
+
+class TracerObserver(Observer):
+    """Forward spans to an OpenTelemetry-style tracer
+
+    Works with any tracer whose ``start_as_current_span(name,
+    attributes=...)`` returns a context manager yielding a span with
+    ``set_attribute``, such as ``opentelemetry.trace.get_tracer(...)``;
+    nested espyn spans become child spans. Attributes whose value is
+    None are omitted.
+
+    :param tracer: tracer
+    :param prefix: prefix for span names
+    :type prefix: str
+    """
+
+    def __init__(self, tracer, prefix: str = "espyn.") -> None:
+        self.tracer = tracer
+        self.prefix = prefix
+
+    @staticmethod
+    def _clean(attributes):
+        return {k: v for k, v in attributes.items() if v is not None}
+
+    def on_start(self, span):
+        cm = self.tracer.start_as_current_span(
+            self.prefix + span.name, attributes=self._clean(span.attributes))
+        span._context[self] = (cm, cm.__enter__())
+
+    def on_end(self, span):
+        cm, tracer_span = span._context.pop(self)
+        for key, value in self._clean(span.attributes).items():
+            tracer_span.set_attribute(key, value)
+        tracer_span.set_attribute("duration_ms", span.duration * 1e3)
+        cm.__exit__(None, None, None)
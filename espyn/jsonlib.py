@@ -0,0 +1,114 @@
+"""JSON encoding and decoding with the fastest available backend
+
+API responses and cache files are large (often 0.5-1 MB), so decoding
+dominates load time when data are cached. ``orjson`` is used if it is
+installed, then ``ujson``, falling back to the standard library.
+All backends decode directly from bytes and encode to UTF-8 bytes.
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+def _stdlib():
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+    return json.loads, dumps
+
+
+def _orjson():
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return orjson.loads, dumps
+
+
+def _ujson():
+    import ujson
+
+    def dumps(obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode()
+    return ujson.loads, dumps
+
+
+#: backend names and factories, in order of preference
+BACKENDS: Dict[str, Callable[[], Tuple[Callable, Callable]]] = {
+    "orjson": _orjson,
+    "ujson": _ujson,
+    "json": _stdlib,
+}
+
+_backend = None
+_loads = _dumps = None
+
+
+def available_backends() -> List[str]:
+    """Get names of importable backends, in order of preference
+
+    :return: backend names
+    :rtype: List[str]
+    """
+    names = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name: Optional[str] = None) -> str:
+    """Select JSON backend used by espyn
+
+    :param name: one of "orjson", "ujson" or "json"; if None, the
+                 first importable backend is used
+    :type name: Optional[str]
+    :return: name of selected backend
+    :rtype: str
+
+    :raise: ValueError if backend is unknown, ImportError if it
+            is not installed
+    """
+    global _backend, _loads, _dumps
+    if name is None:
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError("Unknown JSON backend %r." % name)
+    _loads, _dumps = BACKENDS[name]()
+    _backend = name
+    return name
+
+
+def get_backend() -> str:
+    """Get name of JSON backend in use
+
+    :return: backend name
+    :rtype: str
+    """
+    return _backend
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON document
+
+    :param data: UTF-8 encoded (or already decoded) JSON
+    :type data: Union[bytes, str]
+    :return: deserialized data
+    :rtype: Any
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize object to compact JSON
+
+    :param obj: JSON-serializable object
+    :type obj: Any
+    :return: UTF-8 encoded JSON
+    :rtype: bytes
+    """
+    return _dumps(obj)
+
+
+set_backend()
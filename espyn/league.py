@@ -1,13 +1,52 @@
-import urllib.request
+import time
 import logging
-import json
-from typing import Optional, List, Dict, Any
+import threading
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any, Iterable, Union
 
+from . import jsonlib, instrument, metrics
 from .constants import ENDPOINT, SEASON_OVER
 from .team import Team
 from .matchup import Matchup
+from .player import Player
+from .player_week import PlayerWeek
+from .registry import PlayerRegistry, default_registry
+from .budget import BoxscoreBudget
+from .prefetch import ReadAhead
+from .query import PlayerWeekIndex, PlayerWeekRow
+from .schedule import ScheduleIndex
+from .aggregates import SeasonAggregates
 from .utils import *
-from .caches import Cache, cache_operation
+from .caches import Cache, cache_operation, select_matchups
+from .lineup import Lineup, LineupOptimizer
+
+
+class FetchError(Exception):
+    """Raised when data cannot be requested from ESPN"""
+
+
+class LeagueFetchError(FetchError, ValueError):
+    """Raised when league data cannot be requested (e.g. the league is
+    private or does not exist)"""
+
+
+class ScoringPeriodFetchError(FetchError, RuntimeError):
+    """Raised when a scoring period's boxscore data cannot be requested"""
+
+
+class _Flight:
+    # a boxscore load in progress, awaited by concurrent callers
+
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
 
 
 class League:
@@ -16,73 +55,165 @@ class League:
     Retrieve and model a league for a given season. Makes API
     request unless given cache contains league data.
 
+    Leagues may be shared between threads. Boxscores of each matchup
+    number and scoring period are fetched and set once: concurrent
+    callers requesting the same boxscores wait for the first caller's
+    load (and see its exception, if it fails).
+
     :param league_id: ID of ESPN league
     :type league_id: int
     :param season: NFL season
     :type season: Optional[int]
     :param cache: cache to reduce network requests
     :type cache: Optional[Cache]
+    :param keep_raw: whether to retain API response data on the league
+                     and its matchups (as `_data`) after construction
+    :type keep_raw: bool
+    :param registry: registry interning players (defaults to the
+                     process-wide registry shared by all leagues)
+    :type registry: Optional[PlayerRegistry]
+    :param budget: memory budget evicting least recently used
+                   boxscores (no eviction if None)
+    :type budget: Optional[BoxscoreBudget]
+    :param read_ahead: scheduler loading the boxscores of the next
+                       matchup numbers in the background while they
+                       are requested in sequence (none if None)
+    :type read_ahead: Optional[ReadAhead]
+    :param calendar: calendar determining the default season and the
+                     current matchup (defaults to the system clock)
+    :type calendar: Optional[SeasonCalendar]
+    :param as_of: date to treat as today, e.g. to reproduce results
+                  as of a past date (shorthand for
+                  ``calendar=SeasonCalendar(as_of)``)
+    :type as_of: Optional[Union[date, datetime]]
     """
 
     @staticmethod
     def _request_json(url):
+        # imported here: urllib.request (via http.client and email)
+        # is the slowest import on the League path and only needed
+        # when data are not cached
+        import urllib.request
+        start = time.perf_counter()
         try:
-            res = urllib.request.urlopen(url)
-            raw = res.read()
-            return json.loads(raw.decode())
+            with instrument.span("http.request", url=url) as span:
+                res = urllib.request.urlopen(url)
+                raw = res.read()
+                span.set(bytes=len(raw))
         except urllib.request.URLError:
+            metrics.record_request("error", time.perf_counter() - start)
             return None
+        metrics.record_request("ok", time.perf_counter() - start, len(raw))
+        with instrument.span("decode", bytes=len(raw)):
+            return jsonlib.loads(raw)
 
     def __init__(self, league_id: int, season: Optional[int] = None,
-                 cache: Optional[Cache] = None) -> None:
+                 cache: Optional[Cache] = None,
+                 keep_raw: bool = False,
+                 registry: Optional[PlayerRegistry] = None,
+                 budget: Optional[BoxscoreBudget] = None,
+                 read_ahead: Optional[ReadAhead] = None,
+                 calendar: Optional[SeasonCalendar] = None,
+                 as_of: Optional[Union[date, datetime]] = None) -> None:
         if cache:
             self.cache = cache
             self.cache.set_league(self)
         self._endpoint = ENDPOINT
         self.league_id = league_id
+        if calendar is None:
+            calendar = SeasonCalendar(as_of)
+        elif as_of is not None:
+            raise ValueError("Specify either calendar or as_of, not both.")
+        self.calendar = calendar
         if season is None:
-            self.season = current_season()
+            self.season = calendar.season()
         else:
             self.season = season
 
+        self.keep_raw = keep_raw
+        if registry is None:
+            registry = default_registry
+        self.registry = registry
+        self.budget = budget
+        self.read_ahead = read_ahead
+        # guards boxscore state; `_inflight` maps (matchup number,
+        # scoring period) to the load in progress, if any
+        self._lock = threading.RLock()
+        self._inflight = dict()
+        # bumped whenever boxscores are loaded; invalidates derived indexes
+        self._boxscore_version = 0
+        self._player_index = None
+        self._player_index_version = -1
+        self._query_index = None
+        self._query_index_version = -1
+        self._aggregates = None
+
         # fetch league data
-        self._data = self._get_league_data()
-        settings = self._data["settings"]
+        data = self._get_league_data()
+        self._data = data if keep_raw else None
+        settings = data["settings"]
         self.name = settings["name"]
         self.size = settings["size"]
         self.draft_order = settings["draftSettings"]["pickOrder"]
         self.draft_type = settings["draftSettings"]["type"]
         self.reg_season_weeks = settings["scheduleSettings"]["matchupPeriodCount"]
-        self._matchup_week_map = settings["scheduleSettings"]["matchupPeriods"]
-        self.total_matchups = len(self._matchup_week_map)
-        members = self._data["members"]
+        matchup_periods = settings["scheduleSettings"]["matchupPeriods"]
+        self.schedule = ScheduleIndex(matchup_periods)
+        slot_counts = settings["rosterSettings"]["lineupSlotCounts"]
+        self.lineup_slot_counts = {int(k): v for k, v in slot_counts.items()}
+        self.lineup_optimizer = LineupOptimizer(self.lineup_slot_counts)
+        self.total_matchups = len(matchup_periods)
+        members = data["members"]
         self._members = {i["id"]: i for i in members}
         # set stat code to points map
         self.scoring_dict = dict()
         for item in settings["scoringSettings"]["scoringItems"]:
             self.scoring_dict[item["statId"]] = item["points"]
-        # instantiate teams
-        team_data = self._data["teams"]
-        self._teams = dict()
-        for team in team_data:
-            self._teams[team["id"]] = Team(team, self)
-        # instantiate matchups and add indices to _matchup_dict
-        self._matchups = []
-        self._matchup_dict = {}
-        for i, item in enumerate(self._data["schedule"]):
-            matchup = Matchup(item, self)
-            self._matchups.append(matchup)
-            num = matchup.matchup_num
-            # add matchup index to lookup dict for both teams
-            tmp = self._matchup_dict.setdefault(num, dict())
-            for team_id in matchup.team_ids:
-                tmp[team_id] = i
+        with instrument.span("league.construct", league_id=self.league_id,
+                             season=self.season) as span:
+            # instantiate teams
+            team_data = data["teams"]
+            self._teams = dict()
+            for team in team_data:
+                self._teams[team["id"]] = Team(team, self)
+            # instantiate matchups and index them by number and team
+            self._matchups = [Matchup(item, self, keep_raw)
+                              for item in data["schedule"]]
+            self.schedule.index_matchups(self._matchups)
+            span.set(teams=len(self._teams), matchups=len(self._matchups))
+        metrics.LEAGUES_HYDRATED.inc()
 
     def __repr__(self):
         return "ESPN League {} ({}) - {} - {} teams".format(
             self.league_id, self.season, self.name, self.size
         )
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"], state["_inflight"]
+        state["_aggregates"] = None
+        # budgets and read-ahead serve leagues of this process only
+        state["budget"], state["read_ahead"] = None, None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._inflight = dict()
+
+    def _evict_boxscores(self, matchup_num):
+        # called by `BoxscoreBudget`; boxscores reload on next request
+        with self._lock:
+            for m in self.schedule.matchups_by_number(matchup_num):
+                m.unload_boxscores()
+            self._boxscore_version += 1
+
+    def _unload_boxscores(self, matchup_num):
+        # evict without the budget, which stops tracking them
+        self._evict_boxscores(matchup_num)
+        if self.budget is not None:
+            self.budget.discard(self, matchup_num)
+
     @property
     def teams(self) -> List[Team]:
         """Teams composing the league.
@@ -93,6 +224,42 @@ class League:
         teams = list(self._teams.values())
         return sorted(teams, key=lambda i: i.team_id)
 
+    def _get_player_index(self):
+        with self._lock:
+            if self._player_index_version != self._boxscore_version:
+                index = dict()
+                for m in self._matchups:
+                    for tw in m.loaded_team_weeks():
+                        for pw in tw.slots:
+                            tmp = index.setdefault(pw.player.player_id, dict())
+                            tmp[tw.scoring_period] = pw
+                self._player_index = index
+                self._player_index_version = self._boxscore_version
+            return self._player_index
+
+    @property
+    def players(self) -> Dict[int, Player]:
+        """Players appearing in loaded boxscores, keyed by player ID
+
+        :return: player ID to player mapping
+        :rtype: Dict[int, Player]
+        """
+        return {pid: self.registry.get(pid, self.season)
+                for pid in self._get_player_index()}
+
+    def player_weeks(self, player_id: int) -> Dict[int, PlayerWeek]:
+        """Get a player's stat lines from loaded boxscores
+
+        Only includes weeks the player was on a fantasy roster.
+
+        :param player_id: ESPN player ID
+        :type player_id: int
+        :return: player-weeks keyed by scoring period, in order
+        :rtype: Dict[int, PlayerWeek]
+        """
+        weeks = self._get_player_index().get(player_id, dict())
+        return {sp: weeks[sp] for sp in sorted(weeks)}
+
     def get_team_by_id(self, team_id: int) -> Team:
         """Get team with given team ID
 
@@ -106,10 +273,12 @@ class League:
     @cache_operation
     def _get_league_data(self):
         logging.info("Requesting league settings from ESPN for %d." % self.league_id)
-        data = self._request_json(
-            self._endpoint.format(self.season, self.league_id))
+        with instrument.span("fetch", league_id=self.league_id,
+                             season=self.season, scoring_period=None):
+            data = self._request_json(
+                self._endpoint.format(self.season, self.league_id))
         if data is None:
-            raise ValueError("That league is not publicly accessible.")
+            raise LeagueFetchError("That league is not publicly accessible.")
         return data
 
     @cache_operation
@@ -118,32 +287,86 @@ class League:
                      % (self.league_id, scoring_period))
         url = self._endpoint.format(self.season, self.league_id)
         url += f"&scoringPeriodId={scoring_period}"
-        data = self._request_json(url)
+        with instrument.span("fetch", league_id=self.league_id,
+                             season=self.season,
+                             scoring_period=scoring_period):
+            data = self._request_json(url)
         if data is None:
-            raise RuntimeError("Failed to request scoring period data.")
+            raise ScoringPeriodFetchError(
+                "Failed to request scoring period data.")
         return data
 
+    def _get_matchup_data(self, scoring_period, matchup_num):
+        # caches implementing `Cache` can skip other matchups' entries
+        cache = getattr(self, "cache", None)
+        if isinstance(cache, Cache):
+            with instrument.span("cache.load_matchups",
+                                 cache=type(cache).__name__,
+                                 league_id=self.league_id, season=self.season,
+                                 scoring_period=scoring_period) as span:
+                data = cache.load_matchups(scoring_period, matchup_num)
+                span.set(hit=bool(data))
+            if data:
+                metrics.record_cache(type(cache).__name__, True)
+                return data
+        # a miss is recorded by the fallback's own cache load
+        data = self._get_scoring_period_data(scoring_period)
+        return select_matchups(data, matchup_num)
+
     def _populate_boxscores(self, matchup_num):
         scoring_periods = self.matchup_num_to_scoring_periods(matchup_num)
         if scoring_periods is None:
             raise ValueError(
                 "This league does not have a matchup number %d." % matchup_num)
-        for sp in scoring_periods:
-            data = self._get_scoring_period_data(sp)
-            data = [i for i in data["schedule"] if i["matchupPeriodId"] == matchup_num]
-            # for each matchup in this period, lookup Matchup object
-            # by home team ID, and set the boxscore data
-            for datum in data:
-                m = self.get_matchup(matchup_num, datum["home"]["teamId"])
-                if not m.boxscore_loaded:
-                    m.set_boxscore_data(datum, sp)
-
-    def _lookup_matchup(self, matchup_num, team_id):
+        with instrument.span("boxscores.load", league_id=self.league_id,
+                             season=self.season, matchup_num=matchup_num):
+            for sp in scoring_periods:
+                self._load_period(matchup_num, sp)
+
+    def _load_period(self, matchup_num, scoring_period):
+        # single-flight: the first caller fetches and sets the period's
+        # boxscores while concurrent callers wait for its result
+        key = (matchup_num, scoring_period)
+        matchups = self.schedule.matchups_by_number(matchup_num)
+        with self._lock:
+            if all(m._boxscore_loaded[scoring_period] for m in matchups):
+                return
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            flight.wait()
+            return
         try:
-            matchup_idx = self._matchup_dict[matchup_num][team_id]
-            return self._matchups[matchup_idx]
-        except KeyError:
-            return None
+            # fetch and decode without holding the lock
+            data = self._get_matchup_data(scoring_period, matchup_num)
+            set_matchups = []
+            with self._lock:
+                # for each matchup in this period, lookup Matchup object
+                # by home team ID, and set the boxscore data
+                for datum in data:
+                    m = self.schedule.matchup(matchup_num,
+                                              datum["home"]["teamId"])
+                    if not m._boxscore_loaded[scoring_period]:
+                        m.set_boxscore_data(datum, scoring_period,
+                                            self.registry)
+                        if m._boxscore_loaded[scoring_period]:
+                            set_matchups.append(m)
+                self._boxscore_version += 1
+            metrics.BOXSCORES_HYDRATED.inc(len(set_matchups))
+            if self.budget is not None and set_matchups:
+                # outside the lock: may evict other leagues' boxscores
+                self.budget.add(self, matchup_num, [
+                    tw for m in set_matchups
+                    for tw in m.loaded_team_weeks(scoring_period)])
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
 
     def get_matchup(self, number: int, team_id: int,
                     boxscore: bool = False) -> Matchup:
@@ -159,10 +382,14 @@ class League:
         :return: specified matchup
         :rtype: Matchup
         """
-        matchup = self._lookup_matchup(number, team_id)
+        matchup = self.schedule.matchup(number, team_id)
         if boxscore:
+            if self.read_ahead is not None:
+                self.read_ahead.record(self, number)
             if not matchup.boxscore_loaded:
                 self._populate_boxscores(number)
+            elif self.budget is not None:
+                self.budget.touch(self, number)
         return matchup
 
     def get_matchups_by_number(self, number: int,
@@ -177,11 +404,14 @@ class League:
         :return: specified matchups
         :rtype: List[Matchup]
         """
-        idx = set(self._matchup_dict[number].values())
-        matchups = [self._matchups[i] for i in idx]
+        matchups = self.schedule.matchups_by_number(number)
         if boxscore:
+            if self.read_ahead is not None:
+                self.read_ahead.record(self, number)
             if not all(i.boxscore_loaded for i in matchups):
                 self._populate_boxscores(number)
+            elif self.budget is not None:
+                self.budget.touch(self, number)
         return matchups
 
     def all_scores(self, include_playoffs: bool = True) -> List[float]:
@@ -213,6 +443,111 @@ class League:
         scores = self.all_scores(include_playoffs)
         return float(sum(scores)) / len(scores)
 
+    def optimal_lineups(self, include_playoffs: bool = True) -> List[Lineup]:
+        """Get optimal lineup for every team-week of completed matchups
+
+        Loads boxscores for all matchups up to (and excluding) the current
+        one, which will require Internet connection if data are not cached.
+        Each matchup number's lineups are computed right after loading
+        its boxscores, so a `budget` evicting them while later numbers
+        load does not drop lineups.
+
+        :param include_playoffs: whether to include playoff matchups
+        :type include_playoffs: bool
+        :return: optimal lineups, ordered by matchup number
+        :rtype: List[Lineup]
+        """
+        lineups = []
+        for num in self._completed_matchup_nums():
+            for m in self.get_matchups_by_number(num, boxscore=True):
+                if (not include_playoffs) and m.is_playoff:
+                    continue
+                if not m.boxscore_loaded:  # see `Matchup.error`
+                    continue
+                for weeks in m.all_data:
+                    for tw in weeks or []:
+                        lineups.append(self.lineup_optimizer.optimize(tw))
+        return lineups
+
+    def _completed_matchup_nums(self):
+        cm = self.current_matchup_num()
+        return [i for i in self.schedule.matchup_nums if i < cm]
+
+    def load_boxscores(self, numbers: Optional[Iterable[int]] = None
+                       ) -> List[int]:
+        """Load boxscores for several matchup numbers
+
+        Will require Internet connection if data are not cached.
+
+        With a `budget`, loading later numbers may evict the boxscores
+        of earlier ones (a warning is logged if so); request boxscores
+        number by number, as `optimal_lineups` does, to use each before
+        it can be evicted.
+
+        :param numbers: matchup numbers to load (defaults to all matchups
+                        up to and excluding the current one)
+        :type numbers: Optional[Iterable[int]]
+        :return: loaded matchup numbers, in order
+        :rtype: List[int]
+        """
+        if numbers is None:
+            numbers = self._completed_matchup_nums()
+        numbers = sorted(numbers)
+        for num in numbers:
+            self.get_matchups_by_number(num, boxscore=True)
+        if self.budget is not None:
+            evicted = [num for num in numbers if not any(
+                m.boxscore_loaded or m.error
+                for m in self.schedule.matchups_by_number(num))]
+            if evicted:
+                logging.warning(
+                    "Boxscores of matchup numbers %s were evicted by the "
+                    "budget while loading." % evicted)
+        return numbers
+
+    def query(self, **filters) -> List[PlayerWeekRow]:
+        """Find player-weeks in loaded boxscores
+
+        Accepts the filters of :meth:`espyn.query.PlayerWeekIndex.query`,
+        e.g. ``league.query(position="RB", slot="FLEX", min_points=20,
+        scoring_period=range(5, 10))``. Boxscores are not loaded
+        automatically; see `load_boxscores`. The index is rebuilt
+        when more boxscores have been loaded since the last query.
+        Boxscores evicted by a `budget` are not searched.
+
+        :return: matching player-weeks, ordered by matchup
+        :rtype: List[PlayerWeekRow]
+        """
+        with self._lock:
+            if self._query_index_version != self._boxscore_version:
+                self._query_index = PlayerWeekIndex.from_matchups(
+                    self._matchups)
+                self._query_index_version = self._boxscore_version
+            index = self._query_index
+        return index.query(**filters)
+
+    def aggregates(self, refresh: bool = True) -> SeasonAggregates:
+        """Get season aggregates per player, team and position
+
+        The tables are built from cached boxscore data without
+        hydrating matchups, and persisted next to a `LocalCache`'s
+        files. See :class:`espyn.aggregates.SeasonAggregates`.
+
+        :param refresh: whether to recompute scoring periods up to
+                        the current week that are missing or whose
+                        cached data changed
+        :type refresh: bool
+        :return: aggregates
+        :rtype: SeasonAggregates
+        """
+        with self._lock:
+            if self._aggregates is None:
+                self._aggregates = SeasonAggregates(self)
+            aggregates = self._aggregates
+        if refresh:
+            aggregates.refresh()
+        return aggregates
+
     def matchup_num_to_scoring_periods(self, matchup_num: int) -> List[int]:
         """Get scoring periods corresponding to a matchup number
 
@@ -221,8 +556,7 @@ class League:
         :return: scoring period(s) composing matchup
         :rtype: List[int]
         """
-        num = str(matchup_num)
-        return self._matchup_week_map.get(num)
+        return self.schedule.scoring_periods(matchup_num)
 
     def scoring_period_to_matchup_num(self, scoring_period: int) -> Optional[int]:
         """Get matchup number corresponding to a scoring period
@@ -234,10 +568,7 @@ class League:
         :return: matchup number
         :rtype: Optional[int]
         """
-        for m, sps in self._matchup_week_map.items():
-            if scoring_period in sps:
-                return int(m)
-        return None
+        return self.schedule.matchup_num(scoring_period)
 
     def name_from_user_id(self, user_id: str) -> Optional[str]:
         """Get member name from ESPN user ID
@@ -255,10 +586,15 @@ class League:
     def current_matchup_num(self) -> int:
         """Get current matchup number
 
+        Determined by the league's `calendar`: 1 before the league's
+        season starts, and `SEASON_OVER` after its last matchup.
+
         :return: matchup number
         :rtype: int
         """
-        cw = current_week()
+        cw = self.calendar.week(self.season)
+        if cw < 1:
+            return 1
         mn = self.scoring_period_to_matchup_num(cw)
         if mn is not None:
             return mn
@@ -0,0 +1,201 @@
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .constants import SLOTS, BENCH_SLOT_IDS, INJURED_SLOT_ID
+if TYPE_CHECKING:
+    from .team_week import TeamWeek
+    from .player_week import PlayerWeek
+
+
+# cost assigned to ineligible player-slot pairs; large enough that the
+# solver prefers leaving a slot empty over an illegal placement
+_INELIGIBLE = 1e9
+
+
+def _player_points(player_week: "PlayerWeek") -> float:
+    return getattr(player_week, "points", None) or 0.
+
+
+def _min_cost_assignment(cost: List[List[float]]) -> List[int]:
+    """Solve rectangular assignment problem (Hungarian algorithm)
+
+    Each row is assigned a distinct column such that the total cost
+    is minimized. Requires at least as many columns as rows.
+    Runs in O(n^2 m) for n rows and m columns.
+
+    :param cost: n x m cost matrix with n <= m
+    :type cost: List[List[float]]
+    :return: column index assigned to each row
+    :rtype: List[int]
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    inf = float("inf")
+    # potentials and matching are 1-indexed; index 0 is a sentinel
+    u = [0.] * (n + 1)
+    v = [0.] * (m + 1)
+    match = [0] * (m + 1)  # row matched to each column
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # unwind augmenting path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
+
+
+class Lineup:
+    """Optimal lineup for a team's scoring period
+
+    :param team_week: boxscore the lineup was computed from
+    :type team_week: TeamWeek
+    :param starters: slot ID and player-week (None if slot left empty)
+                     for each starting slot in the optimal lineup
+    :type starters: List[Tuple[int, Optional[PlayerWeek]]]
+    """
+
+    def __init__(self, team_week: "TeamWeek",
+                 starters: List[Tuple[int, Optional["PlayerWeek"]]]) -> None:
+        self.team_id = team_week.team_id
+        self.scoring_period = team_week.scoring_period
+        self.starters = starters
+        self.optimal_points = round(
+            sum(_player_points(pw) for _, pw in starters if pw is not None), 2)
+        self.actual_points = round(
+            sum(_player_points(pw) for pw in team_week.slots
+                if pw.slot_id not in BENCH_SLOT_IDS), 2)
+
+    def __repr__(self):
+        return "Lineup : Scoring Period {} : {} of {} points".format(
+            self.scoring_period, self.actual_points, self.optimal_points)
+
+    @property
+    def bench_points(self) -> float:
+        """Points left on the bench (optimal minus actual points)
+
+        :return: points lost to lineup decisions
+        :rtype: float
+        """
+        return round(self.optimal_points - self.actual_points, 2)
+
+    @property
+    def efficiency(self) -> float:
+        """Fraction of optimal points scored by actual lineup
+
+        :return: lineup efficiency (1.0 if optimal score is not positive)
+        :rtype: float
+        """
+        if self.optimal_points <= 0:
+            return 1.
+        return self.actual_points / self.optimal_points
+
+    def to_json(self):
+        """Get JSON-serializable dictionary representation
+
+        :return: dictionary representation of lineup
+        :rtype: Dict[str, Any]
+        """
+        res = dict()
+        res["team_id"] = self.team_id
+        res["scoring_period"] = self.scoring_period
+        res["starters"] = [
+            {"slot": SLOTS.get(slot_id, str(slot_id)),
+             "player_id": pw.player.player_id if pw else None}
+            for slot_id, pw in self.starters
+        ]
+        res["optimal_points"] = self.optimal_points
+        res["actual_points"] = self.actual_points
+        res["bench_points"] = self.bench_points
+        res["efficiency"] = self.efficiency
+        return res
+
+
+class LineupOptimizer:
+    """Compute optimal lineups from a league's starting slot counts
+
+    Every rostered player except those on injured reserve is a
+    candidate for every starting slot listed in their eligible slots.
+    The lineup is solved exactly as a maximum-weight assignment of
+    players to slots, so flexible slots (FLEX, OP, RB/WR) are filled
+    optimally. Slots with no eligible player are left empty.
+
+    :param slot_counts: number of starters per lineup slot ID
+    :type slot_counts: Dict[int, int]
+    """
+
+    def __init__(self, slot_counts: Dict[int, int]) -> None:
+        self.slot_counts = {
+            slot_id: count for slot_id, count in slot_counts.items()
+            if count > 0 and slot_id not in BENCH_SLOT_IDS
+        }
+        # one entry per starting position, e.g. [0, 2, 2, 4, 4, ...]
+        self._slot_ids = []
+        for slot_id in sorted(self.slot_counts):
+            self._slot_ids.extend([slot_id] * self.slot_counts[slot_id])
+
+    def optimize(self, team_week: "TeamWeek") -> Lineup:
+        """Compute optimal lineup for a team's scoring period
+
+        :param team_week: team boxscore
+        :type team_week: TeamWeek
+        :return: optimal lineup
+        :rtype: Lineup
+        """
+        players = [pw for pw in team_week.slots
+                   if pw.slot_id != INJURED_SLOT_ID]
+        n_slots = len(self._slot_ids)
+        # one dummy column per slot allows a slot to be left empty
+        cost = []
+        for slot_id in self._slot_ids:
+            row = []
+            for pw in players:
+                if slot_id in pw.player.eligible_slots:
+                    row.append(-_player_points(pw))
+                else:
+                    row.append(_INELIGIBLE)
+            row.extend([0.] * n_slots)
+            cost.append(row)
+        assignment = _min_cost_assignment(cost)
+        starters = []
+        for i, col in enumerate(assignment):
+            # dummy or (defensively) ineligible placements leave slot empty
+            if col >= len(players) or cost[i][col] >= _INELIGIBLE:
+                starters.append((self._slot_ids[i], None))
+            else:
+                starters.append((self._slot_ids[i], players[col]))
+        return Lineup(team_week, starters)
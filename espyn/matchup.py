@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 from .team_week import TeamWeek
 if TYPE_CHECKING:
+    from .registry import PlayerRegistry
     from .league import League
     from .team import Team
 
@@ -16,13 +17,21 @@ class Matchup:
     :type matchup_data: Dict[str, Any]
     :param league: fantasy league to which matchup belongs
     :type league: League
+    :param keep_raw: whether to retain API response data as `_data`
+    :type keep_raw: bool
     """
 
+    __slots__ = ("_data", "_league", "matchup_num", "scoring_periods",
+                 "_boxscore_data", "_boxscore_loaded", "_errors",
+                 "is_playoff", "is_bye", "num_weeks", "home_team_id",
+                 "home_score", "home_scores", "away_team_id", "away_score",
+                 "away_scores", "winner")
+
     def __init__(self, matchup_data: Dict[str, Any],
-                 league: "League") -> None:
-        self._data = matchup_data
+                 league: "League", keep_raw: bool = False) -> None:
+        self._data = matchup_data if keep_raw else None
         self._league = league
-        self.matchup_num = self._data["matchupPeriodId"]
+        self.matchup_num = matchup_data["matchupPeriodId"]
         self.scoring_periods = league.matchup_num_to_scoring_periods(
             self.matchup_num)
         self._boxscore_data = {
@@ -34,21 +43,21 @@ class Matchup:
         self.is_playoff = self.matchup_num > league.reg_season_weeks
         self.is_bye = False  # change upon inspection of data
         self.num_weeks = len(self.scoring_periods)
-        self.home_team_id = self._data["home"]["teamId"]
-        self.home_score = self._data["home"]["totalPoints"]
-        pscores = self._data["home"].get("pointsByScoringPeriod", dict())
+        self.home_team_id = matchup_data["home"]["teamId"]
+        self.home_score = matchup_data["home"]["totalPoints"]
+        pscores = matchup_data["home"].get("pointsByScoringPeriod", dict())
         self.home_scores = [pscores.get(str(i), 0) for i in self.scoring_periods]
-        if self._data.get("away"):
-            self.away_team_id = self._data["away"]["teamId"]
-            self.away_score = self._data["away"]["totalPoints"]
-            pscores = self._data["away"].get("pointsByScoringPeriod", dict())
+        if matchup_data.get("away"):
+            self.away_team_id = matchup_data["away"]["teamId"]
+            self.away_score = matchup_data["away"]["totalPoints"]
+            pscores = matchup_data["away"].get("pointsByScoringPeriod", dict())
             self.away_scores = [pscores.get(str(i), 0) for i in self.scoring_periods]
         else:
             self.is_bye = True
             self.away_team_id = None
             self.away_score = None
             self.away_scores = []
-        self.winner = self._data["winner"]
+        self.winner = matchup_data["winner"]
 
     @property
     def boxscore_loaded(self) -> bool:
@@ -102,17 +111,75 @@ class Matchup:
                 f"Boxscore missing away team data for period {scoring_period}.")
         return
 
-    def set_boxscore_data(self, data, scoring_period):
+    def set_boxscore_data(self, data: Dict[str, Any], scoring_period: int,
+                          registry: Optional["PlayerRegistry"] = None) -> None:
+        """Set boxscore data for one of the matchup's scoring periods
+
+        :param data: matchup data from scoring period's API response
+        :type data: Dict[str, Any]
+        :param scoring_period: scoring period of data
+        :type scoring_period: int
+        :param registry: registry interning players
+        :type registry: Optional[PlayerRegistry]
+        """
         self._validate_boxscore_data(data, scoring_period)
         if self.error:
             return
-        self._boxscore_data["home"][scoring_period] = TeamWeek(
-            data["home"], scoring_period)
+        season = self._league.season
+        home = TeamWeek(data["home"], scoring_period, registry, season)
+        away = None
+        if not self.is_bye:
+            away = TeamWeek(data["away"], scoring_period, registry, season)
+        self.set_team_weeks(scoring_period, home, away)
+
+    def set_team_weeks(self, scoring_period: int, home: TeamWeek,
+                       away: Optional[TeamWeek] = None) -> None:
+        """Set already constructed boxscores for a scoring period
+
+        :param scoring_period: scoring period of boxscores
+        :type scoring_period: int
+        :param home: home team's boxscore
+        :type home: TeamWeek
+        :param away: away team's boxscore (None if bye)
+        :type away: Optional[TeamWeek]
+        """
+        self._boxscore_data["home"][scoring_period] = home
         if not self.is_bye:
-            self._boxscore_data["away"][scoring_period] = TeamWeek(
-                data["away"], scoring_period)
+            self._boxscore_data["away"][scoring_period] = away
         self._boxscore_loaded[scoring_period] = True
 
+    def unload_boxscores(self) -> None:
+        """Drop loaded boxscores, so they are loaded again when requested
+        """
+        for side in ("home", "away"):
+            for sp in self.scoring_periods:
+                self._boxscore_data[side][sp] = None
+        for sp in self.scoring_periods:
+            self._boxscore_loaded[sp] = False
+
+    def loaded_team_weeks(self, scoring_period: Optional[int] = None
+                          ) -> List[TeamWeek]:
+        """Boxscores loaded so far, for both teams and all scoring periods
+
+        Unlike `home_data` and `away_data`, includes scoring periods of
+        partially loaded matchups.
+
+        :param scoring_period: only include this scoring period
+        :type scoring_period: Optional[int]
+        :return: loaded boxscores
+        :rtype: List[TeamWeek]
+        """
+        sps = self.scoring_periods
+        if scoring_period is not None:
+            sps = [scoring_period]
+        res = []
+        for side in ("home", "away"):
+            for sp in sps:
+                tw = self._boxscore_data[side][sp]
+                if tw is not None:
+                    res.append(tw)
+        return res
+
     @property
     def home_team(self) -> "Team":
         """Home team
@@ -173,9 +240,14 @@ class Matchup:
             raise RuntimeError("Boxscore not loaded for this matchup.")
         return [self.home_data, self.away_data]
 
-    def to_json(self) -> Dict[str, Any]:
+    def to_json(self, boxscores: bool = True) -> Dict[str, Any]:
         """Get JSON-serializable dictionary representation
 
+        Boxscores are included as `home_data` and `away_data` if
+        loaded (otherwise None).
+
+        :param boxscores: whether to include `home_data` and `away_data`
+        :type boxscores: bool
         :return: dictionary representation of matchup
         :rtype: Dict[str, Any]
         """
@@ -192,8 +264,10 @@ class Matchup:
         res["scoring_periods"] = self.scoring_periods
         res["num_weeks"] = self.num_weeks
         res["is_playoff"] = self.is_playoff
-        res["home_data"] = None
-        res["away_data"] = None
+        if boxscores:
+            for key, data in (("home_data", self.home_data),
+                              ("away_data", self.away_data)):
+                res[key] = [tw.to_json() for tw in data] if data else None
         return res
 
     def get_individual_scores(self) -> List[float]:
@@ -0,0 +1,377 @@
+"""Process-level metrics in Prometheus text format
+
+Counters are updated by `League` fetch paths and cache operations, so
+long-running ingestion workers can export request outcomes and
+latency, bytes downloaded, cache hits per cache class, leagues and
+boxscores hydrated, boxscores resident and evicted under a
+`BoxscoreBudget`, and the time since the last successful API
+response ("poll lag"). Metrics are rendered with `render_metrics`
+or served over HTTP with `start_http_server`::
+
+    from espyn import metrics
+    server = metrics.start_http_server(9464)
+"""
+import math
+import time
+import threading
+from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#: all metrics, in rendering order
+REGISTRY: List["Metric"] = []
+
+
+def _escape(value) -> str:
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(k, _escape(v))
+                          for k, v in pairs) + "}"
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for labelled metrics
+
+    :param name: metric name
+    :type name: str
+    :param documentation: help text
+    :type documentation: str
+    :param labelnames: label names
+    :type labelnames: Sequence[str]
+    :param register: whether to add the metric to `REGISTRY`
+    :type register: bool
+    """
+
+    type_name = None
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = (),
+                 register: bool = True) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = dict()  # label values tuple to value
+        self._lock = threading.Lock()
+        if register:
+            REGISTRY.append(self)
+
+    def _key(self, labels) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError("Expected labels {}.".format(self.labelnames))
+        return tuple(labels[i] for i in self.labelnames)
+
+    def value(self, **labels):
+        """Get current value for label values
+
+        :param labels: label values
+        :return: value (0 if never updated)
+        """
+        return self._values.get(self._key(labels), 0)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Get samples to render
+
+        :return: (sample name, formatted labels, value) tuples
+        :rtype: List[Tuple[str, str, float]]
+        """
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, k), v)
+                for k, v in items]
+
+    def render(self) -> str:
+        """Render metric in Prometheus text format
+
+        :return: HELP, TYPE and sample lines
+        :rtype: str
+        """
+        lines = ["# HELP {} {}".format(self.name, self.documentation),
+                 "# TYPE {} {}".format(self.name, self.type_name)]
+        for name, labels, value in self.samples():
+            lines.append("{}{} {}".format(name, labels, _format_value(value)))
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increment counter
+
+        :param amount: non-negative increment
+        :type amount: float
+        :param labels: label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or be computed when rendered
+
+    :param func: if given, called at render time for the (unlabelled)
+                 value instead of using set values
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), register=True,
+                 func=None):
+        super().__init__(name, documentation, labelnames, register)
+        self.func = func
+
+    def set(self, value: float, **labels) -> None:
+        """Set gauge value
+
+        :param value: value
+        :type value: float
+        :param labels: label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increment (or, with a negative amount, decrement) gauge
+
+        :param amount: increment
+        :type amount: float
+        :param labels: label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        if self.func is not None:
+            value = self.func()
+            return [] if value is None else [(self.name, "", value)]
+        return super().samples()
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets
+
+    :param buckets: upper bounds of buckets (+Inf is added)
+    """
+
+    type_name = "histogram"
+    DEFAULT_BUCKETS = (.05, .1, .25, .5, 1., 2.5, 5., 10.)
+
+    def __init__(self, name, documentation, labelnames=(), register=True,
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, register)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        """Record an observation
+
+        :param value: observed value
+        :type value: float
+        :param labels: label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0., 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def value(self, **labels):
+        """Get number of observations for label values
+
+        :param labels: label values
+        :return: observation count
+        :rtype: int
+        """
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2]))
+                           for k, v in self._values.items())
+        res = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key,
+                                        [("le", _format_value(bound))])
+                res.append((self.name + "_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            res.append((self.name + "_sum", labels, total))
+            res.append((self.name + "_count", labels, count))
+        return res
+
+
+REQUESTS = Counter("espyn_requests_total",
+                   "ESPN API requests by outcome.", ["outcome"])
+REQUEST_SECONDS = Histogram("espyn_request_duration_seconds",
+                            "Latency of ESPN API requests.")
+DOWNLOADED_BYTES = Counter("espyn_downloaded_bytes_total",
+                           "Bytes of API responses downloaded.")
+CACHE_REQUESTS = Counter("espyn_cache_requests_total",
+                         "Cache loads by cache class and result.",
+                         ["cache", "result"])
+LEAGUES_HYDRATED = Counter("espyn_leagues_hydrated_total",
+                           "Leagues constructed.")
+BOXSCORES_HYDRATED = Counter("espyn_boxscores_hydrated_total",
+                             "Matchup boxscores loaded, per scoring period.")
+BOXSCORES_RESIDENT = Gauge("espyn_boxscores_resident_stat_lines",
+                           "Stat lines held by budgeted boxscores.")
+BOXSCORE_EVICTIONS = Counter("espyn_boxscore_evictions_total",
+                             "Matchup boxscores evicted by budgets.")
+PREFETCHES = Counter("espyn_prefetches_total",
+                     "Matchup boxscores loaded by read-ahead.")
+LAST_FETCH = Gauge("espyn_last_fetch_timestamp_seconds",
+                   "Unix time of the last successful API response.")
+
+
+class _CacheHitRatio(Gauge):
+    # derived from CACHE_REQUESTS at render time
+
+    def samples(self):
+        hits, totals = dict(), dict()
+        for (cache, result), n in list(CACHE_REQUESTS._values.items()):
+            totals[cache] = totals.get(cache, 0) + n
+            if result == "hit":
+                hits[cache] = hits.get(cache, 0) + n
+        return [(self.name, _format_labels(self.labelnames, [c]),
+                 hits.get(c, 0) / n) for c, n in sorted(totals.items()) if n]
+
+
+CACHE_HIT_RATIO = _CacheHitRatio("espyn_cache_hit_ratio",
+                                 "Fraction of cache loads that hit.",
+                                 ["cache"])
+
+
+def _poll_lag() -> Optional[float]:
+    last = LAST_FETCH._values.get(())
+    return None if last is None else max(time.time() - last, 0.)
+
+
+POLL_LAG = Gauge("espyn_poll_lag_seconds",
+                 "Seconds since the last successful API response.",
+                 func=_poll_lag)
+
+
+def record_request(outcome: str, seconds: float, num_bytes: int = 0) -> None:
+    """Record an API request
+
+    :param outcome: "ok" or "error"
+    :type outcome: str
+    :param seconds: request latency
+    :type seconds: float
+    :param num_bytes: response size
+    :type num_bytes: int
+    """
+    REQUESTS.inc(outcome=outcome)
+    REQUEST_SECONDS.observe(seconds)
+    if outcome == "ok":
+        DOWNLOADED_BYTES.inc(num_bytes)
+        LAST_FETCH.set(time.time())
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache load
+
+    :param cache: cache class name
+    :type cache: str
+    :param hit: whether the cache returned data
+    :type hit: bool
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render_metrics() -> str:
+    """Render all registered metrics in Prometheus text format
+
+    :return: exposition text
+    :rtype: str
+    """
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+_handler = None
+
+
+def _get_handler():
+    # http.server is imported on first use: this module is imported
+    # by `League`, and the HTTP stack is slow to import
+    global _handler
+    if _handler is not None:
+        return _handler
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """HTTP handler serving `render_metrics` at ``/metrics`` (and ``/``)"""
+
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render_metrics().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    _handler = MetricsHandler
+    return _handler
+
+
+def __getattr__(name):
+    # `MetricsHandler` is created lazily, see `_get_handler`
+    if name == "MetricsHandler":
+        return _get_handler()
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def start_http_server(port: int, addr: str = "") -> "ThreadingHTTPServer":
+    """Serve metrics from a daemon thread
+
+    :param port: port to listen on (0 for any free port)
+    :type port: int
+    :param addr: address to bind
+    :type addr: str
+    :return: running server; call `shutdown` to stop it
+    :rtype: ThreadingHTTPServer
+    """
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((addr, port), _get_handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,157 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from . import metrics
+from .caches import LocalCache, select_matchups
+from .registry import PlayerRegistry
+from .team_week import TeamWeek
+if TYPE_CHECKING:
+    from .league import League
+
+
+class _LeagueKey:
+    """Picklable stand-in for a `League` in worker processes
+
+    Provides the attributes used by caches and by
+    `League._get_scoring_period_data`.
+    """
+
+    def __init__(self, league: "League") -> None:
+        self.league_id = league.league_id
+        self.season = league.season
+        self._endpoint = league._endpoint
+        self.cache = None
+        cache = getattr(league, "cache", None)
+        if cache is not None:
+            self.cache = LocalCache(cache.cache_dir, cache.ignore_cache,
+                                    cache.shared_stats)
+            self.cache.set_league(self)
+
+    def _request_json(self, url):
+        from .league import League
+        return League._request_json(url)
+
+    def load_matchups(self, scoring_period, matchup_num):
+        if self.cache is not None:
+            data = self.cache.load_matchups(scoring_period, matchup_num)
+            if data:
+                return data
+        from .league import League
+        data = League._get_scoring_period_data(self, scoring_period)
+        return select_matchups(data, matchup_num)
+
+
+def _hydrate_period(key: _LeagueKey, scoring_period: int,
+                    matchup_num: int) -> Tuple[int, int, List[Tuple]]:
+    # runs in worker: fetch/decode one scoring period and build the
+    # matchup number's boxscores, returning them fully parsed and
+    # detached from the worker's registry
+    results = []
+    registry = PlayerRegistry()
+    for datum in key.load_matchups(scoring_period, matchup_num):
+        home_id = datum["home"]["teamId"]
+        valid = "rosterForCurrentScoringPeriod" in datum["home"]
+        if datum.get("away"):
+            valid = valid and "rosterForCurrentScoringPeriod" in datum["away"]
+        if not valid:
+            # let the parent's `Matchup` record the error
+            results.append((home_id, None, None, datum))
+            continue
+        home = TeamWeek(datum["home"], scoring_period, registry,
+                        key.season)
+        away = None
+        if datum.get("away"):
+            away = TeamWeek(datum["away"], scoring_period, registry,
+                            key.season)
+        for tw in (home, away):
+            for pw in (tw.slots if tw is not None else ()):
+                pw._detach()
+        results.append((home_id, home, away, None))
+    return matchup_num, scoring_period, results
+
+
+def _attach(league: "League", matchup_num: int, scoring_period: int,
+            results: List[Tuple]) -> List[TeamWeek]:
+    # returns the newly set boxscores
+    registry = league.registry
+    loaded = []
+    for home_id, home, away, datum in results:
+        m = league.get_matchup(matchup_num, home_id)
+        if m is None or m._boxscore_loaded.get(scoring_period):
+            continue
+        if datum is not None:
+            m.set_boxscore_data(datum, scoring_period, registry)
+            if m._boxscore_loaded[scoring_period]:
+                loaded.extend(m.loaded_team_weeks(scoring_period))
+                metrics.BOXSCORES_HYDRATED.inc()
+            continue
+        # swap workers' players and stat lines for interned ones
+        for tw in (home, away):
+            for pw in (tw.slots if tw is not None else ()):
+                pw._rebind(registry)
+        m.set_team_weeks(scoring_period, home, away)
+        loaded.extend(m.loaded_team_weeks(scoring_period))
+        metrics.BOXSCORES_HYDRATED.inc()
+    return loaded
+
+
+def hydrate_boxscores(league: "League",
+                      numbers: Optional[Iterable[int]] = None,
+                      max_workers: Optional[int] = None) -> List[int]:
+    """Load boxscores using a pool of worker processes
+
+    Each scoring period of each matchup number is fetched (or read
+    from the cache), decoded and parsed into `TeamWeek` objects in a
+    worker process; the parent only attaches the results to the
+    league's matchups and interns their players in `league.registry`.
+    Responses fetched by workers are saved to the cache.
+
+    Parallel hydration requires the league to have no cache or a
+    `LocalCache` (which workers can open themselves); otherwise
+    boxscores are loaded in this process.
+
+    :param league: league to hydrate
+    :type league: League
+    :param numbers: matchup numbers to load (defaults to all matchups
+                    up to and excluding the current one)
+    :type numbers: Optional[Iterable[int]]
+    :param max_workers: number of worker processes (defaults to the
+                        number of CPUs)
+    :type max_workers: Optional[int]
+    :return: loaded matchup numbers, in order
+    :rtype: List[int]
+    """
+    if numbers is None:
+        cm = league.current_matchup_num()
+        numbers = [i for i in league.schedule.matchup_nums if i < cm]
+    numbers = sorted(numbers)
+    cache = getattr(league, "cache", None)
+    if cache is not None and not isinstance(cache, LocalCache):
+        logging.info("Cache cannot be shared with workers; "
+                     "loading boxscores serially.")
+        return league.load_boxscores(numbers)
+    tasks = []
+    for num in numbers:
+        sps = league.matchup_num_to_scoring_periods(num)
+        if sps is None:
+            raise ValueError(
+                "This league does not have a matchup number %d." % num)
+        matchups = league.get_matchups_by_number(num)
+        for sp in sps:
+            if not all(m._boxscore_loaded[sp] for m in matchups):
+                tasks.append((num, sp))
+    if not tasks:
+        return numbers
+    key = _LeagueKey(league)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_hydrate_period, key, sp, num)
+                   for num, sp in tasks]
+        for future in as_completed(futures):
+            num, sp, results = future.result()
+            with league._lock:
+                loaded = _attach(league, num, sp, results)
+                league._boxscore_version += 1
+            if league.budget is not None and loaded:
+                league.budget.add(league, num, loaded)
+    return numbers
@@ -10,6 +10,10 @@ class Player:
     :type player_data: Dict[str, Any]
     """
 
+    __slots__ = ("first_name", "last_name", "default_position_id",
+                 "position", "eligible_slots", "player_id", "_pro_team_id",
+                 "pro_team")
+
     def __init__(self, player_data: Dict[str, Any]) -> None:
         self.first_name = player_data["firstName"]
         self.last_name = player_data["lastName"]
@@ -19,11 +23,6 @@ class Player:
         self.player_id = player_data["id"]
         self._pro_team_id = player_data["proTeamId"]
         self.pro_team = PRO_TEAMS[self._pro_team_id]
-        if player_data.get("stats"):
-            self._pro_team_id_during_match = player_data["stats"][0]["proTeamId"]
-            self.pro_team_during_match = PRO_TEAMS[self._pro_team_id_during_match]
-        else:
-            self.pro_team_during_match = None
 
     @property
     def full_name(self) -> str:
@@ -1,36 +1,70 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from .player import Player
-from .constants import SLOTS, STAT_CODES
+from .constants import SLOTS, STAT_CODES, PRO_TEAMS
+from .registry import PlayerRegistry, default_registry
+from .stat_store import coded_stats
 
 
 class PlayerWeek:
     """Representation of player stat line for one NFL week
 
+    Stat dictionaries are converted to integer stat codes the first
+    time they are read. Given the season and scoring period, actual
+    stats are shared through the registry's stat line store: a
+    player-week whose stat line is already stored with the same values
+    (e.g. read from another league) references it from the start.
+
     :param stat_data: data from API response
     :type stat_data: Dict[str, Any]
+    :param registry: registry interning the week's `Player` (defaults to
+                     the process-wide registry)
+    :type registry: Optional[PlayerRegistry]
+    :param season: season of the data, under which the player is
+                   interned (stats are not shared if None)
+    :type season: Optional[int]
+    :param scoring_period: scoring period of the stats (not shared if
+                           None)
+    :type scoring_period: Optional[int]
     """
 
-    def __init__(self, stat_data: Dict[str, Any]) -> None:
+    __slots__ = ("player", "slot_id", "slot", "points", "projected_points",
+                 "_pro_team_id_during_match", "_raw_stats", "_raw_proj",
+                 "_stats", "_proj", "_registry", "_stat_key")
+
+    def __init__(self, stat_data: Dict[str, Any],
+                 registry: Optional[PlayerRegistry] = None,
+                 season: Optional[int] = None,
+                 scoring_period: Optional[int] = None) -> None:
+        if registry is None:
+            registry = default_registry
         ppe = stat_data["playerPoolEntry"]
-        self.player = Player(ppe["player"])
+        self.player = registry.intern(ppe["player"], season)
         self.slot_id = stat_data["lineupSlotId"]
         self.slot = SLOTS[self.slot_id]
+        self.points, self.projected_points = None, None
+        self._pro_team_id_during_match = None
+        self._raw_stats, self._raw_proj = None, None
+        self._stats, self._proj = dict(), dict()
+        self._registry = None
+        self._stat_key = None
+        if season is not None and scoring_period is not None:
+            self._stat_key = (season, scoring_period, self.player.player_id)
         stats_arr = ppe["player"]["stats"]
         if not stats_arr:
             return
         real = stats_arr[0]
+        self._pro_team_id_during_match = real["proTeamId"]
         proj = stats_arr[1] if len(stats_arr) == 2 else dict()
         self.points = ppe["appliedStatTotal"]
         self.projected_points = proj.get("appliedTotal") or 0.
-        self._coded_stats, self._coded_proj = dict(), dict()
-        self._coded_stats = {
-            int(k): v for k, v in real["stats"].items()
-        }
+        self._stats = None
+        if self._stat_key is not None:
+            self._stats = registry.stats.get(*self._stat_key, real["stats"])
+        if self._stats is None:
+            # keep the API stat entry until stats are read
+            self._raw_stats, self._registry = real, registry
         if proj.get("stats"):
-            self._coded_proj = {
-                int(k): v for k, v in proj["stats"].items()
-            }
+            self._raw_proj, self._proj = proj["stats"], None
 
     def __repr__(self):
         pts_str = "Inactive" if self.points is None else "%0.1f points" % self.points
@@ -38,6 +72,64 @@ class PlayerWeek:
             self.slot, self.player, pts_str
         )
 
+    @property
+    def _coded_stats(self) -> Dict[int, float]:
+        raw, registry = self._raw_stats, self._registry
+        if raw is not None and registry is not None:
+            # a concurrent reader may see either of two equal dicts
+            if self._stat_key is None:
+                self._stats = coded_stats(raw["stats"])
+            else:
+                self._stats = registry.stats.intern(*self._stat_key,
+                                                    raw["stats"])
+            self._raw_stats, self._registry = None, None
+        return self._stats
+
+    @property
+    def _coded_proj(self) -> Dict[int, float]:
+        raw = self._raw_proj
+        if raw is not None:
+            self._proj = coded_stats(raw)
+            self._raw_proj = None
+        return self._proj
+
+    def _detach(self) -> None:
+        # convert stats, dropping the API entries and the registry, e.g.
+        # before sending the player-week to another process
+        self._coded_stats
+        self._coded_proj
+
+    def _rebind(self, registry: PlayerRegistry) -> None:
+        # move a player-week built with another registry (e.g. in a
+        # worker process) onto `registry`'s player and stat line
+        season = self._stat_key[0] if self._stat_key else None
+        self.player = registry.add(self.player, season)
+        if self._raw_stats is None:
+            if self._stat_key is not None and self._stats:
+                self._stats = registry.stats.add(*self._stat_key,
+                                                 self._stats)
+            return
+        stats = None
+        if self._stat_key is not None:
+            stats = registry.stats.get(*self._stat_key,
+                                       self._raw_stats["stats"])
+        if stats is None:
+            self._registry = registry
+        else:
+            self._stats = stats
+            self._raw_stats, self._registry = None, None
+
+    @property
+    def pro_team_during_match(self) -> Optional[str]:
+        """Player's NFL team during this week
+
+        :return: pro team abbreviation, if player has stats
+        :rtype: Optional[str]
+        """
+        if self._pro_team_id_during_match is None:
+            return None
+        return PRO_TEAMS[self._pro_team_id_during_match]
+
     @property
     def stat_line(self) -> Dict[str, float]:
         """Get statistic-value mapping
@@ -0,0 +1,215 @@
+"""Background read-ahead of boxscores
+
+Browsing a season week by week blocks on fetching each matchup
+number's boxscores. A `ReadAhead` watches the matchup numbers whose
+boxscores a league is asked for and, once two consecutive requests
+step by one (forwards or backwards), loads the next numbers in the
+same direction on background threads::
+
+    read_ahead = ReadAhead(depth=2)
+    league = League(1603206, 2020, cache=cache, read_ahead=read_ahead)
+    league.get_matchups_by_number(1, boxscore=True)
+    league.get_matchups_by_number(2, boxscore=True)  # prefetches 3, 4
+
+Prefetched boxscores are loaded into the league (and written to its
+cache, if any) exactly as if they had been requested, so a request
+for a number being prefetched waits for that load rather than
+fetching again. A request that breaks the pattern cancels the
+league's queued prefetches, and the queue is bounded: when full, the
+oldest queued prefetch is dropped. Loads already running are not
+interrupted. Only matchup numbers up to the league's current one are
+prefetched.
+"""
+import logging
+import weakref
+import threading
+from collections import deque
+from typing import Optional, TYPE_CHECKING
+
+from . import metrics
+if TYPE_CHECKING:
+    from .league import League
+
+
+class ReadAhead:
+    """Scheduler prefetching boxscores of sequentially browsed leagues
+
+    One scheduler may be shared by several leagues. Leagues are held
+    by weak reference, so pending prefetches do not keep them alive.
+
+    :param depth: number of matchup numbers to load ahead
+    :type depth: int
+    :param max_pending: maximum number of queued prefetches
+    :type max_pending: int
+    :param workers: number of background threads
+    :type workers: int
+    """
+
+    def __init__(self, depth: int = 1, max_pending: int = 8,
+                 workers: int = 1) -> None:
+        if depth < 1 or max_pending < 1 or workers < 1:
+            raise ValueError(
+                "Depth, queue size and workers must be positive.")
+        self.depth = depth
+        self.max_pending = max_pending
+        self.workers = workers
+        self.prefetched = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self._cond = threading.Condition()
+        # (weakref to league, matchup number), oldest first
+        self._queue = deque()
+        # league to last requested matchup number
+        self._last = weakref.WeakKeyDictionary()
+        self._active = 0
+        self._threads = []
+        self._closed = False
+
+    def __repr__(self):
+        return "ReadAhead : depth {} : {} pending".format(
+            self.depth, self.pending)
+
+    @property
+    def pending(self) -> int:
+        """Number of queued prefetches
+
+        :return: queue length
+        :rtype: int
+        """
+        return len(self._queue)
+
+    def record(self, league: "League", number: int) -> None:
+        """Record a request for a matchup number's boxscores
+
+        Called by `League` before loading them.
+
+        :param league: league whose boxscores were requested
+        :type league: League
+        :param number: requested matchup number
+        :type number: int
+        """
+        with self._cond:
+            if self._closed:
+                return
+            last = self._last.get(league)
+            self._last[league] = number
+            if last == number:
+                return
+            if last is None or abs(number - last) != 1:
+                # not sequential: queued prefetches are no longer useful
+                self._cancel(league)
+                return
+        step = number - last
+        current = league.current_matchup_num()
+        targets = [number + step * i for i in range(1, self.depth + 1)]
+        targets = [i for i in targets if 0 < i <= current and
+                   league.schedule.scoring_periods(i) is not None]
+        with self._cond:
+            if self._closed:
+                return
+            queued = {num for ref, num in self._queue if ref() is league}
+            for num in targets:
+                if num not in queued:
+                    self._queue.append((weakref.ref(league), num))
+            while len(self._queue) > self.max_pending:
+                self._queue.popleft()
+                self.dropped += 1
+            self._start_workers()
+            self._cond.notify_all()
+
+    def _cancel(self, league):
+        # called with lock held
+        keep = deque(i for i in self._queue
+                     if league is not None and i[0]() is not league)
+        num = len(self._queue) - len(keep)
+        self._queue = keep
+        self.cancelled += num
+        return num
+
+    def cancel(self, league: Optional["League"] = None) -> int:
+        """Drop queued prefetches
+
+        :param league: league whose prefetches to drop (all if None)
+        :type league: Optional[League]
+        :return: number of dropped prefetches
+        :rtype: int
+        """
+        with self._cond:
+            num = self._cancel(league)
+            self._cond.notify_all()
+            return num
+
+    def _start_workers(self):
+        # called with lock held
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True,
+                                      name="espyn-read-ahead")
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                ref, num = self._queue.popleft()
+                self._active += 1
+                self._cond.notify_all()
+            try:
+                league = ref()
+                if league is not None:
+                    self._prefetch(league, num)
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._cond.notify_all()
+
+    def _prefetch(self, league, num):
+        matchups = league.schedule.matchups_by_number(num)
+        if all(m.boxscore_loaded for m in matchups):
+            return
+        try:
+            league._populate_boxscores(num)
+        except Exception as e:
+            # the next request for these boxscores retries the load
+            logging.info("Read-ahead of matchup %d failed: %s" % (num, e))
+            return
+        with self._cond:
+            self.prefetched += 1
+        metrics.PREFETCHES.inc()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no prefetches are queued or running
+
+        :param timeout: seconds to wait at most (no limit if None)
+        :type timeout: Optional[float]
+        :return: whether the scheduler became idle
+        :rtype: bool
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._active, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """Cancel queued prefetches and stop the background threads
+
+        :param wait: whether to wait for running loads to finish
+        :type wait: bool
+        """
+        with self._cond:
+            self._closed = True
+            self._cancel(None)
+            self._cond.notify_all()
+            threads, self._threads = self._threads, []
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
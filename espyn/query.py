@@ -0,0 +1,217 @@
+from typing import (Any, Dict, Iterable, List, Optional, Set, Union,
+                    TYPE_CHECKING)
+
+from .constants import STAT_CODES
+if TYPE_CHECKING:
+    from .matchup import Matchup
+    from .player import Player
+    from .player_week import PlayerWeek
+
+
+# stat name to code, for filtering by either
+_STAT_NAMES = {v: k for k, v in STAT_CODES.items()}
+
+
+class PlayerWeekRow:
+    """Player-week with the context of the fantasy team and matchup
+
+    :param team_id: fantasy team ID
+    :type team_id: int
+    :param matchup_num: matchup number
+    :type matchup_num: int
+    :param scoring_period: scoring period
+    :type scoring_period: int
+    :param player_week: player stat line
+    :type player_week: PlayerWeek
+    """
+
+    __slots__ = ("team_id", "matchup_num", "scoring_period", "player_week")
+
+    def __init__(self, team_id: int, matchup_num: int, scoring_period: int,
+                 player_week: "PlayerWeek") -> None:
+        self.team_id = team_id
+        self.matchup_num = matchup_num
+        self.scoring_period = scoring_period
+        self.player_week = player_week
+
+    def __repr__(self):
+        return "Team {} : Scoring Period {} : {}".format(
+            self.team_id, self.scoring_period, self.player_week)
+
+    @property
+    def player(self) -> "Player":
+        """Player of the stat line
+
+        :return: player
+        :rtype: Player
+        """
+        return self.player_week.player
+
+    @property
+    def points(self) -> Optional[float]:
+        """Player's fantasy points
+
+        :return: points (None if inactive)
+        :rtype: Optional[float]
+        """
+        return self.player_week.points
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get JSON-serializable dictionary representation
+
+        :return: dictionary representation of row
+        :rtype: Dict[str, Any]
+        """
+        res = dict()
+        res["team_id"] = self.team_id
+        res["matchup_num"] = self.matchup_num
+        res["scoring_period"] = self.scoring_period
+        res["player_week"] = self.player_week.to_json()
+        return res
+
+
+def _as_set(value) -> Set:
+    if isinstance(value, (str, int)):
+        return {value}
+    return set(value)
+
+
+def _stat_bounds(stats):
+    bounds = []
+    for stat, bound in stats.items():
+        code = _STAT_NAMES.get(stat, stat)
+        if not isinstance(code, int):
+            raise ValueError("Unknown stat %r." % stat)
+        if isinstance(bound, (int, float)):
+            bound = (bound, None)
+        bounds.append((code, bound[0], bound[1]))
+    return bounds
+
+
+def _in_range(value, lo, hi):
+    if value is None:
+        return False
+    if lo is not None and value < lo:
+        return False
+    if hi is not None and value > hi:
+        return False
+    return True
+
+
+class PlayerWeekIndex:
+    """Indexed collection of player-weeks for fast filtering
+
+    Rows are indexed by position, lineup slot, NFL team (during the
+    week), fantasy team and scoring period, so selective queries only
+    visit matching rows. Points and stat filters are applied to the
+    candidates remaining after index lookups.
+
+    :param rows: player-weeks to index
+    :type rows: Iterable[PlayerWeekRow]
+    """
+
+    def __init__(self, rows: Iterable[PlayerWeekRow]) -> None:
+        self.rows = list(rows)
+        self._indexes = {
+            "position": dict(),
+            "slot": dict(),
+            "pro_team": dict(),
+            "team_id": dict(),
+            "scoring_period": dict(),
+        }
+        for i, row in enumerate(self.rows):
+            pw = row.player_week
+            pro_team = pw.pro_team_during_match or pw.player.pro_team
+            keys = (("position", pw.player.position),
+                    ("slot", pw.slot),
+                    ("pro_team", pro_team),
+                    ("team_id", row.team_id),
+                    ("scoring_period", row.scoring_period))
+            for name, key in keys:
+                self._indexes[name].setdefault(key, []).append(i)
+
+    @classmethod
+    def from_matchups(cls, matchups: Iterable["Matchup"]) -> "PlayerWeekIndex":
+        """Build index from the loaded boxscores of matchups
+
+        :param matchups: matchups (boxscores need not be loaded)
+        :type matchups: Iterable[Matchup]
+        :return: index of all loaded player-weeks
+        :rtype: PlayerWeekIndex
+        """
+        rows = []
+        for m in sorted(matchups, key=lambda i: i.matchup_num):
+            for tw in m.loaded_team_weeks():
+                for pw in tw.slots:
+                    rows.append(PlayerWeekRow(
+                        tw.team_id, m.matchup_num, tw.scoring_period, pw))
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _candidates(self, filters) -> Optional[List[int]]:
+        # row IDs matching every indexed filter, or None if unfiltered
+        matches = []
+        for name, values in filters.items():
+            index = self._indexes[name]
+            ids = set()
+            for value in values:
+                ids.update(index.get(value, ()))
+            matches.append(ids)
+        if not matches:
+            return None
+        matches.sort(key=len)
+        ids = matches[0].intersection(*matches[1:])
+        return sorted(ids)
+
+    def query(self,
+              position: Union[str, Iterable[str], None] = None,
+              slot: Union[str, Iterable[str], None] = None,
+              pro_team: Union[str, Iterable[str], None] = None,
+              team_id: Union[int, Iterable[int], None] = None,
+              scoring_period: Union[int, Iterable[int], None] = None,
+              min_points: Optional[float] = None,
+              max_points: Optional[float] = None,
+              stats: Optional[Dict[Union[str, int], Any]] = None
+              ) -> List[PlayerWeekRow]:
+        """Get player-weeks matching all given filters
+
+        Each of `position`, `slot`, `pro_team`, `team_id` and
+        `scoring_period` accepts a single value or a collection
+        of acceptable values (e.g. ``scoring_period=range(5, 10)``).
+        Point bounds are inclusive. `stats` maps stat names (see
+        `constants.STAT_CODES`) or codes to a minimum value or an
+        inclusive ``(min, max)`` tuple, where either may be None;
+        stats missing from a stat line count as zero.
+
+        :param position: player position(s), e.g. "RB"
+        :param slot: lineup slot(s), e.g. "FLEX"
+        :param pro_team: NFL team(s) during the week, e.g. "KC"
+        :param team_id: fantasy team ID(s)
+        :param scoring_period: scoring period(s)
+        :param min_points: minimum fantasy points
+        :type min_points: Optional[float]
+        :param max_points: maximum fantasy points
+        :type max_points: Optional[float]
+        :param stats: stat bounds
+        :type stats: Optional[Dict[Union[str, int], Any]]
+        :return: matching rows, ordered by matchup
+        :rtype: List[PlayerWeekRow]
+        """
+        filters = dict()
+        for name, value in (("position", position), ("slot", slot),
+                            ("pro_team", pro_team), ("team_id", team_id),
+                            ("scoring_period", scoring_period)):
+            if value is not None:
+                filters[name] = _as_set(value)
+        ids = self._candidates(filters)
+        rows = self.rows if ids is None else [self.rows[i] for i in ids]
+        if min_points is not None or max_points is not None:
+            rows = [r for r in rows
+                    if _in_range(r.player_week.points, min_points, max_points)]
+        if stats:
+            for code, lo, hi in _stat_bounds(stats):
+                rows = [r for r in rows if _in_range(
+                    r.player_week._coded_stats.get(code, 0.), lo, hi)]
+        return rows
@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterator, Optional
+
+from .player import Player
+from .stat_store import StatLineStore
+
+class PlayerRegistry:
+    """Interned `Player` objects keyed by season and player ID
+
+    The same NFL player appears on a roster every week, and in every
+    league loaded by the process. The registry constructs one `Player`
+    per player and season and returns that instance for every later
+    appearance in the season. Week-specific attributes live on
+    `PlayerWeek`. Attributes that change over a career (position,
+    eligible slots and pro team) are those of the player's first
+    appearance in the season; interned players are never modified, so
+    loading another season (in any league sharing the registry) does
+    not change players already loaded.
+
+    The registry holds every player it has seen until `clear` is
+    called. Processes loading many seasons can bound it by giving each
+    league (or season) its own registry, e.g.
+    ``League(league_id, season, registry=PlayerRegistry())``.
+
+    The registry's `stats` store likewise holds each week's stat line
+    once for all player-weeks of the player.
+
+    :param stats: stat line store (a new one if None)
+    :type stats: Optional[StatLineStore]
+    """
+
+    def __init__(self, stats: Optional[StatLineStore] = None) -> None:
+        # player ID to season to player
+        self._players = dict()
+        if stats is None:
+            stats = StatLineStore()
+        self.stats = stats
+
+    def __len__(self):
+        return sum(len(i) for i in list(self._players.values()))
+
+    def __contains__(self, player_id):
+        return player_id in self._players
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter([p for i in list(self._players.values())
+                     for p in list(i.values())])
+
+    def __repr__(self):
+        return "PlayerRegistry : {} players".format(len(self))
+
+    def intern(self, player_data: Dict[str, Any],
+               season: Optional[int] = None) -> Player:
+        """Get registered player, constructing it on first appearance
+
+        :param player_data: player data from API response
+        :type player_data: Dict[str, Any]
+        :param season: season of the data
+        :type season: Optional[int]
+        :return: interned player
+        :rtype: Player
+        """
+        seasons = self._players.get(player_data["id"])
+        if seasons is None:
+            seasons = self._players.setdefault(player_data["id"], dict())
+        player = seasons.get(season)
+        if player is None:
+            # setdefault keeps the first instance if another thread won
+            player = seasons.setdefault(season, Player(player_data))
+        return player
+
+    def add(self, player: Player, season: Optional[int] = None) -> Player:
+        """Register an already constructed player
+
+        Used to merge players built elsewhere (e.g. in another
+        process) into the registry.
+
+        :param player: player to register
+        :type player: Player
+        :param season: season of the player's data
+        :type season: Optional[int]
+        :return: registered player with the same ID and season (which
+                 may be a previously registered instance)
+        :rtype: Player
+        """
+        seasons = self._players.setdefault(player.player_id, dict())
+        return seasons.setdefault(season, player)
+
+    def get(self, player_id: int,
+            season: Optional[int] = None) -> Optional[Player]:
+        """Get player by ID
+
+        :param player_id: ESPN player ID
+        :type player_id: int
+        :param season: season
+        :type season: Optional[int]
+        :return: player, if registered
+        :rtype: Optional[Player]
+        """
+        return self._players.get(player_id, dict()).get(season)
+
+    def clear(self) -> None:
+        """Remove all registered players and stored stat lines"""
+        self._players.clear()
+        self.stats.clear()
+
+
+#: process-wide registry shared by leagues not given their own
+default_registry = PlayerRegistry()
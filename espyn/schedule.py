@@ -0,0 +1,160 @@
+from typing import Dict, List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .matchup import Matchup
+
+
+class ScheduleIndex:
+    """Lookup tables for a league's schedule
+
+    Built once when a `League` is constructed, so that mapping
+    between scoring periods and matchup numbers, and finding a team's
+    matchups or opponents, are dictionary lookups rather than scans
+    of the schedule.
+
+    :param matchup_periods: matchup number (int or str, as in the
+                            league settings) to its scoring periods
+    :type matchup_periods: Dict[Any, List[int]]
+    """
+
+    __slots__ = ("_periods", "_matchup_nums", "_matchups", "_numbers",
+                 "_by_number", "_by_team", "_opponents")
+
+    def __init__(self, matchup_periods: Dict) -> None:
+        self._periods = {int(k): v for k, v in matchup_periods.items()}
+        self._matchup_nums = {sp: num for num, sps in self._periods.items()
+                              for sp in sps}
+        self._matchups = []
+        # matchup number to matchup indices
+        self._numbers = dict()
+        # matchup number to team ID to matchup index
+        self._by_number = dict()
+        # team ID to matchup indices, ordered by matchup number
+        self._by_team = dict()
+        # (team ID, scoring period) to opponent's team ID
+        self._opponents = dict()
+
+    def index_matchups(self, matchups: Sequence["Matchup"]) -> None:
+        """Index the league's matchups
+
+        :param matchups: all matchups of the league
+        :type matchups: Sequence[Matchup]
+        """
+        self._matchups = list(matchups)
+        self._numbers, self._by_number = {}, {}
+        self._by_team, self._opponents = {}, {}
+        for i, m in enumerate(self._matchups):
+            self._numbers.setdefault(m.matchup_num, []).append(i)
+            teams = self._by_number.setdefault(m.matchup_num, dict())
+            for team_id, opp_id in zip(m.team_ids, reversed(m.team_ids)):
+                if team_id is None:
+                    continue
+                teams[team_id] = i
+                self._by_team.setdefault(team_id, []).append(i)
+                for sp in m.scoring_periods:
+                    self._opponents[(team_id, sp)] = opp_id
+        for indices in self._by_team.values():
+            indices.sort(key=lambda i: self._matchups[i].matchup_num)
+
+    @property
+    def matchup_nums(self) -> List[int]:
+        """Matchup numbers having matchups, in order
+
+        :return: matchup numbers
+        :rtype: List[int]
+        """
+        return sorted(self._numbers)
+
+    def scoring_periods(self, matchup_num: int) -> Optional[List[int]]:
+        """Get scoring periods of a matchup number
+
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        :return: scoring periods (None if no such matchup number)
+        :rtype: Optional[List[int]]
+        """
+        return self._periods.get(matchup_num)
+
+    def matchup_num(self, scoring_period: int) -> Optional[int]:
+        """Get matchup number containing a scoring period
+
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :return: matchup number (None if not part of any matchup)
+        :rtype: Optional[int]
+        """
+        return self._matchup_nums.get(scoring_period)
+
+    def matchup(self, matchup_num: int, team_id: int) -> Optional["Matchup"]:
+        """Get a team's matchup by number
+
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        :param team_id: team ID
+        :type team_id: int
+        :return: matchup (None if team has none with that number)
+        :rtype: Optional[Matchup]
+        """
+        try:
+            return self._matchups[self._by_number[matchup_num][team_id]]
+        except KeyError:
+            return None
+
+    def matchups_by_number(self, matchup_num: int) -> List["Matchup"]:
+        """Get all matchups of a matchup number
+
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        :return: matchups, in schedule order
+        :rtype: List[Matchup]
+
+        :raise: KeyError if there are no matchups with that number
+        """
+        return [self._matchups[i] for i in self._numbers[matchup_num]]
+
+    def team_matchups(self, team_id: int) -> List["Matchup"]:
+        """Get a team's matchups
+
+        :param team_id: team ID
+        :type team_id: int
+        :return: matchups, ordered by matchup number
+        :rtype: List[Matchup]
+        """
+        return [self._matchups[i] for i in self._by_team.get(team_id, ())]
+
+    def opponent(self, team_id: int, scoring_period: int) -> Optional[int]:
+        """Get a team's opponent in a scoring period
+
+        :param team_id: team ID
+        :type team_id: int
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :return: opponent's team ID (None if bye or no matchup)
+        :rtype: Optional[int]
+        """
+        return self._opponents.get((team_id, scoring_period))
+
+    def is_bye(self, team_id: int, matchup_num: int) -> bool:
+        """Whether a team has a bye for a matchup number
+
+        :param team_id: team ID
+        :type team_id: int
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        :return: whether team's matchup is a bye (or it has none)
+        :rtype: bool
+        """
+        m = self.matchup(matchup_num, team_id)
+        return m is None or m.is_bye
+
+    def is_playoff(self, matchup_num: int) -> bool:
+        """Whether a matchup number is in the playoffs
+
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        :return: whether matchups of that number are playoff matchups
+        :rtype: bool
+
+        :raise: KeyError if there are no matchups with that number
+        """
+        return self.matchups_by_number(matchup_num)[0].is_playoff
@@ -0,0 +1,428 @@
+"""Memory-mapped columnar files of hydrated seasons
+
+`write_season` stores the tables of :func:`columnar.build_tables`
+(teams, matchups, team-weeks and player-weeks, including one column
+per stat) as fixed-width column arrays in a single file, with
+strings such as player names interned in a shared string table.
+`SeasonFile` opens the file with `mmap`, so reading one week or one
+player only touches the pages holding those rows::
+
+    write_season(league, "2020.espyn")
+    with SeasonFile("2020.espyn") as season:
+        rows = season.week(10)
+        rows = season.player(4047365)
+
+Team-week and player-week rows are stored in scoring period order,
+with each period's row range recorded in the file; player-weeks also
+have a permutation sorted by player ID, searched by bisection.
+
+Layout: 8-byte magic, 8-byte manifest length, JSON manifest (column
+kinds and offsets), then 8-byte aligned sections. Numeric columns
+are int64, float64 (NaN for missing values) or int8 (booleans) in
+native byte order; string columns are int64 string IDs (-1 for None),
+and nullable integer columns (such as a bye's ``away_team_id``) are
+int64 with `NULL_INT` for None.
+"""
+import sys
+import mmap
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Union, TYPE_CHECKING
+
+from . import jsonlib
+from .columnar import build_tables
+if TYPE_CHECKING:
+    from .league import League
+
+MAGIC = b"ESPYNSF1"
+VERSION = 1
+_ALIGN = 8
+#: stored in nullable integer ("n") columns for None
+NULL_INT = -2 ** 63
+# column kinds to array typecodes (strings are stored as string IDs)
+_TYPECODES = {"i": "q", "d": "d", "b": "b", "s": "q", "n": "q"}
+# tables stored in scoring period order
+_PERIOD_TABLES = ("team_weeks", "player_weeks")
+
+
+class _StringTable:
+    # interns strings while writing
+
+    def __init__(self):
+        self.ids = dict()
+
+    def id(self, value):
+        if value is None:
+            return -1
+        value = str(value)
+        res = self.ids.get(value)
+        if res is None:
+            res = self.ids[value] = len(self.ids)
+        return res
+
+    def sections(self):
+        data = [s.encode() for s in self.ids]
+        offsets = array("q", [0])
+        for item in data:
+            offsets.append(offsets[-1] + len(item))
+        return offsets.tobytes(), b"".join(data)
+
+
+def _bisect(order, ids, value, right=False, lo=0):
+    # bisect.bisect_left/right over ids[order[i]] (their `key` argument
+    # is Python 3.10+)
+    hi = len(order)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if ids[order[mid]] < value or right and ids[order[mid]] == value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _period_order(table):
+    # stable permutation sorting rows by scoring period, and each
+    # period's [start, stop) range in that order
+    periods = table.columns["scoring_period"]
+    order = sorted(range(table.num_rows), key=periods.__getitem__)
+    ranges = dict()
+    for pos, row in enumerate(order):
+        sp = periods[row]
+        ranges.setdefault(sp, [pos, pos])[1] = pos + 1
+    return order, {str(k): v for k, v in ranges.items()}
+
+
+def write_season(leagues: Union["League", Iterable["League"]],
+                 path: str) -> Dict[str, Any]:
+    """Write a league's tables to a columnar season file
+
+    Only boxscores already loaded contribute team-week and
+    player-week rows; see :meth:`League.load_boxscores`.
+
+    :param leagues: league (or iterable of leagues)
+    :type leagues: Union[League, Iterable[League]]
+    :param path: output path
+    :type path: str
+    :return: manifest written to the file
+    :rtype: Dict[str, Any]
+    """
+    tables = build_tables(leagues)
+    strings = _StringTable()
+    sections = []  # bytes in file order, each aligned
+    manifest = {"version": VERSION, "byteorder": sys.byteorder,
+                "tables": dict()}
+
+    def add_section(data):
+        sections.append(data + bytes(-len(data) % _ALIGN))
+        return len(sections) - 1
+
+    for name, table in tables.items():
+        order, ranges = None, None
+        if name in _PERIOD_TABLES:
+            order, ranges = _period_order(table)
+        columns = []
+        for col, values in table.columns.items():
+            kind = table.kinds[col]
+            if order is not None:
+                values = [values[i] for i in order]
+            if kind == "s" and all(i is None or type(i) is int
+                                   for i in values):
+                kind = "n"
+                values = [NULL_INT if i is None else i for i in values]
+            elif kind == "s":
+                values = [strings.id(i) for i in values]
+            values = array(_TYPECODES[kind], values)
+            columns.append([col, kind, add_section(values.tobytes())])
+        info = {"num_rows": table.num_rows, "columns": columns}
+        if ranges is not None:
+            info["periods"] = ranges
+        if name == "player_weeks":
+            ids = table.columns["player_id"]
+            ids = [ids[i] for i in order]
+            by_player = sorted(range(table.num_rows), key=ids.__getitem__)
+            info["by_player"] = add_section(array("q", by_player).tobytes())
+        manifest["tables"][name] = info
+    offsets, data = strings.sections()
+    manifest["strings"] = [add_section(offsets), add_section(data),
+                           len(strings.ids)]
+
+    # resolve section numbers to file offsets, which depend on the
+    # manifest's length; offsets are padded to a fixed width for that
+    starts, pos = [], 0
+    for section in sections:
+        starts.append(pos)
+        pos += len(section)
+    body = jsonlib.dumps(manifest)
+    base = len(MAGIC) + 8 + len(body) + 24 * (len(sections) + 1)
+    base += -base % _ALIGN
+    manifest["sections"] = [base + i for i in starts]
+    body = jsonlib.dumps(manifest)
+    assert len(MAGIC) + 8 + len(body) <= base
+    body += b" " * (base - len(MAGIC) - 8 - len(body))
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(body).to_bytes(8, "little"))
+        f.write(body)
+        for section in sections:
+            f.write(section)
+    return manifest
+
+
+class MappedColumn:
+    """Read-only column of a `SeasonFile` table
+
+    Numeric values are read from the mapped file on access; string
+    values are decoded from the file's string table.
+
+    :param values: typed view of the column's section
+    :type values: memoryview
+    :param strings: string table for string columns, else None
+    """
+
+    __slots__ = ("values", "strings")
+
+    def __init__(self, values: memoryview, strings=None) -> None:
+        self.values = values
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        value = self.values[i]
+        if self.strings is not None:
+            return self.strings(value)
+        return value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class MappedTable:
+    """Table of a `SeasonFile`, reading rows from the mapped file
+
+    :param name: table name
+    :type name: str
+    :param num_rows: number of rows
+    :type num_rows: int
+    :param columns: column name to column
+    :type columns: Dict[str, MappedColumn]
+    :param kinds: column name to kind ("i", "d", "b", "s" or "n")
+    :type kinds: Dict[str, str]
+    """
+
+    def __init__(self, name: str, num_rows: int,
+                 columns: Dict[str, MappedColumn],
+                 kinds: Dict[str, str]) -> None:
+        self.name = name
+        self.num_rows = num_rows
+        self.columns = columns
+        self.kinds = kinds
+
+    def __repr__(self):
+        return "MappedTable {} : {} rows x {} columns".format(
+            self.name, self.num_rows, len(self.columns))
+
+    def __len__(self):
+        return self.num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        """Column names in order
+
+        :return: column names
+        :rtype: List[str]
+        """
+        return list(self.columns)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Get one row
+
+        :param i: row number
+        :type i: int
+        :return: column name to value (booleans as bool, missing
+                 floats as None)
+        :rtype: Dict[str, Any]
+        """
+        res = dict()
+        for name, col in self.columns.items():
+            value = col[i]
+            kind = self.kinds[name]
+            if kind == "b":
+                value = bool(value)
+            elif kind == "d" and math.isnan(value):
+                value = None
+            elif kind == "n" and value == NULL_INT:
+                value = None
+            res[name] = value
+        return res
+
+    def rows(self, start: int = 0,
+             stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get a range of rows
+
+        :param start: first row
+        :type start: int
+        :param stop: row to stop before (defaults to end of table)
+        :type stop: Optional[int]
+        :return: rows (see `row`)
+        :rtype: List[Dict[str, Any]]
+        """
+        start, stop, _ = slice(start, stop).indices(self.num_rows)
+        return [self.row(i) for i in range(start, stop)]
+
+
+class SeasonFile:
+    """Season file written by `write_season`, opened with `mmap`
+
+    :param path: file path
+    :type path: str
+
+    :raise: ValueError if the file is not a season file of this
+            version and byte order
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        # views into the mapping, released on close
+        self._exports = [self._view]
+        self._tables = dict()
+        self._by_player = None
+        if bytes(self._view[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise ValueError("Not a season file: %r." % path)
+        start = len(MAGIC) + 8
+        size = int.from_bytes(self._view[len(MAGIC):start], "little")
+        manifest = jsonlib.loads(bytes(self._view[start:start + size]))
+        if manifest["version"] != VERSION or \
+                manifest["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError("Unsupported season file: %r." % path)
+        self.manifest = manifest
+        self._sections = manifest["sections"]
+        offsets, data, num_strings = manifest["strings"]
+        self._string_offsets = self._section(offsets, "q", num_strings + 1)
+        self._string_data = self._sections[data]
+        self._string_cache = dict()
+
+    def _section(self, number, typecode, length):
+        start = self._sections[number]
+        size = length * array(typecode).itemsize
+        view = self._view[start:start + size]
+        self._exports.append(view)
+        view = view.cast(typecode)
+        self._exports.append(view)
+        return view
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Get string from the file's string table
+
+        :param string_id: string ID (-1 for None)
+        :type string_id: int
+        :return: string
+        :rtype: Optional[str]
+        """
+        if string_id < 0:
+            return None
+        res = self._string_cache.get(string_id)
+        if res is None:
+            start = self._string_data + self._string_offsets[string_id]
+            stop = self._string_data + self._string_offsets[string_id + 1]
+            res = bytes(self._view[start:stop]).decode()
+            self._string_cache[string_id] = res
+        return res
+
+    @property
+    def table_names(self) -> List[str]:
+        """Names of stored tables
+
+        :return: table names
+        :rtype: List[str]
+        """
+        return list(self.manifest["tables"])
+
+    def table(self, name: str) -> MappedTable:
+        """Get a stored table
+
+        :param name: table name, e.g. "player_weeks"
+        :type name: str
+        :return: table
+        :rtype: MappedTable
+
+        :raise: KeyError if there is no such table
+        """
+        res = self._tables.get(name)
+        if res is None:
+            info = self.manifest["tables"][name]
+            num_rows = info["num_rows"]
+            columns, kinds = dict(), dict()
+            for col, kind, section in info["columns"]:
+                values = self._section(section, _TYPECODES[kind], num_rows)
+                strings = self.string if kind == "s" else None
+                columns[col] = MappedColumn(values, strings)
+                kinds[col] = kind
+            res = self._tables[name] = MappedTable(name, num_rows, columns,
+                                                   kinds)
+        return res
+
+    def week(self, scoring_period: int,
+             table: str = "player_weeks") -> List[Dict[str, Any]]:
+        """Get all rows of one scoring period
+
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :param table: "player_weeks" or "team_weeks"
+        :type table: str
+        :return: rows (see `MappedTable.row`)
+        :rtype: List[Dict[str, Any]]
+        """
+        ranges = self.manifest["tables"][table]["periods"]
+        if str(scoring_period) not in ranges:
+            return []
+        start, stop = ranges[str(scoring_period)]
+        return self.table(table).rows(start, stop)
+
+    def player(self, player_id: int) -> List[Dict[str, Any]]:
+        """Get a player's player-week rows, in scoring period order
+
+        :param player_id: ESPN player ID
+        :type player_id: int
+        :return: rows (see `MappedTable.row`)
+        :rtype: List[Dict[str, Any]]
+        """
+        table = self.table("player_weeks")
+        order = self._by_player
+        if order is None:
+            info = self.manifest["tables"]["player_weeks"]
+            order = self._by_player = self._section(
+                info["by_player"], "q", table.num_rows)
+        ids = table.columns["player_id"].values
+        start = _bisect(order, ids, player_id)
+        stop = _bisect(order, ids, player_id, right=True, lo=start)
+        return [table.row(i) for i in sorted(order[start:stop])]
+
+    def close(self) -> None:
+        """Release the mapping
+
+        Columns and tables obtained from the file must not be used
+        afterwards.
+        """
+        self._tables.clear()
+        self._by_player = None
+        for view in reversed(self._exports):
+            view.release()
+        self._exports.clear()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
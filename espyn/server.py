@@ -0,0 +1,351 @@
+"""Local caching JSON API for league data
+
+One process keeps hot `League` objects in memory and serves their
+teams, matchups and boxscores as JSON, so several services share the
+cost of fetching and parsing ESPN data. Start it with
+``espyn serve`` or `make_server`::
+
+    from espyn.server import make_server
+    make_server(8000, cache_dir="cache").serve_forever()
+
+Endpoints (GET):
+
+- ``/leagues/<league_id>/<season>``: league (`League.to_json`)
+- ``/leagues/<league_id>/<season>/teams``: teams
+- ``/leagues/<league_id>/<season>/teams/<team_id>``: one team
+- ``/leagues/<league_id>/<season>/matchups/<number>``: matchups
+  without boxscores
+- ``/leagues/<league_id>/<season>/matchups/<number>/boxscores``:
+  matchups with boxscores, loaded on first request
+
+Leagues are kept in a least-recently-used store, and concurrent
+requests for the same league or response share one load and one
+serialization. Serialized responses are kept until the league's
+boxscores change or its current matchup number advances, up to
+`LeagueStore.max_responses` per league. Large responses are sent
+with chunked transfer encoding (from the serialized body; encoding is
+not streamed).
+
+Malformed league IDs or seasons get status 400, paths naming no
+resource 404, failures to fetch data from ESPN 502, and other errors
+500.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional, Tuple
+
+from . import jsonlib
+from .league import FetchError, League
+from .caches import LocalCache
+from .budget import BoxscoreBudget
+
+JSON_TYPE = "application/json"
+#: responses larger than this (bytes) are sent with chunked encoding
+CHUNKED_THRESHOLD = 1 << 16
+CHUNK_SIZE = 1 << 16
+
+
+class NotFound(LookupError):
+    """Raised for paths that do not name a resource"""
+
+
+class _Call:
+    # a call in progress, whose result is shared with concurrent callers
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _SingleFlight:
+    # runs one call per key at a time; concurrent callers wait for it
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            return call.wait()
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+def _normalize(parts: Tuple[str, ...]) -> Tuple[str, ...]:
+    # canonical path components below the league, e.g. "01" -> "1"
+    if not parts:
+        return ()
+    if parts == ("teams",):
+        return parts
+    if len(parts) == 2 and parts[0] == "teams":
+        return ("teams", _number(parts[1]))
+    if parts[0] == "matchups" and parts[2:] in ((), ("boxscores",)) and \
+            len(parts) > 1:
+        return ("matchups", _number(parts[1])) + parts[2:]
+    raise NotFound()
+
+
+def _number(part: str) -> str:
+    # canonical form of a numeric ID; `int` alone accepts "1_0" and " 1"
+    if not (part.isascii() and part.isdigit()):
+        raise NotFound()
+    return str(int(part))
+
+
+def _resource(league: League, parts: Tuple[str, ...]) -> Any:
+    # JSON-serializable resource at normalized path components
+    if not parts:
+        return league.to_json()
+    if parts == ("teams",):
+        return [t.to_json() for t in league.teams]
+    number = int(parts[1])
+    # only failed lookups are 404s, not errors loading boxscores
+    try:
+        if parts[0] == "teams":
+            team = league.get_team_by_id(number)
+        else:
+            league.schedule.matchups_by_number(number)
+    except KeyError:
+        raise NotFound() from None
+    if parts[0] == "teams":
+        return team.to_json()
+    boxscores = parts[2:] == ("boxscores",)
+    matchups = league.get_matchups_by_number(number, boxscore=boxscores)
+    matchups = sorted(matchups, key=lambda m: m.home_team_id)
+    return [m.to_json(boxscores) for m in matchups]
+
+
+def default_factory(cache_dir: Optional[str] = None,
+                    budget: Optional[BoxscoreBudget] = None
+                    ) -> Callable[[int, int], League]:
+    """Get a function constructing leagues, cached in `cache_dir`
+
+    :param cache_dir: directory for `LocalCache` (no cache if None)
+    :type cache_dir: Optional[str]
+    :param budget: boxscore budget shared by the leagues
+    :type budget: Optional[BoxscoreBudget]
+    :return: function of league ID and season returning a `League`
+    :rtype: Callable[[int, int], League]
+    """
+    def factory(league_id, season):
+        cache = LocalCache(cache_dir) if cache_dir else None
+        return League(league_id, season, cache=cache, budget=budget)
+    return factory
+
+
+class LeagueStore:
+    """Least-recently-used store of leagues and their serialized responses
+
+    :param capacity: maximum number of leagues kept in memory
+    :type capacity: int
+    :param factory: function of league ID and season returning a
+                    `League` (see `default_factory`)
+    :type factory: Optional[Callable[[int, int], League]]
+    :param max_responses: maximum number of serialized responses kept
+                          per league
+    :type max_responses: int
+    """
+
+    def __init__(self, capacity: int = 16,
+                 factory: Optional[Callable[[int, int], League]] = None,
+                 max_responses: int = 64) -> None:
+        if capacity < 1 or max_responses < 1:
+            raise ValueError("Capacity and response limit must be positive.")
+        self.capacity = capacity
+        self.max_responses = max_responses
+        self.factory = factory or default_factory()
+        self._lock = threading.Lock()
+        # (league ID, season) to (league, path to (version, body)),
+        # both least recently used first
+        self._entries = OrderedDict()
+        self._flights = _SingleFlight()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _entry(self, league_id, season):
+        key = (league_id, season)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        return self._flights.do(("league",) + key,
+                                lambda: self._load(key))
+
+    def _load(self, key):
+        entry = (self.factory(*key), OrderedDict())
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, league_id: int, season: int) -> League:
+        """Get league, constructing it if not in the store
+
+        :param league_id: league ID
+        :type league_id: int
+        :param season: season
+        :type season: int
+        :return: league
+        :rtype: League
+        """
+        return self._entry(league_id, season)[0]
+
+    def response(self, league_id: int, season: int,
+                 parts: Tuple[str, ...] = ()) -> bytes:
+        """Get serialized resource of a league
+
+        :param league_id: league ID
+        :type league_id: int
+        :param season: season
+        :type season: int
+        :param parts: path components below the league, e.g.
+                      ``("matchups", "3", "boxscores")``; IDs are
+                      normalized, so ``"03"`` names the same resource
+        :type parts: Tuple[str, ...]
+        :return: UTF-8 encoded JSON
+        :rtype: bytes
+
+        :raise: NotFound if path does not name a resource
+        """
+        # reject bad paths before loading the league
+        parts = _normalize(tuple(parts))
+        league, responses = self._entry(league_id, season)
+        # serialized teams and summaries depend on the calendar too
+        version = (league._boxscore_version, league.current_matchup_num())
+        with self._lock:
+            cached = responses.get(parts)
+            if cached is not None and cached[0] == version:
+                responses.move_to_end(parts)
+                return cached[1]
+
+        def render():
+            body = jsonlib.dumps(_resource(league, parts))
+            # version read after rendering, which may load boxscores
+            version = (league._boxscore_version,
+                       league.current_matchup_num())
+            with self._lock:
+                responses[parts] = (version, body)
+                responses.move_to_end(parts)
+                while len(responses) > self.max_responses:
+                    responses.popitem(last=False)
+            return body
+        return self._flights.do(("response", league_id, season) + parts,
+                                render)
+
+
+class LeagueHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving `LeagueStore` responses of ``server.store``"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = tuple(i for i in self.path.split("?")[0].split("/") if i)
+        if len(parts) < 3 or parts[0] != "leagues":
+            self._send_error(404, "Not found.")
+            return
+        try:
+            league_id, season = _number(parts[1]), _number(parts[2])
+        except NotFound:
+            self._send_error(400, "Invalid league ID or season.")
+            return
+        try:
+            body = self.server.store.response(
+                int(league_id), int(season), parts[3:])
+        except NotFound:
+            self._send_error(404, "Not found.")
+            return
+        except FetchError as e:
+            self._send_error(502, "Failed to load league: %s" % e)
+            return
+        except Exception:
+            logging.exception("Failed to serve %s" % self.path)
+            self._send_error(500, "Internal server error.")
+            return
+        self._send_json(200, body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, jsonlib.dumps({"error": message}))
+
+    def _send_json(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", JSON_TYPE)
+        if len(body) <= CHUNKED_THRESHOLD:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        view = memoryview(body)
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = view[start:start + CHUNK_SIZE]
+            self.wfile.write(b"%x\r\n" % len(chunk))
+            self.wfile.write(chunk)
+            self.wfile.write(b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(port: int = 8000, addr: str = "",
+                store: Optional[LeagueStore] = None,
+                cache_dir: Optional[str] = None,
+                capacity: int = 16,
+                budget: Optional[BoxscoreBudget] = None
+                ) -> ThreadingHTTPServer:
+    """Create (but do not start) a league server
+
+    :param port: port to listen on (0 for any free port)
+    :type port: int
+    :param addr: address to bind
+    :type addr: str
+    :param store: league store (created from `cache_dir` and
+                  `capacity` if None)
+    :type store: Optional[LeagueStore]
+    :param cache_dir: directory for `LocalCache` of new leagues
+    :type cache_dir: Optional[str]
+    :param capacity: maximum number of leagues kept in memory
+    :type capacity: int
+    :param budget: boxscore budget shared by new leagues
+    :type budget: Optional[BoxscoreBudget]
+    :return: server, with the store as its `store` attribute; call
+             `serve_forever` to start it
+    :rtype: ThreadingHTTPServer
+    """
+    if store is None:
+        store = LeagueStore(capacity, default_factory(cache_dir, budget))
+    server = ThreadingHTTPServer((addr, port), LeagueHandler)
+    server.daemon_threads = True
+    server.store = store
+    return server
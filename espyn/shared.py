@@ -0,0 +1,356 @@
+"""Share hydrated league data between processes without copies
+
+`build_arrays` flattens a league's scores and loaded player-week stat
+lines into typed arrays:
+
+- ``league_ids`` and ``seasons``: one entry per league
+- ``team_league``, ``team_ids`` and ``scoring_periods``: row labels
+  (index into ``league_ids``, and team ID) and column labels of
+  ``scores``, the team by scoring period score matrix (NaN for byes)
+- ``pw_league``, ``pw_team_id``, ``pw_scoring_period``,
+  ``pw_player_id`` and ``pw_points``: one entry per player-week
+- ``stat_codes``: column labels of ``stats``, the player-week by stat
+  matrix (zero for stats missing from a stat line)
+
+The arrays can be copied once into a `SharedArrays` block (backed by
+`multiprocessing.shared_memory`) or written as ``.npy`` files with
+`save_npy`; worker processes then attach to them as read-only views
+instead of each loading and hydrating the league::
+
+    with SharedArrays.create(build_arrays(league)) as shared:
+        pool.map(analyze, [(shared.handle, i) for i in range(10)])
+
+    def analyze(args):
+        handle, i = args
+        with SharedArrays.attach(handle) as shared:
+            ...
+
+Views are numpy arrays if numpy is installed, otherwise memoryviews
+(which support ``view[i, j]`` indexing and ``tolist``). `SharedArrays`
+requires Python 3.8+; the other functions work on any supported
+version.
+"""
+import os
+import ast
+import sys
+import mmap
+import math
+import operator
+import importlib
+from array import array
+from functools import reduce
+from typing import (Any, Dict, Iterable, List, Optional, Tuple, Union,
+                    TYPE_CHECKING)
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+    from .league import League
+
+#: name to (shape, typed array of row-major values)
+Arrays = Dict[str, Tuple[Tuple[int, ...], array]]
+
+_ALIGN = 8
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_ORDER = "<" if sys.byteorder == "little" else ">"
+# array typecodes to numpy dtype descriptions, and back
+_DESCR = {"q": _ORDER + "i8", "d": _ORDER + "f8"}
+_TYPECODES = {v: k for k, v in _DESCR.items()}
+
+
+def _shared_memory():
+    # imported on use: multiprocessing.shared_memory is Python 3.8+
+    try:
+        return importlib.import_module("multiprocessing.shared_memory")
+    except ImportError:
+        raise ImportError("SharedArrays requires Python 3.8 or later "
+                          "(multiprocessing.shared_memory).") from None
+
+
+def _size(shape: Tuple[int, ...]) -> int:
+    # number of values of an array shape
+    return reduce(operator.mul, shape, 1)
+
+
+def build_arrays(leagues: Union["League", Iterable["League"]]) -> Arrays:
+    """Flatten scores and loaded stat lines into typed arrays
+
+    Only boxscores already loaded contribute player-weeks; see
+    :meth:`League.load_boxscores`. Several leagues are combined into
+    one set of arrays; teams and player-weeks are labelled by the index
+    of their league (in ``league_ids``) as well as their team ID.
+
+    :param leagues: league or iterable of leagues
+    :type leagues: Union[League, Iterable[League]]
+    :return: array name to (shape, values)
+    :rtype: Dict[str, Tuple[Tuple[int, ...], array]]
+    """
+    if hasattr(leagues, "league_id"):
+        leagues = [leagues]
+    leagues = list(leagues)
+    # rows keyed by (league index, team ID): team IDs repeat across leagues
+    team_keys = sorted({(i, t.team_id) for i, lg in enumerate(leagues)
+                        for t in lg.teams})
+    periods = sorted({sp for lg in leagues for m in lg._matchups
+                      for sp in m.scoring_periods})
+    rows = {k: i for i, k in enumerate(team_keys)}
+    cols = {sp: i for i, sp in enumerate(periods)}
+    scores = array("d", [math.nan]) * (len(team_keys) * len(periods))
+    pw_index = [array("q"), array("q"), array("q"), array("q")]
+    pw_points = array("d")
+    stat_lines = []
+    for index, league in enumerate(leagues):
+        for m in league._matchups:
+            if m.is_bye:
+                continue
+            sides = ((m.home_team_id, m.home_scores),
+                     (m.away_team_id, m.away_scores))
+            for team_id, team_scores in sides:
+                row = rows[index, team_id]
+                for sp, score in zip(m.scoring_periods, team_scores):
+                    scores[row * len(periods) + cols[sp]] = score
+        for m in league._matchups:
+            for tw in m.loaded_team_weeks():
+                for pw in tw.iter_slots():
+                    pw_index[0].append(index)
+                    pw_index[1].append(tw.team_id)
+                    pw_index[2].append(tw.scoring_period)
+                    pw_index[3].append(pw.player.player_id)
+                    pw_points.append(
+                        math.nan if pw.points is None else pw.points)
+                    stat_lines.append(pw._coded_stats)
+    codes = sorted({c for stats in stat_lines for c in stats})
+    stats = array("d")
+    for line in stat_lines:
+        stats.extend([line.get(c, 0.) for c in codes])
+    num = len(stat_lines)
+    return {
+        "league_ids": ((len(leagues),),
+                       array("q", [lg.league_id for lg in leagues])),
+        "seasons": ((len(leagues),),
+                    array("q", [lg.season for lg in leagues])),
+        "team_league": ((len(team_keys),),
+                        array("q", [k[0] for k in team_keys])),
+        "team_ids": ((len(team_keys),),
+                     array("q", [k[1] for k in team_keys])),
+        "scoring_periods": ((len(periods),), array("q", periods)),
+        "scores": ((len(team_keys), len(periods)), scores),
+        "pw_league": ((num,), pw_index[0]),
+        "pw_team_id": ((num,), pw_index[1]),
+        "pw_scoring_period": ((num,), pw_index[2]),
+        "pw_player_id": ((num,), pw_index[3]),
+        "pw_points": ((num,), pw_points),
+        "stat_codes": ((len(codes),), array("q", codes)),
+        "stats": ((num, len(codes)), stats),
+    }
+
+
+def _view(buffer, typecode: str, shape: Tuple[int, ...]) -> Any:
+    # read-only view of a bytes-like buffer
+    if np is not None:
+        res = np.frombuffer(buffer, dtype=_DESCR[typecode]).reshape(shape)
+        res.flags.writeable = False
+        return res
+    view = memoryview(buffer)
+    if not view.readonly:
+        # memoryview.toreadonly is Python 3.8+; before that, shared
+        # memory is unavailable and writable buffers are copied
+        toreadonly = getattr(view, "toreadonly", None)
+        view = toreadonly() if toreadonly else memoryview(view.tobytes())
+    if 0 in shape:
+        return view.cast(typecode)
+    return view.cast(typecode, shape)
+
+
+class SharedArrays:
+    """Named read-only arrays in one shared memory block
+
+    Create the block in one process with `create`, pass its `handle`
+    (a small picklable tuple) to other processes, and `attach` to it
+    there. Views must be released (deleted) before `close`. The
+    creating process should `unlink` the block when all processes are
+    done with it; using it as a context manager does so on exit.
+
+    :param shm: shared memory block
+    :type shm: multiprocessing.shared_memory.SharedMemory
+    :param layout: (name, typecode, shape, offset) of each array
+    :type layout: Tuple[Tuple[str, str, Tuple[int, ...], int], ...]
+    :param owner: whether this instance created the block
+    :type owner: bool
+    """
+
+    def __init__(self, shm: "SharedMemory",
+                 layout: Tuple, owner: bool = False) -> None:
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self._views = dict()
+
+    def __repr__(self):
+        return "SharedArrays {} : {}".format(
+            self.shm.name, ", ".join(i[0] for i in self.layout))
+
+    @classmethod
+    def create(cls, arrays: Arrays) -> "SharedArrays":
+        """Copy arrays into a new shared memory block
+
+        :param arrays: arrays from `build_arrays`
+        :type arrays: Dict[str, Tuple[Tuple[int, ...], array]]
+        :return: owning instance
+        :rtype: SharedArrays
+
+        :raise: ImportError before Python 3.8
+        """
+        shared_memory = _shared_memory()
+        layout, offset = [], 0
+        for name, (shape, values) in arrays.items():
+            layout.append((name, values.typecode, tuple(shape), offset))
+            size = len(values) * values.itemsize
+            offset += -(-size // _ALIGN) * _ALIGN
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (_, _, _, start), (_, values) in zip(layout, arrays.values()):
+            data = values.tobytes()
+            shm.buf[start:start + len(data)] = data
+        return cls(shm, tuple(layout), owner=True)
+
+    @property
+    def handle(self) -> Tuple[str, Tuple]:
+        """Picklable reference for `attach`
+
+        :return: block name and layout
+        :rtype: Tuple[str, Tuple]
+        """
+        return self.shm.name, self.layout
+
+    @classmethod
+    def attach(cls, handle: Tuple[str, Tuple]) -> "SharedArrays":
+        """Attach to a block created in another process
+
+        :param handle: `handle` of the creating instance
+        :type handle: Tuple[str, Tuple]
+        :return: non-owning instance
+        :rtype: SharedArrays
+
+        :raise: ImportError before Python 3.8
+        """
+        shared_memory = _shared_memory()
+        name, layout = handle
+        try:
+            # Python 3.13+: leave unlinking to the creating process
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, layout)
+
+    def keys(self) -> List[str]:
+        """Array names
+
+        :return: names in layout order
+        :rtype: List[str]
+        """
+        return [i[0] for i in self.layout]
+
+    def __getitem__(self, name: str) -> Any:
+        view = self._views.get(name)
+        if view is not None:
+            return view
+        for key, typecode, shape, offset in self.layout:
+            if key == name:
+                size = _size(shape) * array(typecode).itemsize
+                view = _view(self.shm.buf[offset:offset + size],
+                             typecode, shape)
+                self._views[name] = view
+                return view
+        raise KeyError(name)
+
+    def close(self) -> None:
+        """Release views and detach from the block"""
+        for view in self._views.values():
+            if isinstance(view, memoryview):
+                view.release()
+        self._views.clear()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Free the block (call once, from the creating process)"""
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if self.owner:
+            self.unlink()
+        return False
+
+
+def _npy_header(typecode, shape):
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': {}, }}"
+    header = header.format(_DESCR[typecode], repr(tuple(shape)))
+    # pad so the data start is 64-byte aligned, as numpy does
+    size = len(_NPY_MAGIC) + 2 + len(header) + 1
+    header += " " * (-size % 64) + "\n"
+    return _NPY_MAGIC + len(header).to_bytes(2, "little") + header.encode()
+
+
+def save_npy(arrays: Arrays, directory: str) -> List[str]:
+    """Write each array to a ``.npy`` file in a directory
+
+    Files can be read with `load_npy` or ``numpy.load``.
+
+    :param arrays: arrays from `build_arrays`
+    :type arrays: Dict[str, Tuple[Tuple[int, ...], array]]
+    :param directory: existing output directory
+    :type directory: str
+    :return: paths of written files
+    :rtype: List[str]
+    """
+    paths = []
+    for name, (shape, values) in arrays.items():
+        path = os.path.join(directory, f"{name}.npy")
+        with open(path, "wb") as f:
+            f.write(_npy_header(values.typecode, shape))
+            values.tofile(f)
+        paths.append(path)
+    return paths
+
+
+def _load_npy(path):
+    with open(path, "rb") as f:
+        if f.read(len(_NPY_MAGIC)) != _NPY_MAGIC:
+            raise ValueError("Unsupported .npy file %r." % path)
+        size = int.from_bytes(f.read(2), "little")
+        header = ast.literal_eval(f.read(size).decode())
+        offset = f.tell()
+        if header["fortran_order"] or header["descr"] not in _TYPECODES:
+            raise ValueError("Unsupported .npy file %r." % path)
+        typecode, shape = _TYPECODES[header["descr"]], header["shape"]
+        if _size(shape) == 0:
+            return _view(b"", typecode, shape)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _view(memoryview(mm)[offset:], typecode, shape)
+
+
+def load_npy(directory: str,
+             names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Memory-map ``.npy`` files written by `save_npy` as read-only views
+
+    :param directory: directory of files
+    :type directory: str
+    :param names: array names to load (defaults to all ``.npy`` files)
+    :type names: Optional[Iterable[str]]
+    :return: array name to view
+    :rtype: Dict[str, Any]
+
+    :raise: ValueError if a file is not a C-ordered int64 or float64
+            array
+    """
+    if names is None:
+        names = sorted(i[:-4] for i in os.listdir(directory)
+                       if i.endswith(".npy"))
+    return {name: _load_npy(os.path.join(directory, f"{name}.npy"))
+            for name in names}
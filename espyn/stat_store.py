@@ -0,0 +1,173 @@
+"""Stat lines shared between leagues
+
+Every league reports the same NFL stat line for a player in a scoring
+period, so a process loading many leagues would otherwise hold one
+copy of it per league. A `StatLineStore` keeps each stat line once,
+keyed by (season, scoring period, player ID), and `PlayerWeek` objects
+reference the stored dictionary; only league-specific data (lineup
+slot, applied points) live on the player-week.
+
+Each `PlayerRegistry` owns a store as its ``stats`` attribute, so
+leagues sharing a registry (by default, every league in the process)
+share stat lines.
+
+Stat lines are held by weak reference: a line is dropped once no
+player-week references it, so the store shrinks as boxscores are
+unloaded (e.g. evicted by a `BoxscoreBudget`). A line whose stats
+changed (e.g. a live week refetched) replaces the stored one.
+"""
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+#: (season, scoring period, player ID)
+StatKey = Tuple[int, int, int]
+
+
+def coded_stats(stats: Dict[str, float]) -> Dict[int, float]:
+    """Convert an API stat dictionary to integer stat codes
+
+    :param stats: stat dictionary keyed on string stat codes
+    :type stats: Dict[str, float]
+    :return: stat dictionary keyed on integer stat codes
+    :rtype: Dict[int, float]
+    """
+    return {int(k): v for k, v in stats.items()}
+
+
+class StatLine(dict):
+    """Stat line keyed on integer stat codes, weakly referenceable"""
+
+    __slots__ = ("__weakref__",)
+
+
+def _matches(line: Dict[int, float], stats: Dict[str, float]) -> bool:
+    # whether a stored line has the values of an API stat dictionary
+    if len(line) != len(stats):
+        return False
+    for k, v in stats.items():
+        if line.get(int(k)) != v:
+            return False
+    return True
+
+
+class StatLineStore:
+    """Stat lines keyed by (season, scoring period, player ID)
+
+    Stored dictionaries are shared by every player-week referencing
+    them and must not be modified. Lines are kept only while
+    referenced.
+    """
+
+    def __init__(self) -> None:
+        self._lines = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __contains__(self, key):
+        return key in self._lines
+
+    def __repr__(self):
+        return "StatLineStore : {} stat lines".format(len(self))
+
+    def __getstate__(self):
+        # lines stay shared with pickled player-weeks referencing them
+        return dict(self._lines)
+
+    def __setstate__(self, state):
+        self.__init__()
+        self._lines.update(state)
+
+    def get(self, season: int, scoring_period: int, player_id: int,
+            stats: Optional[Dict[str, float]] = None
+            ) -> Optional[Dict[int, float]]:
+        """Get stored stat line
+
+        :param season: season
+        :type season: int
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :param player_id: ESPN player ID
+        :type player_id: int
+        :param stats: stat dictionary from API response; if given, a
+                      stored line with other values is not returned
+        :type stats: Optional[Dict[str, float]]
+        :return: stat line keyed on stat codes, if stored
+        :rtype: Optional[Dict[int, float]]
+        """
+        line = self._lines.get((season, scoring_period, player_id))
+        if line is not None and stats is not None and \
+                not _matches(line, stats):
+            return None
+        return line
+
+    def intern(self, season: int, scoring_period: int, player_id: int,
+               stats: Dict[str, float]) -> Dict[int, float]:
+        """Get stored stat line, converting and storing it if new or changed
+
+        :param season: season
+        :type season: int
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :param player_id: ESPN player ID
+        :type player_id: int
+        :param stats: stat dictionary from API response
+        :type stats: Dict[str, float]
+        :return: stored stat line keyed on stat codes
+        :rtype: Dict[int, float]
+        """
+        key = (season, scoring_period, player_id)
+        line = self._lines.get(key)
+        if line is not None and _matches(line, stats):
+            return line
+        line = StatLine((int(k), v) for k, v in stats.items())
+        with self._lock:
+            self._lines[key] = line
+        return line
+
+    def add(self, season: int, scoring_period: int, player_id: int,
+            line: Dict[int, float]) -> Dict[int, float]:
+        """Store an already converted stat line
+
+        :param season: season
+        :type season: int
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :param player_id: ESPN player ID
+        :type player_id: int
+        :param line: stat line keyed on stat codes
+        :type line: Dict[int, float]
+        :return: stored stat line with the same key and values (which
+                 may be a previously stored dictionary)
+        :rtype: Dict[int, float]
+        """
+        key = (season, scoring_period, player_id)
+        with self._lock:
+            stored = self._lines.get(key)
+            if stored is not None and stored == line:
+                return stored
+            if not isinstance(line, StatLine):
+                line = StatLine(line)
+            self._lines[key] = line
+        return line
+
+    def discard_season(self, season: int) -> int:
+        """Remove stored stat lines of a season
+
+        :param season: season
+        :type season: int
+        :return: number of stat lines removed
+        :rtype: int
+        """
+        with self._lock:
+            keys = [k for k in list(self._lines) if k[0] == season]
+            for key in keys:
+                self._lines.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all stored stat lines"""
+        with self._lock:
+            self._lines.clear()
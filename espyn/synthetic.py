@@ -0,0 +1,670 @@
+"""Synthetic ESPN-shaped league data for scaling and load tests
+
+`SyntheticLeague` generates league and scoring-period payloads shaped
+like API responses, for any number of teams, matchup lengths, roster
+sizes and stat density. Payloads are deterministic for a given league
+ID, season and seed, and players are drawn from a shared pool, so many
+synthetic leagues share players as real leagues do.
+"""
+import os
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import jsonlib
+from .caches import Cache, LocalCache
+
+# default (non-PPR) scoring: stat code to points
+DEFAULT_SCORING = {
+    4: 4., 5: 0.2, 19: 2., 20: -2., 24: 0.1, 25: 6., 26: 2., 42: 0.1,
+    43: 6., 72: -2., 77: 5., 80: 3., 85: -1., 86: 1., 89: 5., 90: 4.,
+    91: 3., 92: 1., 95: 2., 96: 2., 97: 2., 98: 2., 99: 1., 103: 6.,
+    104: 6., 123: -1., 124: -3., 125: -5.,
+}
+
+# default lineup: slot ID to count (bench count is set from roster size)
+DEFAULT_SLOT_COUNTS = {0: 1, 2: 2, 4: 2, 6: 1, 16: 1, 17: 1, 23: 1}
+
+_ELIGIBLE_SLOTS = {
+    1: [0, 7, 20, 21],
+    2: [2, 3, 23, 7, 20, 21],
+    3: [3, 4, 5, 23, 7, 20, 21],
+    4: [5, 6, 23, 7, 20, 21],
+    5: [17, 20, 21],
+    16: [16, 20, 21],
+}
+
+# starting position for each lineup slot (FLEX alternates RB/WR)
+_SLOT_POSITIONS = {0: 1, 2: 2, 4: 3, 6: 4, 16: 16, 17: 5, 23: 2}
+# positions of bench players, cycled
+_BENCH_POSITIONS = (2, 3, 1, 4, 2, 3, 16, 5)
+
+# stat code to (low, high) for each position: scoring stats are always
+# present, extras are included with probability `stat_density`
+_STATS = {
+    1: ({3: (150, 400), 4: (0, 4), 20: (0, 2), 24: (0, 40), 25: (0, 1),
+         72: (0, 1)},
+        {0: (25, 45), 1: (15, 30), 23: (1, 8)}),
+    2: ({24: (10, 130), 25: (0, 2), 41: (0, 6), 42: (0, 60), 43: (0, 1),
+         72: (0, 1)},
+        {23: (5, 25), 58: (0, 8)}),
+    3: ({41: (1, 10), 42: (10, 150), 43: (0, 2), 24: (0, 10), 72: (0, 1)},
+        {58: (2, 14), 23: (0, 2)}),
+    4: ({41: (0, 8), 42: (0, 90), 43: (0, 1)},
+        {58: (1, 9)}),
+    5: ({77: (0, 1), 80: (0, 4), 85: (0, 1), 86: (0, 5)},
+        {81: (0, 4), 83: (0, 5), 84: (0, 5)}),
+    16: ({95: (0, 2), 96: (0, 2), 97: (0, 1), 98: (0, 1), 99: (0, 5),
+          103: (0, 1)},
+         {107: (0, 20), 120: (0, 35), 127: (200, 450)}),
+}
+_POINTS_ALLOWED = (89, 90, 91, 92, 123, 124, 125)
+# ESPN includes these bookkeeping codes in most stat lines
+_COMMON_STATS = (155, 158, 210)
+
+_FIRST_NAMES = ("Alex", "Jordan", "Taylor", "Casey", "Riley", "Morgan",
+                "Jamie", "Drew", "Quinn", "Avery", "Reese", "Rowan")
+_LAST_NAMES = ("Smith", "Johnson", "Brown", "Davis", "Miller", "Wilson",
+               "Moore", "Clark", "Lewis", "Walker", "Hall", "Young", "King")
+_PRO_TEAM_IDS = tuple(range(1, 31)) + (33, 34)
+# base player ID for each position; D/ST IDs are negative as in the API
+_ID_BASE = {1: 1000000, 2: 2000000, 3: 3000000, 4: 4000000, 5: 5000000,
+            16: -16000}
+
+
+def _player(position: int, index: int) -> Dict[str, Any]:
+    # deterministic player from the shared pool
+    pro_team = _PRO_TEAM_IDS[index % len(_PRO_TEAM_IDS)]
+    if position == 16:
+        first, last = "Team {}".format(index + 1), "D/ST"
+        player_id = _ID_BASE[16] - index
+    else:
+        first = _FIRST_NAMES[index % len(_FIRST_NAMES)]
+        last = _LAST_NAMES[(index // len(_FIRST_NAMES)) % len(_LAST_NAMES)]
+        player_id = _ID_BASE[position] + index
+    return {
+        "active": True,
+        "defaultPositionId": position,
+        "eligibleSlots": _ELIGIBLE_SLOTS[position],
+        "firstName": first,
+        "lastName": last,
+        "fullName": "{} {}".format(first, last),
+        "id": player_id,
+        "proTeamId": pro_team,
+    }
+
+
+class SyntheticLeague:
+    """Generator of ESPN-shaped payloads for a synthetic league
+
+    The regular season is a round robin (teams on a bye when the number
+    of teams is odd), followed by single-elimination playoffs for the
+    top `playoff_teams` teams; other teams play consolation matchups.
+    Every matchup of a regular-season (or playoff) matchup period spans
+    `matchup_length` (or `playoff_matchup_length`) scoring periods.
+    All matchups are complete.
+
+    :param league_id: league ID
+    :type league_id: int
+    :param season: season
+    :type season: int
+    :param num_teams: number of teams
+    :type num_teams: int
+    :param reg_season_matchups: number of regular-season matchup periods
+    :type reg_season_matchups: int
+    :param matchup_length: scoring periods per regular-season matchup
+    :type matchup_length: int
+    :param playoff_teams: number of teams in the playoffs
+    :type playoff_teams: int
+    :param playoff_matchup_length: scoring periods per playoff matchup
+    :type playoff_matchup_length: int
+    :param roster_size: players per team (at least the number of
+                        starters, 9)
+    :type roster_size: int
+    :param stat_density: probability (0-1) of each non-scoring stat
+                         appearing in a stat line
+    :type stat_density: float
+    :param projections: whether stat lines include projections
+    :type projections: bool
+    :param seed: random seed
+    :type seed: int
+    """
+
+    def __init__(self, league_id: int = 1, season: int = 2020,
+                 num_teams: int = 10, reg_season_matchups: int = 13,
+                 matchup_length: int = 1, playoff_teams: int = 4,
+                 playoff_matchup_length: int = 1, roster_size: int = 16,
+                 stat_density: float = 0.5, projections: bool = True,
+                 seed: int = 0) -> None:
+        num_starters = sum(DEFAULT_SLOT_COUNTS.values())
+        if num_teams < 2:
+            raise ValueError("A league needs at least 2 teams.")
+        if roster_size < num_starters:
+            raise ValueError(
+                "Roster size must be at least %d." % num_starters)
+        if not 0 <= playoff_teams <= num_teams:
+            raise ValueError("Invalid number of playoff teams.")
+        self.league_id = league_id
+        self.season = season
+        self.num_teams = num_teams
+        self.reg_season_matchups = reg_season_matchups
+        self.matchup_length = matchup_length
+        self.playoff_teams = playoff_teams
+        self.playoff_matchup_length = playoff_matchup_length
+        self.roster_size = roster_size
+        self.stat_density = stat_density
+        self.projections = projections
+        self.seed = seed
+        self.team_ids = list(range(1, num_teams + 1))
+        self.slot_counts = dict(DEFAULT_SLOT_COUNTS)
+        self.slot_counts[20] = roster_size - num_starters
+        self.slot_counts[21] = 0
+        self.scoring = dict(DEFAULT_SCORING)
+        self.matchup_periods = self._matchup_periods()
+        self._rosters = self._draft()
+        self._points = dict()  # (team ID, scoring period) to points
+        self._league_data = None
+
+    def __repr__(self):
+        return "SyntheticLeague {} ({}) : {} teams".format(
+            self.league_id, self.season, self.num_teams)
+
+    def _rng(self, *keys) -> random.Random:
+        # independent, reproducible stream for each part of the league
+        key = "-".join(str(i) for i in
+                       (self.seed, self.league_id, self.season) + keys)
+        return random.Random(key)
+
+    @property
+    def scoring_periods(self) -> List[int]:
+        """All scoring periods of the season
+
+        :return: scoring periods in order
+        :rtype: List[int]
+        """
+        return [sp for sps in self.matchup_periods.values() for sp in sps]
+
+    @property
+    def num_playoff_rounds(self) -> int:
+        """Number of playoff matchup periods
+
+        :return: number of rounds
+        :rtype: int
+        """
+        if self.playoff_teams < 2:
+            return 0
+        return math.ceil(math.log2(self.playoff_teams))
+
+    def _matchup_periods(self) -> Dict[int, List[int]]:
+        res, sp = dict(), 1
+        total = self.reg_season_matchups + self.num_playoff_rounds
+        for num in range(1, total + 1):
+            length = self.matchup_length
+            if num > self.reg_season_matchups:
+                length = self.playoff_matchup_length
+            res[num] = list(range(sp, sp + length))
+            sp += length
+        return res
+
+    def _lineup(self) -> List[Tuple[int, int]]:
+        # (position, lineup slot) of each roster spot
+        res = []
+        flex = 0
+        for slot, count in self.slot_counts.items():
+            if slot in (20, 21):
+                continue
+            for _ in range(count):
+                pos = _SLOT_POSITIONS[slot]
+                if slot == 23:
+                    pos = (2, 3)[flex % 2]
+                    flex += 1
+                res.append((pos, slot))
+        for i in range(self.slot_counts[20]):
+            res.append((_BENCH_POSITIONS[i % len(_BENCH_POSITIONS)], 20))
+        return res
+
+    def _draft(self) -> Dict[int, List[Tuple[Dict[str, Any], int]]]:
+        # assign distinct pool players to each team's roster spots
+        lineup = self._lineup()
+        needed = dict()
+        for pos, _ in lineup:
+            needed[pos] = needed.get(pos, 0) + self.num_teams
+        rng = self._rng("draft")
+        pools = dict()
+        for pos, count in needed.items():
+            # draw from a pool larger than needed, so leagues differ
+            pool = list(range(count * 2))
+            rng.shuffle(pool)
+            pools[pos] = pool[:count]
+        rosters = dict()
+        for team_id in self.team_ids:
+            roster = []
+            for pos, slot in lineup:
+                roster.append((_player(pos, pools[pos].pop()), slot))
+            rosters[team_id] = roster
+        return rosters
+
+    def _stat_line(self, rng, player, scoring_period):
+        position = player["defaultPositionId"]
+        core, extra = _STATS[position]
+        stats = {code: float(rng.randint(lo, hi))
+                 for code, (lo, hi) in core.items()}
+        for code, (lo, hi) in extra.items():
+            if rng.random() < self.stat_density:
+                stats[code] = float(rng.randint(lo, hi))
+        if 3 in stats:
+            stats[5] = float(int(stats[3]) // 5)
+        if position == 16:
+            stats[rng.choice(_POINTS_ALLOWED)] = 1.
+        for code in _COMMON_STATS:
+            if rng.random() < self.stat_density:
+                stats[code] = 1.
+        points = round(sum(v * self.scoring.get(k, 0)
+                           for k, v in stats.items()), 2)
+        res = [{
+            "appliedTotal": points,
+            "proTeamId": player["proTeamId"],
+            "scoringPeriodId": scoring_period,
+            "seasonId": self.season,
+            "statSourceId": 0,
+            "statSplitTypeId": 1,
+            "stats": {str(k): v for k, v in stats.items()},
+        }]
+        if self.projections:
+            factor = rng.uniform(0.6, 1.4)
+            res.append({
+                "appliedTotal": round(points * factor + rng.uniform(0, 3), 2),
+                "proTeamId": 0,
+                "scoringPeriodId": scoring_period,
+                "seasonId": self.season,
+                "statSourceId": 1,
+                "statSplitTypeId": 1,
+                "stats": {str(k): round(v * factor, 3)
+                          for k, v in stats.items()},
+            })
+        return points, res
+
+    def team_week(self, team_id: int,
+                  scoring_period: int) -> Tuple[List[Dict[str, Any]], float]:
+        """Generate a team's roster entries for a scoring period
+
+        :param team_id: team ID
+        :type team_id: int
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :return: roster entries and the team's points (sum of starters)
+        :rtype: Tuple[List[Dict[str, Any]], float]
+        """
+        rng = self._rng("week", team_id, scoring_period)
+        entries, total = [], 0.
+        for player, slot in self._rosters[team_id]:
+            player = dict(player)
+            points = 0.
+            # occasional inactive player (bye or injury) without stats
+            if rng.random() < 0.03:
+                player["stats"] = []
+            else:
+                points, player["stats"] = self._stat_line(
+                    rng, player, scoring_period)
+            if slot not in (20, 21):
+                total += points
+            entries.append({
+                "lineupSlotId": slot,
+                "playerId": player["id"],
+                "playerPoolEntry": {
+                    "appliedStatTotal": points,
+                    "id": player["id"],
+                    "onTeamId": team_id,
+                    "player": player,
+                },
+            })
+        total = round(total, 2)
+        self._points[team_id, scoring_period] = total
+        return entries, total
+
+    def _team_points(self, team_id, scoring_period):
+        key = (team_id, scoring_period)
+        if key not in self._points:
+            self.team_week(team_id, scoring_period)
+        return self._points[key]
+
+    def _side(self, team_id, num):
+        scores = {str(sp): self._team_points(team_id, sp)
+                  for sp in self.matchup_periods[num]}
+        return {
+            "teamId": team_id,
+            "totalPoints": round(sum(scores.values()), 2),
+            "pointsByScoringPeriod": scores,
+        }
+
+    def _matchup(self, num, home_id, away_id, tier="NONE"):
+        item = {"matchupPeriodId": num, "playoffTierType": tier,
+                "home": self._side(home_id, num)}
+        if away_id is None:
+            item["winner"] = "UNDECIDED"
+            return item
+        item["away"] = self._side(away_id, num)
+        diff = item["home"]["totalPoints"] - item["away"]["totalPoints"]
+        if diff == 0 and tier == "NONE":
+            item["winner"] = "TIE"
+        else:
+            # playoff ties go to the home (higher) seed
+            item["winner"] = "HOME" if diff >= 0 else "AWAY"
+        return item
+
+    @staticmethod
+    def _pairs(team_ids):
+        # pair teams in order, the last one on a bye if odd
+        res = [(team_ids[i], team_ids[i + 1])
+               for i in range(0, len(team_ids) - 1, 2)]
+        if len(team_ids) % 2:
+            res.append((team_ids[-1], None))
+        return res
+
+    def _regular_season(self):
+        teams = list(self.team_ids)
+        if len(teams) % 2:
+            teams.append(None)
+        n = len(teams)
+        schedule = []
+        for num in range(1, self.reg_season_matchups + 1):
+            # circle method: rotate all but the first team each round
+            r = (num - 1) % (n - 1)
+            order = [teams[0]] + teams[1:][r:] + teams[1:][:r]
+            for i in range(n // 2):
+                home, away = order[i], order[n - 1 - i]
+                if num % 2:
+                    home, away = away, home
+                if home is None:
+                    home, away = away, home
+                schedule.append(self._matchup(num, home, away))
+        return schedule
+
+    def _playoffs(self, seeds):
+        schedule = []
+        bracket, others = seeds[:self.playoff_teams], seeds[self.playoff_teams:]
+        num = self.reg_season_matchups
+        for _ in range(self.num_playoff_rounds):
+            num += 1
+            # top seeds get byes until the bracket is a power of 2
+            byes = 2 ** math.ceil(math.log2(len(bracket))) - len(bracket)
+            winners = list(bracket[:byes])
+            for team_id in bracket[:byes]:
+                schedule.append(self._matchup(num, team_id, None,
+                                              "WINNERS_BRACKET"))
+            playing = bracket[byes:]
+            losers = []
+            for i in range(len(playing) // 2):
+                item = self._matchup(num, playing[i], playing[-1 - i],
+                                     "WINNERS_BRACKET")
+                schedule.append(item)
+                home_won = item["winner"] == "HOME"
+                winners.append(playing[i] if home_won else playing[-1 - i])
+                losers.append(playing[-1 - i] if home_won else playing[i])
+            for home, away in self._pairs(others):
+                schedule.append(self._matchup(
+                    num, home, away, "LOSERS_CONSOLATION_LADDER"))
+            # eliminated teams play consolation matchups from next round
+            bracket = [i for i in seeds if i in winners]
+            others = [i for i in seeds if i in others or i in losers]
+        return schedule
+
+    def _records(self, schedule):
+        records = {i: {"wins": 0, "losses": 0, "ties": 0, "pointsFor": 0.,
+                       "pointsAgainst": 0.} for i in self.team_ids}
+        for item in schedule:
+            if item["matchupPeriodId"] > self.reg_season_matchups:
+                continue
+            if "away" not in item:
+                continue
+            home, away = item["home"], item["away"]
+            results = {"HOME": ("wins", "losses"), "AWAY": ("losses", "wins"),
+                       "TIE": ("ties", "ties")}[item["winner"]]
+            for side, other, result in ((home, away, results[0]),
+                                        (away, home, results[1])):
+                rec = records[side["teamId"]]
+                rec[result] += 1
+                rec["pointsFor"] += side["totalPoints"]
+                rec["pointsAgainst"] += other["totalPoints"]
+        for rec in records.values():
+            games = rec["wins"] + rec["losses"] + rec["ties"]
+            rec["percentage"] = ((rec["wins"] + rec["ties"] / 2) / games
+                                 if games else 0.)
+            rec["pointsFor"] = round(rec["pointsFor"], 2)
+            rec["pointsAgainst"] = round(rec["pointsAgainst"], 2)
+        return records
+
+    def _members_and_teams(self, records):
+        rng = self._rng("teams")
+        num_divisions = 2 if self.num_teams >= 8 else 1
+        members, teams = [], []
+        for team_id in self.team_ids:
+            member_id = "{{SYN-{}-{}}}".format(self.league_id, team_id)
+            first = rng.choice(_FIRST_NAMES)
+            last = rng.choice(_LAST_NAMES)
+            members.append({"id": member_id, "firstName": first,
+                            "lastName": last,
+                            "displayName": (first + last).lower()})
+            teams.append({
+                "id": team_id,
+                "abbrev": "T{:02d}".format(team_id),
+                "location": "Team",
+                "nickname": "{} {}".format(last, team_id),
+                "owners": [member_id],
+                "divisionId": (team_id - 1) % num_divisions,
+                "record": {"overall": records[team_id]},
+                "transactionCounter": {"acquisitions": rng.randint(0, 40)},
+            })
+        return members, teams
+
+    def league_data(self) -> Dict[str, Any]:
+        """Generate the league payload (settings, teams and schedule)
+
+        :return: league data as returned by the API
+        :rtype: Dict[str, Any]
+        """
+        if self._league_data is not None:
+            return self._league_data
+        schedule = self._regular_season()
+        records = self._records(schedule)
+        seeds = sorted(self.team_ids, key=lambda i: (
+            -records[i]["wins"], -records[i]["pointsFor"], i))
+        schedule.extend(self._playoffs(seeds))
+        for i, item in enumerate(schedule):
+            item["id"] = i + 1
+        members, teams = self._members_and_teams(records)
+        draft_order = list(self.team_ids)
+        self._rng("draft_order").shuffle(draft_order)
+        last_sp = self.scoring_periods[-1]
+        self._league_data = {
+            "id": self.league_id,
+            "seasonId": self.season,
+            "scoringPeriodId": last_sp,
+            "status": {
+                "currentMatchupPeriod": len(self.matchup_periods),
+                "firstScoringPeriod": 1,
+                "finalScoringPeriod": last_sp,
+                "latestScoringPeriod": last_sp,
+            },
+            "settings": {
+                "name": "Synthetic League {}".format(self.league_id),
+                "size": self.num_teams,
+                "draftSettings": {"pickOrder": draft_order,
+                                  "type": "SNAKE"},
+                "scheduleSettings": {
+                    "matchupPeriodCount": self.reg_season_matchups,
+                    "matchupPeriodLength": self.matchup_length,
+                    "matchupPeriods": {str(k): v for k, v in
+                                       self.matchup_periods.items()},
+                    "playoffMatchupPeriodLength":
+                        self.playoff_matchup_length,
+                    "playoffTeamCount": self.playoff_teams,
+                },
+                "rosterSettings": {
+                    "lineupSlotCounts": {str(k): v for k, v in
+                                         self.slot_counts.items()},
+                },
+                "scoringSettings": {
+                    "scoringItems": [{"statId": k, "points": v}
+                                     for k, v in self.scoring.items()],
+                },
+            },
+            "members": members,
+            "teams": teams,
+            "schedule": schedule,
+        }
+        return self._league_data
+
+    def matchup_num(self, scoring_period: int) -> int:
+        """Get matchup number containing a scoring period
+
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :return: matchup number
+        :rtype: int
+
+        :raise: ValueError if scoring period is not in the season
+        """
+        for num, sps in self.matchup_periods.items():
+            if scoring_period in sps:
+                return num
+        raise ValueError(
+            "Scoring period %d is not in the season." % scoring_period)
+
+    def matchup_entries(self, scoring_period: int,
+                        matchup_num: int) -> List[Dict[str, Any]]:
+        """Generate schedule entries with boxscores for a matchup number
+
+        :param scoring_period: scoring period of boxscores
+        :type scoring_period: int
+        :param matchup_num: matchup number
+        :type matchup_num: int
+        :return: schedule entries with rosters for the scoring period
+                 (none if the period is not part of the matchup)
+        :rtype: List[Dict[str, Any]]
+        """
+        if scoring_period not in self.matchup_periods.get(matchup_num, ()):
+            return []
+        res = []
+        for item in self.league_data()["schedule"]:
+            if item["matchupPeriodId"] != matchup_num:
+                continue
+            item = dict(item)
+            for side in ("home", "away"):
+                if side not in item:
+                    continue
+                team = dict(item[side])
+                entries, points = self.team_week(team["teamId"],
+                                                 scoring_period)
+                team["rosterForCurrentScoringPeriod"] = {
+                    "appliedStatTotal": points, "entries": entries}
+                item[side] = team
+            res.append(item)
+        return res
+
+    def scoring_period_data(self, scoring_period: int) -> Dict[str, Any]:
+        """Generate the payload with boxscores for a scoring period
+
+        :param scoring_period: scoring period
+        :type scoring_period: int
+        :return: league data whose matchups of the period have rosters
+        :rtype: Dict[str, Any]
+        """
+        num = self.matchup_num(scoring_period)
+        res = dict(self.league_data())
+        boxscores = iter(self.matchup_entries(scoring_period, num))
+        res["scoringPeriodId"] = scoring_period
+        res["schedule"] = [next(boxscores) if i["matchupPeriodId"] == num
+                           else i for i in res["schedule"]]
+        return res
+
+    def response(self, scoring_period: Optional[int] = None) -> bytes:
+        """Generate an encoded API response body
+
+        :param scoring_period: scoring period of boxscores (optional)
+        :type scoring_period: Optional[int]
+        :return: UTF-8 encoded JSON
+        :rtype: bytes
+        """
+        if scoring_period is None:
+            return jsonlib.dumps(self.league_data())
+        return jsonlib.dumps(self.scoring_period_data(scoring_period))
+
+    def write(self, cache_dir: str) -> List[str]:
+        """Write league and all scoring period payloads to a cache directory
+
+        Files are written with `LocalCache`, so a `League` with this
+        league ID and season can be loaded from the directory.
+
+        :param cache_dir: existing cache directory
+        :type cache_dir: str
+        :return: paths of written files
+        :rtype: List[str]
+        """
+        cache = LocalCache(cache_dir)
+        cache.set_league(self)
+        paths = []
+        for sp in [None] + self.scoring_periods:
+            data = (self.league_data() if sp is None
+                    else self.scoring_period_data(sp))
+            cache.save(data, sp)
+            paths.append(cache._get_filename(sp))
+        return [os.path.join(cache_dir, i) for i in paths]
+
+
+class SyntheticCache(Cache):
+    """Cache serving synthetic data for any league
+
+    The league the cache is set on gets a `SyntheticLeague` with the
+    league's ID and season. Like other caches, an instance serves one
+    league (loads do not say which league they are for), so give each
+    league its own cache; e.g.
+    ``League(i, 2020, cache=SyntheticCache(num_teams=20))`` for many
+    distinct leagues. Saves are ignored.
+
+    :param kwargs: keyword arguments for `SyntheticLeague`
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.league = None
+        self._synthetic = None
+
+    def set_league(self, league):
+        """Set league to be used with cache
+
+        :param league: league whose data will be generated
+        :type league: League
+
+        :raise: ValueError if the cache was set on another league
+        """
+        if self.league is not None and self.league is not league:
+            raise ValueError("A SyntheticCache serves one league; give "
+                             "each league its own cache.")
+        super().set_league(league)
+
+    @property
+    def synthetic(self) -> SyntheticLeague:
+        """Generator for the league set on the cache
+
+        :return: synthetic league
+        :rtype: SyntheticLeague
+        """
+        # created on first load: the league's ID and season are not
+        # set yet when `League` calls `set_league`
+        key = (self.league.league_id, self.league.season)
+        if self._synthetic is None or \
+                (self._synthetic.league_id, self._synthetic.season) != key:
+            self._synthetic = SyntheticLeague(*key, **self.kwargs)
+        return self._synthetic
+
+    def load(self, scoring_period=None):
+        if scoring_period is None:
+            return self.synthetic.league_data()
+        return self.synthetic.scoring_period_data(scoring_period)
+
+    def load_matchups(self, scoring_period, matchup_num):
+        return self.synthetic.matchup_entries(scoring_period, matchup_num)
+
+    def save(self, data, scoring_period=None):
+        pass
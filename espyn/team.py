@@ -16,6 +16,11 @@ class Team:
     :type league: League
     """
 
+    __slots__ = ("_league", "team_id", "team_abbrev", "team_location",
+                 "team_nickname", "owner", "division_id", "points_for",
+                 "points_against", "wins", "losses", "ties", "winning_pct",
+                 "transactions", "acquisitions", "draft_position")
+
     def __init__(self, team_data: Dict[str, Any],
                  league: "League") -> None:
         self._league = league
@@ -62,6 +67,15 @@ class Team:
         """
         return "{}-{}-{}".format(self.wins, self.losses, self.ties)
 
+    @property
+    def matchups(self) -> List["Matchup"]:
+        """Team's matchups
+
+        :return: matchups, ordered by matchup number
+        :rtype: List[Matchup]
+        """
+        return self._league.schedule.team_matchups(self.team_id)
+
     def get_matchup(self, number: int,
                     boxscore: bool = False) -> "Matchup":
         """Get team's matchup by number
@@ -102,9 +116,10 @@ class Team:
         cm = self._league.current_matchup_num()
         if cm == SEASON_OVER:
             cm = self._league.total_matchups + 1
-        for m_num in range(1, cm):  # excludes matchup in progress
-            m = self.get_matchup(m_num)
-            if m is None or m.is_bye:
+        for m in self.matchups:
+            if m.matchup_num >= cm:  # excludes matchup in progress
+                break
+            if m.is_bye:
                 continue
             if (not include_playoffs) and m.is_playoff:
                 continue
@@ -114,9 +129,11 @@ class Team:
                 scores.extend(m.away_scores)
         return scores
 
-    def to_json(self) -> Dict[str, Any]:
+    def to_json(self, scores: bool = True) -> Dict[str, Any]:
         """Get JSON-serializable dictionary representation
 
+        :param scores: whether to include `scores` (see :meth:`scores`)
+        :type scores: bool
         :return: dictionary representation of team
         :rtype: Dict[str, Any]
         """
@@ -135,5 +152,6 @@ class Team:
         res["winning_pct"] = self.winning_pct
         res["transactions"] = self.acquisitions
         res["draft_position"] = self.draft_position
-        res["scores"] = self.scores()
+        if scores:
+            res["scores"] = self.scores()
         return res
@@ -1,31 +1,100 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 
+from . import instrument
 from .player_week import PlayerWeek
+from .registry import PlayerRegistry
 
 
 class TeamWeek:
     """Representation of team boxscore for a scoring period
 
+    Player-level data are parsed from the roster entries the first time
+    `slots` is accessed; `iter_slots` parses them without retaining
+    the results.
+
     :param week_data: data from API response
     :type week_data: Dict[str, Any]
     :param scoring_period: scoring period
     :type scoring_period: int
+    :param registry: registry interning players (defaults to the
+                     process-wide registry)
+    :type registry: Optional[PlayerRegistry]
+    :param season: season, under which player-weeks share stat lines
+                   (not shared if None; see `PlayerWeek`)
+    :type season: Optional[int]
     """
 
-    def __init__(self, week_data: Dict[str, Any],
-                 scoring_period: int) -> None:
+    __slots__ = ("season", "scoring_period", "team_id", "points",
+                 "_entries", "_registry", "_slots")
+
+    def __init__(self, week_data: Dict[str, Any], scoring_period: int,
+                 registry: Optional[PlayerRegistry] = None,
+                 season: Optional[int] = None) -> None:
+        self.season = season
         self.scoring_period = scoring_period
+        self.team_id = week_data.get("teamId")
         try:
             self.points = week_data["pointsByScoringPeriod"][str(scoring_period)]
         except KeyError:
             # scoring period breakdown may be missing if 0 points for matchup
             assert week_data["totalPoints"] == 0
             self.points = 0
-        self.slots = []
-        for slot in week_data["rosterForCurrentScoringPeriod"]["entries"]:
+        self._entries = week_data["rosterForCurrentScoringPeriod"]["entries"]
+        self._registry = registry
+        self._slots = None
+
+    def _parse_slots(self, entries, registry) -> Iterator[PlayerWeek]:
+        season, scoring_period = self.season, self.scoring_period
+        for slot in entries:
             if slot.get("playerId") is None:
                 continue
-            self.slots.append(PlayerWeek(slot))
+            yield PlayerWeek(slot, registry, season, scoring_period)
+
+    @property
+    def slots(self) -> List[PlayerWeek]:
+        """Player stat lines for every rostered player
+
+        :return: player-weeks in roster order
+        :rtype: List[PlayerWeek]
+        """
+        if self._slots is None:
+            entries, registry = self._entries, self._registry
+            if entries is None:
+                # another thread materialized slots in the meantime
+                return self._slots
+            with instrument.span("team_week.parse", team_id=self.team_id,
+                                 scoring_period=self.scoring_period):
+                self._slots = list(self._parse_slots(entries, registry))
+            self._entries, self._registry = None, None
+        return self._slots
+
+    def iter_slots(self) -> Iterator[PlayerWeek]:
+        """Iterate over player stat lines
+
+        Does not retain parsed player-weeks if `slots` has not been
+        accessed, which avoids holding every player-week in memory
+        for one-pass reads.
+
+        :return: player-weeks in roster order
+        :rtype: Iterator[PlayerWeek]
+        """
+        entries, registry = self._entries, self._registry
+        if entries is None:
+            return iter(self._slots)
+        return self._parse_slots(entries, registry)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get JSON-serializable dictionary representation
+
+        :return: dictionary representation of team-week
+        :rtype: Dict[str, Any]
+        """
+        res = dict()
+        res["team_id"] = self.team_id
+        res["scoring_period"] = self.scoring_period
+        res["points"] = self.points
+        res["slots"] = [pw.to_json() for pw in self.iter_slots()]
+        return res
 
     def __repr__(self):
         return "Scoring Period {} : {} points".format(
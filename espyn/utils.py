@@ -1,5 +1,7 @@
 import math
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Optional, Union
 
 
 def current_season() -> int:
@@ -10,11 +12,7 @@ def current_season() -> int:
     :return: current NFL season
     :rtype: int
     """
-    now = datetime.now()
-    month, year = now.month, now.year
-    if month < 4:
-        year -= 1
-    return year
+    return SeasonCalendar().season()
 
 
 def _labor_day(year):
@@ -24,10 +22,17 @@ def _labor_day(year):
     :return: first Monday in September of year
     """
     day = datetime(year, 9, 1)
-    delta = timedelta(days=1)
-    while day.weekday() != 0:
-        day += delta
-    return day
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+@lru_cache(maxsize=None)
+def _week_one(season):
+    # Wednesday after Labor Day, on which week 1 ends
+    return _labor_day(season) + timedelta(days=2)
+
+
+def _season_of(date):
+    return date.year - 1 if date.month < 4 else date.year
 
 
 def get_week_from_date(date) -> int:
@@ -42,15 +47,7 @@ def get_week_from_date(date) -> int:
     :return: NFL week (ESPN scoring period)
     :rtype: int
     """
-    month, year = date.month, date.year
-    if month < 4:
-        year -= 1
-    ld = _labor_day(year)
-    wk1_wed = ld + timedelta(days=2)
-    days_since = (date - wk1_wed).days
-    weeks_since = days_since / 7.
-    week = math.floor(weeks_since) + 1
-    return int(week)
+    return SeasonCalendar.week_in_season(date, _season_of(date))
 
 
 def current_week() -> int:
@@ -59,5 +56,95 @@ def current_week() -> int:
     :return: current NFL week (ESPN scoring period)
     :rtype: int
     """
-    now = datetime.now()
-    return get_week_from_date(now)
+    return SeasonCalendar().week()
+
+
+class SeasonCalendar:
+    """NFL seasons and weeks relative to an injectable clock
+
+    Week boundaries are computed once per season and memoized. Pass
+    `as_of` to fix the date (making results reproducible, e.g. for
+    batch jobs recomputing past seasons) or `clock` to supply the
+    current time; by default the system clock is used.
+
+    :param as_of: fixed date to treat as now
+    :type as_of: Optional[Union[date, datetime]]
+    :param clock: function returning the current datetime
+    :type clock: Optional[Callable[[], datetime]]
+    """
+
+    __slots__ = ("as_of", "clock")
+
+    def __init__(self, as_of: Optional[Union[date, datetime]] = None,
+                 clock: Optional[Callable[[], datetime]] = None) -> None:
+        if as_of is not None and not isinstance(as_of, datetime):
+            as_of = datetime(as_of.year, as_of.month, as_of.day)
+        self.as_of = as_of
+        self.clock = clock or datetime.now
+
+    def __repr__(self):
+        return "SeasonCalendar as of {}".format(self.as_of or "now")
+
+    def now(self) -> datetime:
+        """Get current date and time
+
+        :return: `as_of` if set, otherwise the clock's time
+        :rtype: datetime
+        """
+        if self.as_of is not None:
+            return self.as_of
+        return self.clock()
+
+    def season(self, date: Optional[datetime] = None) -> int:
+        """Get NFL season of a date
+
+        Dates after March belong to the season of their year.
+
+        :param date: date (defaults to now)
+        :type date: Optional[datetime]
+        :return: NFL season
+        :rtype: int
+        """
+        return _season_of(date or self.now())
+
+    @staticmethod
+    def week_one(season: int) -> datetime:
+        """Get the Wednesday ending week 1 of a season
+
+        :param season: NFL season
+        :type season: int
+        :return: start of the Wednesday after Labor Day
+        :rtype: datetime
+        """
+        return _week_one(season)
+
+    @staticmethod
+    def week_in_season(date: datetime, season: int) -> int:
+        """Get NFL week of a date, counted from a season's week 1
+
+        Not capped, so may be below 1 (before the season) or above 17
+        (after it).
+
+        :param date: date
+        :type date: datetime
+        :param season: NFL season
+        :type season: int
+        :return: NFL week (ESPN scoring period)
+        :rtype: int
+        """
+        days_since = (date - _week_one(season)).days
+        return int(math.floor(days_since / 7.)) + 1
+
+    def week(self, season: Optional[int] = None) -> int:
+        """Get current NFL week (ESPN scoring period)
+
+        :param season: season to count weeks from (defaults to the
+                       current season)
+        :type season: Optional[int]
+        :return: NFL week, not capped (see `week_in_season`)
+        :rtype: int
+        """
+        now = self.now()
+        if season is None:
+            season = _season_of(now)
+        return self.week_in_season(now, season)
@@ -0,0 +1,127 @@
+import os
+import json
+import shutil
+from unittest import TestCase, mock
+from tempfile import TemporaryDirectory
+
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.registry import PlayerRegistry
+from espyn.aggregates import Aggregate, SeasonAggregates, period_rows
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+FILES = ("2020_1603206.json", "2020_1603206_sp10.json")
+
+
+class AggregateTests(TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        for fname in FILES:
+            shutil.copy(os.path.join(DATA_DIR, fname), self.tmp.name)
+        self.league = League(1603206, season=2020,
+                             cache=LocalCache(self.tmp.name),
+                             registry=PlayerRegistry())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected_points(self):
+        points = dict()
+        for m in self.league.get_matchups_by_number(10, boxscore=True):
+            for tw in m.loaded_team_weeks():
+                for pw in tw.slots:
+                    pid = pw.player.player_id
+                    points[pid] = points.get(pid, 0.) + (pw.points or 0.)
+        return points
+
+    def test_aggregate(self):
+        agg = Aggregate()
+        self.assertIsNone(agg.mean_points)
+        self.assertIsNone(agg.mean_projection_error)
+        agg._add((1, 2, "RB", "RB", 10., 12.))
+        agg._add((1, 2, "RB", "FLEX", 20., None))
+        agg._add((1, 2, "RB", "Bench", None, 5.))
+        other = Aggregate()
+        other._add((1, 2, "RB", "RB", 6., 3.))
+        agg._merge(other)
+        self.assertEqual(agg.weeks, 3)
+        self.assertEqual(agg.points, 36.)
+        self.assertEqual(agg.points_by_slot, {"RB": 16., "FLEX": 20.})
+        self.assertEqual(agg.mean_points, 12.)
+        self.assertEqual(agg.mean_projection_error, -0.5)
+        self.assertEqual(agg.to_json()["projected_points"], 15.)
+
+    def test_refresh(self):
+        aggs = self.league.aggregates(refresh=False)
+        self.assertIs(self.league.aggregates(refresh=False), aggs)
+        self.assertEqual(aggs.refresh([10]), [10])
+        self.assertEqual(aggs.scoring_periods, [10])
+        self.assertEqual(aggs.refresh([10]), [])
+        expected = self.expected_points()
+        self.assertEqual(set(aggs.by_player), set(expected))
+        for pid, points in expected.items():
+            self.assertAlmostEqual(aggs.by_player[pid].points, points)
+        self.assertAlmostEqual(aggs.by_player[4047365].points, 25.6)
+        self.assertEqual(len(aggs.by_team), len(self.league.teams))
+        self.assertIn("RB", aggs.by_position)
+        total = sum(a.points for a in aggs.by_team.values())
+        self.assertAlmostEqual(
+            sum(a.points for a in aggs.by_position.values()), total)
+        self.assertIn("by_position", aggs.to_json())
+
+    def test_persisted(self):
+        aggs = SeasonAggregates(self.league)
+        aggs.refresh([10])
+        path = os.path.join(self.tmp.name, "2020_1603206_aggregates.json")
+        self.assertEqual(aggs.path, path)
+        self.assertTrue(os.path.exists(path))
+        with mock.patch.object(self.league, "_get_matchup_data") as get:
+            loaded = SeasonAggregates(self.league)
+            self.assertEqual(loaded.refresh([10]), [])
+            get.assert_not_called()
+        self.assertEqual(loaded.by_player[4047365].to_json(),
+                         aggs.by_player[4047365].to_json())
+        loaded.invalidate(10)
+        self.assertEqual(loaded.scoring_periods, [])
+        self.assertEqual(loaded.by_player, {})
+        self.assertEqual(SeasonAggregates(self.league).scoring_periods, [])
+
+    def test_changed_payload(self):
+        aggs = SeasonAggregates(self.league)
+        aggs.refresh([10])
+        before = {k: v.points for k, v in aggs.by_team.items()}
+        fpath = os.path.join(self.tmp.name, "2020_1603206_sp10.json")
+        with open(fpath) as f:
+            data = json.load(f)
+        # a stat correction for one player-week
+        entry = data["schedule"][46]["home"][
+            "rosterForCurrentScoringPeriod"]["entries"][2]
+        entry["playerPoolEntry"]["appliedStatTotal"] += 10
+        team_id = data["schedule"][46]["home"]["teamId"]
+        with open(fpath, "w") as f:
+            json.dump(data, f)
+        with mock.patch("espyn.aggregates.period_rows",
+                        wraps=period_rows) as rows:
+            self.assertEqual(aggs.refresh([10]), [10])
+            rows.assert_called_once()
+        self.assertAlmostEqual(aggs.by_player[4047365].points, 35.6)
+        for key, points in before.items():
+            expected = points + 10 if key == team_id else points
+            self.assertAlmostEqual(aggs.by_team[key].points, expected)
+
+    def test_without_fingerprints(self):
+        league = mock.Mock(league_id=1, season=2020, cache=None)
+        league.scoring_period_to_matchup_num.return_value = 10
+        with open(os.path.join(DATA_DIR, FILES[1])) as f:
+            league._get_matchup_data.return_value = \
+                json.load(f)["schedule"][-6:]
+        league.registry = PlayerRegistry()
+        aggs = SeasonAggregates(league)
+        self.assertIsNone(aggs.path)
+        self.assertEqual(aggs.refresh([10]), [10])
+        self.assertEqual(aggs.refresh([10]), [])
+        aggs.invalidate()
+        self.assertEqual(aggs.refresh([10]), [10])
+        self.assertEqual(league._get_matchup_data.call_count, 2)
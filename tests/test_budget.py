@@ -0,0 +1,111 @@
+import gc
+import pickle
+from unittest import TestCase
+
+from espyn import metrics
+from espyn.budget import BoxscoreBudget, team_week_size
+from espyn.league import League
+from espyn.synthetic import SyntheticCache
+
+
+class BudgetTests(TestCase):
+
+    def setUp(self):
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    def new_league(self, budget, league_id=1):
+        return League(league_id, 2020, cache=SyntheticCache(
+            num_teams=4, roster_size=10), budget=budget)
+
+    def matchup_size(self, league, num):
+        return sum(team_week_size(tw) for m in
+                   league.get_matchups_by_number(num)
+                   for tw in m.loaded_team_weeks())
+
+    def test_eviction(self):
+        budget = BoxscoreBudget(60)
+        league = self.new_league(budget)
+        league.load_boxscores([1])
+        size = self.matchup_size(league, 1)
+        self.assertEqual(budget.resident, size)
+        self.assertLess(size, 60)
+        self.assertGreater(2 * size, 60)
+        league.load_boxscores([2])
+        # matchup 1 evicted, to be reloaded on demand
+        self.assertEqual(budget.resident, size)
+        self.assertEqual(budget.evictions, 1)
+        self.assertEqual(len(budget), 1)
+        self.assertFalse(any(m.boxscore_loaded
+                             for m in league.get_matchups_by_number(1)))
+        self.assertTrue(all(m.boxscore_loaded for m in
+                            league.get_matchups_by_number(1, True)))
+        self.assertFalse(league.get_matchup(2, 1).boxscore_loaded)
+        self.assertEqual(budget.evictions, 2)
+        self.assertEqual(metrics.BOXSCORE_EVICTIONS.value(), 2)
+        self.assertEqual(metrics.BOXSCORES_RESIDENT.value(), size)
+        # derived indexes only see resident boxscores
+        self.assertEqual({r.matchup_num for r in league.query()}, {1})
+
+    def test_touch(self):
+        budget = BoxscoreBudget(100)
+        league = self.new_league(budget)
+        league.load_boxscores([1, 2])
+        league.get_matchup(1, 1, boxscore=True)  # 2 is now least recent
+        league.load_boxscores([3])
+        self.assertTrue(league.get_matchup(1, 1).boxscore_loaded)
+        self.assertFalse(league.get_matchup(2, 1).boxscore_loaded)
+
+    def test_discard(self):
+        budget = BoxscoreBudget(100)
+        league = self.new_league(budget)
+        league.load_boxscores([1])
+        self.assertEqual(budget.resident, 40)
+        league._unload_boxscores(1)
+        self.assertFalse(league.get_matchup(1, 1).boxscore_loaded)
+        self.assertEqual((len(budget), budget.resident), (0, 0))
+        # untracked or other leagues' entries are ignored
+        budget.discard(league, 1)
+        budget.discard(self.new_league(budget), 2)
+        self.assertEqual(budget.evictions, 0)
+
+    def test_shared_budget(self):
+        budget = BoxscoreBudget(60)
+        first, second = self.new_league(budget), self.new_league(budget, 2)
+        first.load_boxscores([1])
+        second.load_boxscores([1])
+        self.assertFalse(first.get_matchup(1, 1).boxscore_loaded)
+        self.assertTrue(second.get_matchup(1, 1).boxscore_loaded)
+        # entries of collected leagues are dropped
+        second.load_boxscores([2])
+        del first, second
+        gc.collect()
+        self.new_league(budget, 3).load_boxscores([1])
+        self.assertEqual(len(budget), 1)
+
+    def test_oversized_matchup_kept(self):
+        budget = BoxscoreBudget(0)
+        league = self.new_league(budget)
+        self.assertTrue(league.get_matchup(1, 1, boxscore=True)
+                        .boxscore_loaded)
+        self.assertGreater(budget.resident, 0)
+        with self.assertRaises(ValueError):
+            BoxscoreBudget(-1)
+
+    def test_full_season(self):
+        expected = self.new_league(None).optimal_lineups()
+        league = self.new_league(BoxscoreBudget(100))
+        lineups = league.optimal_lineups()
+        self.assertGreater(league.budget.evictions, 0)
+        self.assertEqual(len(lineups), len(expected))
+        self.assertEqual([lu.optimal_points for lu in lineups],
+                         [lu.optimal_points for lu in expected])
+        with self.assertLogs(level="WARNING"):
+            league.load_boxscores()
+
+    def test_pickle(self):
+        league = self.new_league(BoxscoreBudget(100))
+        league.load_boxscores([1])
+        copy = pickle.loads(pickle.dumps(league))
+        self.assertIsNone(copy.budget)
+        self.assertTrue(copy.get_matchup(1, 1).boxscore_loaded)
@@ -3,7 +3,12 @@ import json
 from unittest import TestCase, mock
 from tempfile import TemporaryDirectory
 
-from espyn.caches import Cache, LocalCache, cache_operation
+from espyn.caches import (Cache, LocalCache, cache_operation,
+                          select_matchups)
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
 
 
 class CacheTests(TestCase):
@@ -26,6 +31,7 @@ class CacheTests(TestCase):
             cache.save(None)
         cache.set_league(self.mock_league)
         self.assertIs(cache.league, self.mock_league)
+        self.assertIsNone(cache.fingerprint(1))
 
     def test_cache_load(self):
         cache = LocalCache(self.tmp.name)
@@ -66,6 +72,104 @@ class CacheTests(TestCase):
         with open(expected_fname) as f:
             self.assertEqual(self.data, json.load(f))
 
+    def test_base_load_matchups(self):
+        cache = Cache()
+        cache.load = mock.Mock(return_value=None)
+        self.assertIsNone(cache.load_matchups(10, 10))
+        data = {"schedule": [{"matchupPeriodId": 1}, {"matchupPeriodId": 2}]}
+        cache.load.return_value = data
+        self.assertEqual(cache.load_matchups(2, 2), [{"matchupPeriodId": 2}])
+        cache.load.assert_called_with(2)
+
+    def test_indexed_load_matchups(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        expected = select_matchups(data, 10)
+        cache = LocalCache(self.tmp.name)
+        cache.set_league(self.mock_league)
+        self.assertIsNone(cache.load_matchups(10, 10))
+        self.assertIsNone(cache.fingerprint(10))
+        cache.save(data, 10)
+        fpath = os.path.join(self.tmp.name, "2019_9999_sp10.json")
+        self.assertTrue(os.path.exists(fpath + ".idx"))
+        self.assertEqual(cache.fingerprint(10)[1], os.path.getsize(fpath))
+        # full file is still plain JSON with the same content
+        self.assertEqual(cache.load(10), data)
+        with mock.patch.object(cache, "load") as load:
+            self.assertEqual(cache.load_matchups(10, 10), expected)
+            self.assertEqual(cache.load_matchups(10, 99), [])
+            load.assert_not_called()
+        # stale index is ignored in favor of the full file
+        with open(fpath, "w") as f:
+            json.dump(data, f)
+        self.assertEqual(cache.load_matchups(10, 10), expected)
+        # and one whose data file was rewritten with the same size
+        cache.save(data, 10)
+        self.assertEqual(cache.load_matchups(10, 10), expected)
+        with open(fpath, "rb") as f:
+            raw = f.read()
+        with open(fpath + ".idx") as f:
+            start, end = json.load(f)["matchups"]["10"][0]
+        with open(fpath, "wb") as f:
+            f.write(b" " * (end - start) + raw[:start] + raw[end:])
+        os.utime(fpath, ns=(1, 1))
+        with mock.patch.object(cache, "load", return_value=None) as load:
+            self.assertIsNone(cache.load_matchups(10, 10))
+            load.assert_called_once_with(10)
+        cache.save(data, 10)
+        # so is a corrupt one
+        with open(fpath + ".idx", "w") as f:
+            f.write("{")
+        self.assertEqual(cache.load_matchups(10, 10), expected)
+        cache.ignore_cache = True
+        self.assertIsNone(cache.load_matchups(10, 10))
+
+    def test_shared_stats(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        with open(TEST_FILE) as f:
+            original = json.load(f)
+        expected = select_matchups(original, 10)
+        other = self.get_mock_league(league_id=8888)
+        caches = []
+        for league in (self.mock_league, other):
+            cache = LocalCache(self.tmp.name, shared_stats=True)
+            cache.set_league(league)
+            cache.save(data, 10)
+            caches.append(cache)
+        # saved data are not modified
+        self.assertEqual(data, original)
+        stats_path = os.path.join(self.tmp.name, "2019_stats_sp10.json")
+        with open(stats_path) as f:
+            lines = json.load(f)
+        self.assertEqual(len(lines[str(4047365)]), 29)
+        plain = LocalCache(self.tmp.name)
+        plain.set_league(self.get_mock_league(league_id=7777))
+        plain.save(data, 10)
+        sizes = [os.path.getsize(os.path.join(self.tmp.name, i))
+                 for i in ("2019_9999_sp10.json", "2019_7777_sp10.json")]
+        self.assertLess(sizes[0], sizes[1])
+        for cache in caches:
+            self.assertEqual(cache.load(10), original)
+            self.assertEqual(cache.load_matchups(10, 10), expected)
+        # plain caches read shared stats too
+        cache = LocalCache(self.tmp.name)
+        cache.set_league(other)
+        self.assertEqual(cache.load_matchups(10, 10), expected)
+        # corrected stat lines are rewritten
+        corrected = dict(lines[str(4047365)], **{"24": 1.})
+        caches[0]._save_stats(10, {str(4047365): corrected})
+        with open(stats_path) as f:
+            lines = json.load(f)
+        self.assertEqual(lines[str(4047365)], corrected)
+        # a missing stat line is a cache miss
+        del lines[str(4047365)]
+        with open(stats_path, "w") as f:
+            json.dump(lines, f)
+        self.assertIsNone(cache.load(10))
+        self.assertIsNone(cache.load_matchups(10, 10))
+        self.assertEqual(cache.load_matchups(10, 99), [])
+
     def test_invalid_cache(self):
         not_real_dir = "/tmp/laskdjflaskdfla"
         self.assertFalse(os.path.exists(not_real_dir))
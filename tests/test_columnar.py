@@ -0,0 +1,104 @@
+import os
+import csv
+import json
+import math
+from array import array
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock, skipIf
+
+from espyn import columnar
+from espyn.columnar import (ColumnTable, build_tables, export_tables,
+                            stat_column_name, to_arrow, write_csv)
+from espyn.league import League
+from espyn.registry import PlayerRegistry
+from espyn.synthetic import SyntheticCache
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
+
+
+class ColumnarTests(TestCase):
+
+    def setUp(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        cache = mock.Mock()
+        cache.load.return_value = data
+        self.league = League(1603206, season=2020, cache=cache)
+        self.league.load_boxscores([10])
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_column_table(self):
+        table = ColumnTable("t", (("a", "i"), ("b", "s")))
+        table.append((1, "x"))
+        table.append((2, None))
+        table.add_column("c", "d")
+        self.assertIsInstance(table.columns["a"], array)
+        self.assertEqual(list(table.iter_rows()), [(1, "x", 0.), (2, None, 0.)])
+        self.assertEqual(table.column_names, ["a", "b", "c"])
+        self.assertIn("2 rows x 3 columns", str(table))
+        with self.assertRaises(ValueError):
+            table.add_column("d", "i", array("q", [1]))
+
+    def test_build_tables(self):
+        tables = build_tables(self.league)
+        self.assertEqual(tables["teams"].num_rows, 10)
+        self.assertEqual(tables["matchups"].num_rows, 70)
+        self.assertEqual(tables["team_weeks"].num_rows, 10)
+        pweeks = tables["player_weeks"]
+        self.assertEqual(pweeks.num_rows, 159)
+        # every column has one value per row
+        for col in pweeks.columns.values():
+            self.assertEqual(len(col), pweeks.num_rows)
+        rows = [dict(zip(pweeks.column_names, r)) for r in pweeks.iter_rows()]
+        jacobs = [r for r in rows if r["player_id"] == 4047365][0]
+        self.assertEqual(jacobs["stat_rush_yds"], 112)
+        self.assertEqual(jacobs["stat_pass_yds"], 0)
+        self.assertEqual(stat_column_name(213), "stat_213")
+        # the fixture has no byes, so every matchup has an away score
+        scores = tables["matchups"].columns["away_score"]
+        self.assertFalse(any(math.isnan(v) for v in scores))
+
+    def test_build_tables_byes(self):
+        league = League(3, 2020, cache=SyntheticCache(num_teams=5),
+                        registry=PlayerRegistry())
+        league.load_boxscores([1])
+        matchups = build_tables(league)["matchups"]
+        rows = [dict(zip(matchups.column_names, r))
+                for r in matchups.iter_rows()]
+        byes = [r for r in rows if r["is_bye"]]
+        # one of five teams is on a bye in each matchup number
+        self.assertEqual(sorted(r["matchup_num"] for r in byes),
+                         list(range(1, league.total_matchups + 1)))
+        for row in byes:
+            self.assertIsNone(row["away_team_id"])
+            self.assertTrue(math.isnan(row["away_score"]))
+        self.assertFalse(any(math.isnan(r["away_score"])
+                             for r in rows if not r["is_bye"]))
+
+    def test_write_csv(self):
+        paths = write_csv(build_tables([self.league]), self.tmp.name,
+                          chunk_size=7)
+        self.assertEqual(len(paths), 4)
+        with open(os.path.join(self.tmp.name, "player_weeks.csv")) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 159)
+        self.assertEqual(rows[0]["league_id"], "1603206")
+
+    def test_export_without_pyarrow(self):
+        with mock.patch.object(columnar, "pa", None):
+            paths = export_tables(self.league, self.tmp.name)
+            self.assertTrue(all(p.endswith(".csv") for p in paths))
+            with self.assertRaises(ImportError):
+                to_arrow(build_tables(self.league))
+
+    @skipIf(columnar.pa is None, "pyarrow not installed")
+    def test_arrow(self):
+        tables = to_arrow(build_tables(self.league))
+        self.assertEqual(tables["player_weeks"].num_rows, 159)
+        paths = export_tables(self.league, self.tmp.name)
+        self.assertTrue(all(p.endswith(".parquet") for p in paths))
@@ -0,0 +1,73 @@
+import os
+import json
+from io import BytesIO
+from collections import Counter
+from unittest import TestCase, mock
+
+from espyn.league import League
+from espyn.export import iter_records, iter_ndjson, write_ndjson
+from espyn.constants import SEASON_OVER
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        cache = mock.Mock()
+        cache.load.return_value = data
+        self.league = League(1603206, season=2020, cache=cache)
+        self.league.current_matchup_num = mock.Mock(return_value=SEASON_OVER)
+
+    def test_records(self):
+        counts = Counter(r["type"] for r in iter_records(self.league))
+        self.assertEqual(counts, {"league": 1, "team": 10, "matchup": 70})
+        league_rec, team_rec = list(iter_records(self.league))[:2]
+        self.assertEqual(league_rec["league_id"], 1603206)
+        self.assertEqual(team_rec["season"], 2020)
+        self.assertNotIn("scores", team_rec)
+
+    def test_boxscore_records(self):
+        records = list(iter_records([self.league], boxscores=True))
+        counts = Counter(r["type"] for r in records)
+        # static data only has boxscores for matchup 10
+        self.assertEqual(counts["team_week"], 10)
+        self.assertEqual(counts["player_week"], 159)
+        matchup = [r for r in records if r["type"] == "matchup"][0]
+        self.assertNotIn("home_data", matchup)
+        pweek = [r for r in records if r["type"] == "player_week"][0]
+        for key in ("league_id", "season", "matchup_num", "team_id",
+                    "scoring_period", "player", "points"):
+            self.assertIn(key, pweek)
+
+    def test_boxscores_unloaded(self):
+        matchups = self.league.get_matchups_by_number(10)
+        records = iter_records(self.league, boxscores=True)
+        for record in records:
+            if record["type"] == "player_week":
+                self.assertTrue(all(m.boxscore_loaded for m in matchups))
+                break
+        # unloaded when the generator is closed early, too
+        records.close()
+        self.assertFalse(any(m.boxscore_loaded for m in matchups))
+        for _ in iter_records(self.league, boxscores=True):
+            pass
+        self.assertFalse(any(m.boxscore_loaded for m in matchups))
+        # boxscores loaded before the export stay loaded
+        self.league.get_matchups_by_number(10, boxscore=True)
+        list(iter_records(self.league, boxscores=True))
+        self.assertTrue(all(m.boxscore_loaded for m in matchups))
+
+    def test_ndjson(self):
+        lines = list(iter_ndjson(self.league))
+        self.assertTrue(all(line.endswith(b"\n") for line in lines))
+        self.assertEqual(json.loads(lines[0])["type"], "league")
+        buf = BytesIO()
+        leagues = (self.league for _ in range(2))
+        count = write_ndjson(leagues, buf)
+        self.assertEqual(count, 2 * len(lines))
+        self.assertEqual(buf.getvalue(), b"".join(lines) * 2)
@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import subprocess
+from types import SimpleNamespace
+from unittest import TestCase, mock, skipIf
+
+import espyn
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def loaded_modules(statement):
+    # modules imported by statement in a fresh interpreter
+    code = "import sys, json; {}; print(json.dumps(list(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code.format(statement)],
+                         cwd=ROOT, check=True, capture_output=True,
+                         text=True).stdout
+    return set(json.loads(out))
+
+
+class InitTests(TestCase):
+
+    def test_lazy_imports(self):
+        modules = loaded_modules("import espyn")
+        self.assertNotIn("espyn.league", modules)
+        self.assertNotIn("pkg_resources", modules)
+        modules = loaded_modules("from espyn import League")
+        self.assertIn("espyn.league", modules)
+        self.assertNotIn("urllib.request", modules)
+
+    def test_star_import(self):
+        # also from a source checkout without installed metadata
+        modules = loaded_modules("from espyn import *")
+        self.assertIn("espyn.league", modules)
+
+    def test_attributes(self):
+        from espyn.team import Team
+        self.assertIs(espyn.Team, Team)
+        self.assertIn("League", dir(espyn))
+        with self.assertRaises(AttributeError):
+            espyn.NotAClass
+
+    @skipIf(sys.version_info < (3, 8), "importlib.metadata is 3.8+")
+    def test_version(self):
+        espyn.__dict__.pop("__version__", None)
+        with mock.patch("importlib.metadata.version", return_value="1.2.3"):
+            self.assertEqual(espyn.__version__, "1.2.3")
+        del espyn.__version__
+
+    def test_version_fallbacks(self):
+        backport = SimpleNamespace(version=lambda name: "1.2.4",
+                                   PackageNotFoundError=LookupError)
+        modules = {"importlib.metadata": None, "importlib_metadata": backport}
+        with mock.patch.dict(sys.modules, modules):
+            self.assertEqual(espyn._get_version(), "1.2.4")
+        dist = SimpleNamespace(version="1.2.5")
+        resources = SimpleNamespace(get_distribution=lambda name: dist,
+                                    DistributionNotFound=LookupError)
+        modules.update(importlib_metadata=None, pkg_resources=resources)
+        with mock.patch.dict(sys.modules, modules):
+            self.assertEqual(espyn._get_version(), "1.2.5")
+        modules["pkg_resources"] = None
+        with mock.patch.dict(sys.modules, modules):
+            with self.assertRaises(AttributeError):
+                espyn._get_version()
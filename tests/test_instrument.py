@@ -0,0 +1,125 @@
+import os
+import logging
+from contextlib import contextmanager
+from unittest import TestCase, mock
+
+from espyn import instrument
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.registry import PlayerRegistry
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class Recorder(instrument.Observer):
+
+    def __init__(self):
+        self.started, self.ended = [], []
+
+    def on_start(self, span):
+        self.started.append(span.name)
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+
+class InstrumentTests(TestCase):
+
+    def setUp(self):
+        self.recorder = Recorder()
+        instrument.add_observer(self.recorder)
+
+    def tearDown(self):
+        if self.recorder in instrument._observers:
+            instrument.remove_observer(self.recorder)
+
+    def test_disabled(self):
+        instrument.remove_observer(self.recorder)
+        self.assertFalse(instrument.enabled())
+        with instrument.span("x", a=1) as span:
+            span.set(b=2)
+        self.assertIs(span, instrument._NULL_SPAN)
+        with self.assertRaises(ValueError):
+            instrument.remove_observer(self.recorder)
+
+    def test_span(self):
+        with self.assertRaises(KeyError):
+            with instrument.span("outer", a=1):
+                with instrument.span("inner") as inner:
+                    inner.set(b=2)
+                raise KeyError()
+        self.assertEqual(self.recorder.started, ["outer", "inner"])
+        inner, outer = self.recorder.ended
+        self.assertEqual(inner.attributes, {"b": 2})
+        self.assertEqual(outer.attributes, {"a": 1, "error": "KeyError"})
+        self.assertGreaterEqual(outer.duration, inner.duration)
+
+    def test_league_spans(self):
+        league = League(1603206, 2020, cache=LocalCache(DATA_DIR),
+                        registry=PlayerRegistry())
+        league.get_matchup(10, 1, boxscore=True).home_data[0].slots
+        spans = {}
+        for span in self.recorder.ended:
+            spans.setdefault(span.name, []).append(span)
+        load = spans["cache.load"][0]
+        self.assertEqual(load.attributes["league_id"], 1603206)
+        self.assertEqual(load.attributes["season"], 2020)
+        self.assertIsNone(load.attributes["scoring_period"])
+        self.assertTrue(load.attributes["hit"])
+        self.assertEqual(load.attributes["cache"], "LocalCache")
+        self.assertGreater(spans["decode"][0].attributes["bytes"], 0)
+        construct = spans["league.construct"][0]
+        self.assertEqual(construct.attributes["teams"], 10)
+        self.assertEqual(spans["boxscores.load"][0].attributes["matchup_num"],
+                         10)
+        self.assertIn("cache.load_matchups", spans)
+        self.assertEqual(len(spans["team_week.parse"]), 1)
+
+    def test_fetch_spans(self):
+        league = League(1603206, 2020, cache=LocalCache(DATA_DIR))
+        stream = mock.Mock()
+        stream.read.return_value = b'{"schedule": []}'
+        with mock.patch("urllib.request.urlopen", return_value=stream):
+            league.cache = None
+            league._get_scoring_period_data(3)
+        names = [i.name for i in self.recorder.ended]
+        self.assertEqual(names[-3:], ["http.request", "decode", "fetch"])
+        fetch = self.recorder.ended[-1]
+        self.assertEqual(fetch.attributes["scoring_period"], 3)
+        self.assertEqual(self.recorder.ended[-3].attributes["bytes"], 16)
+
+    def test_logging_observer(self):
+        instrument.remove_observer(self.recorder)
+        observer = instrument.LoggingObserver(level=logging.INFO)
+        instrument.add_observer(observer)
+        try:
+            with self.assertLogs("espyn", logging.INFO) as logs:
+                with instrument.span("x", a=1):
+                    pass
+        finally:
+            instrument.remove_observer(observer)
+        self.assertIn("x", logs.output[0])
+        self.assertIn("a=1", logs.output[0])
+
+    def test_tracer_observer(self):
+        tracer_spans = []
+
+        @contextmanager
+        def start_as_current_span(name, attributes=None):
+            span = mock.Mock()
+            tracer_spans.append((name, attributes, span))
+            yield span
+
+        tracer = mock.Mock(start_as_current_span=start_as_current_span)
+        observer = instrument.TracerObserver(tracer)
+        instrument.add_observer(observer)
+        try:
+            with instrument.span("fetch", league_id=1, scoring_period=None):
+                pass
+        finally:
+            instrument.remove_observer(observer)
+        name, attributes, span = tracer_spans[0]
+        self.assertEqual(name, "espyn.fetch")
+        self.assertEqual(attributes, {"league_id": 1})
+        span.set_attribute.assert_any_call("league_id", 1)
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from espyn import jsonlib
+
+
+class JsonlibTests(TestCase):
+
+    def setUp(self):
+        self.original = jsonlib.get_backend()
+        self.data = {"a": [1, 2.5, None, True], "b": {"c": "é"}}
+
+    def tearDown(self):
+        jsonlib.set_backend(self.original)
+
+    def test_backends_roundtrip(self):
+        backends = jsonlib.available_backends()
+        self.assertEqual(backends[-1], "json")
+        for name in backends:
+            self.assertEqual(jsonlib.set_backend(name), name)
+            self.assertEqual(jsonlib.get_backend(), name)
+            encoded = jsonlib.dumps(self.data)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(jsonlib.loads(encoded), self.data)
+            self.assertEqual(jsonlib.loads(encoded.decode()), self.data)
+
+    def test_default_backend(self):
+        self.assertEqual(jsonlib.set_backend(),
+                         jsonlib.available_backends()[0])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            jsonlib.set_backend("yaml")
@@ -1,13 +1,23 @@
 import os
 import json
+import datetime
+import time
+import pickle
+import threading
 import urllib.request
 from io import BytesIO
+from tempfile import TemporaryDirectory
 from unittest import TestCase, mock
 
 from espyn.league import League
 from espyn.team import Team
 from espyn.matchup import Matchup
 from espyn.caches import LocalCache
+from espyn.lineup import Lineup
+from espyn.constants import SEASON_OVER
+from espyn.utils import SeasonCalendar
+from espyn.registry import PlayerRegistry
+from espyn.player import Player
 
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
@@ -37,6 +47,7 @@ class LeagueTests(TestCase):
         self.assertEqual(league.total_matchups, 14)
         self.assertEqual(league.scoring_dict[42], 0.1)
         self.assertIsInstance(league.teams[0], Team)
+        self.assertIsNone(league._data)
         for phrase in ("League", "1603206", "2020", "The Ocho, Dos", "10"):
             self.assertIn(phrase, str(league))
 
@@ -66,6 +77,137 @@ class LeagueTests(TestCase):
         for m in matchups:
             self.assertTrue(m.boxscore_loaded)
 
+    def test_league_calendar(self):
+        cache = self.get_mock_cache()
+        as_of = datetime.date(2020, 11, 15)
+        league = League(1603206, season=2020, cache=cache, as_of=as_of)
+        self.assertEqual(league.current_matchup_num(), 10)
+        self.assertEqual(len(league.all_scores()), 90)
+        self.assertEqual(len(league.get_team_by_id(7).scores()), 9)
+        # before and after the league's season
+        league.calendar = SeasonCalendar(datetime.date(2020, 8, 1))
+        self.assertEqual(league.current_matchup_num(), 1)
+        self.assertEqual(league.all_scores(), [])
+        league.calendar = SeasonCalendar(datetime.date(2022, 11, 15))
+        self.assertEqual(league.current_matchup_num(), SEASON_OVER)
+        # default season follows the calendar
+        league = League(1603206, cache=cache, as_of=as_of)
+        self.assertEqual(league.season, 2020)
+        with self.assertRaises(ValueError):
+            League(1603206, cache=cache, as_of=as_of,
+                   calendar=SeasonCalendar())
+
+    def test_league_players(self):
+        cache = self.get_mock_cache()
+        registry = PlayerRegistry()
+        league = League(1603206, season=2020, cache=cache, registry=registry)
+        self.assertIs(league.registry, registry)
+        self.assertEqual(league.players, {})
+        league.get_matchups_by_number(10, boxscore=True)
+        self.assertEqual(len(league.players), len(registry))
+        player = league.players[4047365]
+        self.assertIsInstance(player, Player)
+        self.assertEqual(player.full_name, "Josh Jacobs")
+        weeks = league.player_weeks(4047365)
+        self.assertEqual(list(weeks), [10])
+        self.assertIs(weeks[10].player, player)
+        self.assertEqual(league.player_weeks(-1), {})
+        # a second league reuses the interned players
+        other = League(1603206, season=2020, cache=cache, registry=registry)
+        other.get_matchups_by_number(10, boxscore=True)
+        self.assertIs(other.players[4047365], player)
+
+    def test_league_query(self):
+        cache = self.get_mock_cache()
+        league = League(1603206, season=2020, cache=cache)
+        self.assertEqual(league.query(), [])
+        self.assertEqual(league.load_boxscores([10]), [10])
+        rows = league.query(position="RB", min_points=20)
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(r.scoring_period == 10 for r in rows))
+        self.assertEqual(len(league.query(slot="FLEX", team_id=1)), 1)
+
+    def get_slow_cache(self, error=None):
+        # boxscore loads block until released, failing with `error`
+        release = threading.Event()
+
+        def load(scoring_period=None):
+            if scoring_period is not None:
+                release.wait(5)
+                if error is not None:
+                    raise error
+            return self.league_data
+        return self.get_mock_cache(**{"load.side_effect": load}), release
+
+    def run_threads(self, target, num=4):
+        results, threads = [], []
+
+        def run():
+            try:
+                results.append(target())
+            except Exception as e:
+                results.append(e)
+        for _ in range(num):
+            threads.append(threading.Thread(target=run))
+            threads[-1].start()
+        return threads, results
+
+    def test_concurrent_boxscores(self):
+        cache, release = self.get_slow_cache()
+        league = League(1603206, season=2020, cache=cache)
+        threads, results = self.run_threads(
+            lambda: league.get_matchup(10, 7, boxscore=True))
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+        # one load for the scoring period, shared by all callers
+        self.assertEqual(cache.load.call_args_list.count(mock.call(10)), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(m is results[0] for m in results))
+        self.assertTrue(results[0].boxscore_loaded)
+        self.assertEqual(league._inflight, {})
+        self.assertEqual(len(league.query(scoring_period=10)),
+                         len(league.query()))
+
+    def test_concurrent_boxscore_error(self):
+        cache, release = self.get_slow_cache(error=RuntimeError("down"))
+        league = League(1603206, season=2020, cache=cache)
+        threads, results = self.run_threads(
+            lambda: league.get_matchup(10, 7, boxscore=True))
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+        # waiters see the leader's exception
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(league._inflight, {})
+        # later calls try again
+        cache.load.side_effect = None
+        self.assertTrue(league.get_matchup(10, 7, boxscore=True)
+                        .boxscore_loaded)
+
+    def test_league_pickle(self):
+        league = League(1603206, season=2020, cache=LocalCache(DATA_DIR))
+        league.load_boxscores([10])
+        copy = pickle.loads(pickle.dumps(league))
+        self.assertEqual(copy._inflight, {})
+        self.assertTrue(copy.get_matchup(10, 7).boxscore_loaded)
+        self.assertEqual(len(copy.load_boxscores([10])), 1)
+
+    def test_local_cache_boxscores(self):
+        with TemporaryDirectory() as tmp:
+            cache = LocalCache(tmp)
+            cache.set_league(mock.Mock(season=2020, league_id=1603206))
+            cache.save(self.league_data)
+            cache.save(self.league_data, 10)
+            league = League(1603206, season=2020, cache=LocalCache(tmp))
+            with mock.patch.object(league, "_get_scoring_period_data") as get:
+                matchups = league.get_matchups_by_number(10, boxscore=True)
+                get.assert_not_called()
+            self.assertTrue(all(m.boxscore_loaded for m in matchups))
+
     def test_uncached_league(self):
         def get_stream():
             return BytesIO(json.dumps(self.league_data).encode())
@@ -86,6 +228,19 @@ class LeagueTests(TestCase):
         with self.assertRaises(ValueError):
             League(1603206, season=2020)
 
+    def test_optimal_lineups(self):
+        cache = self.get_mock_cache()
+        league = League(1603206, season=2020, cache=cache)
+        self.assertEqual(league.lineup_slot_counts[23], 1)
+        league.current_matchup_num = mock.Mock(return_value=SEASON_OVER)
+        # static data only has boxscores for matchup 10
+        lineups = league.optimal_lineups()
+        self.assertEqual(len(lineups), 10)
+        self.assertIsInstance(lineups[0], Lineup)
+        for lineup in lineups:
+            self.assertEqual(lineup.scoring_period, 10)
+            self.assertGreaterEqual(lineup.bench_points, 0)
+        self.assertEqual(len(league.optimal_lineups(False)), 10)
 
     def test_league_json(self):
         cache = self.get_mock_cache()
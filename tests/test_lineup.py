@@ -0,0 +1,80 @@
+import os
+import json
+from unittest import TestCase
+
+from espyn.lineup import Lineup, LineupOptimizer, _min_cost_assignment
+from espyn.team_week import TeamWeek
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
+
+
+class LineupTests(TestCase):
+
+    def setUp(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        slot_counts = data["settings"]["rosterSettings"]["lineupSlotCounts"]
+        self.slot_counts = {int(k): v for k, v in slot_counts.items()}
+        self.data = data
+        self.home = TeamWeek(data["schedule"][46]["home"], 10)
+        self.away = TeamWeek(data["schedule"][46]["away"], 10)
+
+    def test_assignment(self):
+        cost = [[4, 1, 3], [2, 0, 5]]
+        self.assertEqual(_min_cost_assignment(cost), [1, 0])
+        self.assertEqual(_min_cost_assignment([]), [])
+
+    def test_optimal_lineup(self):
+        optimizer = LineupOptimizer(self.slot_counts)
+        lineup = optimizer.optimize(self.home)
+        self.assertIsInstance(lineup, Lineup)
+        self.assertEqual(lineup.team_id, 1)
+        self.assertEqual(lineup.scoring_period, 10)
+        self.assertEqual(len(lineup.starters), 9)
+        self.assertAlmostEqual(lineup.actual_points, 84.2)
+        self.assertAlmostEqual(lineup.optimal_points, 96.0)
+        self.assertAlmostEqual(lineup.bench_points, 11.8)
+        self.assertAlmostEqual(lineup.efficiency, 84.2 / 96.0)
+        names = {pw.player.full_name for _, pw in lineup.starters}
+        # bench players are lineup candidates
+        self.assertIn("Boston Scott", names)
+        self.assertNotIn("Patrick Mahomes", names)
+        flex = [pw for slot_id, pw in lineup.starters if slot_id == 23]
+        self.assertEqual(flex[0].player.full_name, "Miles Sanders")
+        self.assertIn("96.0", str(lineup))
+
+    def test_optimal_lineup_never_below_actual(self):
+        optimizer = LineupOptimizer(self.slot_counts)
+        lineup = optimizer.optimize(self.away)
+        self.assertGreaterEqual(lineup.optimal_points, lineup.actual_points)
+        self.assertGreaterEqual(lineup.bench_points, 0)
+
+    def test_injured_reserve_not_started(self):
+        home = self.data["schedule"][46]["home"]
+        entries = home["rosterForCurrentScoringPeriod"]["entries"]
+        injured = [e for e in entries if e["lineupSlotId"] == 21][0]
+        injured["playerPoolEntry"]["appliedStatTotal"] = 50.
+        lineup = LineupOptimizer(self.slot_counts).optimize(
+            TeamWeek(home, 10))
+        names = {pw.player.full_name for _, pw in lineup.starters}
+        self.assertNotIn("Kenyan Drake", names)
+        self.assertAlmostEqual(lineup.optimal_points, 96.0)
+
+    def test_unfillable_slot(self):
+        # no punters on roster, so the slot stays empty
+        optimizer = LineupOptimizer({18: 1, 17: 1, 20: 7})
+        self.assertEqual(optimizer.slot_counts, {17: 1, 18: 1})
+        lineup = optimizer.optimize(self.home)
+        self.assertEqual(dict(lineup.starters)[18], None)
+        self.assertAlmostEqual(lineup.optimal_points, 15.0)
+
+    def test_lineup_json(self):
+        lineup = LineupOptimizer(self.slot_counts).optimize(self.home)
+        data = lineup.to_json()
+        keys = ("team_id", "scoring_period", "starters", "optimal_points",
+                "actual_points", "bench_points", "efficiency")
+        for key in keys:
+            self.assertIn(key, data)
+        self.assertEqual(data["starters"][0]["slot"], "QB")
@@ -48,6 +48,13 @@ class MatchupTests(TestCase):
         self.assertIn(84.2, ind_scores)
         self.assertIn(105.0, ind_scores)
 
+    def test_matchup_raw_data(self):
+        matchup = Matchup(self.matchup_data, self.mock_league)
+        self.assertIsNone(matchup._data)
+        self.assertFalse(hasattr(matchup, "__dict__"))
+        matchup = Matchup(self.matchup_data, self.mock_league, keep_raw=True)
+        self.assertIs(matchup._data, self.matchup_data)
+
     def test_matchup_boxscore(self):
         matchup = Matchup(self.matchup_data, self.mock_league)
         self.assertFalse(matchup.boxscore_loaded)
@@ -58,6 +65,7 @@ class MatchupTests(TestCase):
         self.assertIsInstance(matchup.home_data[0], TeamWeek)
         self.assertIsInstance(matchup.away_data[0], TeamWeek)
         self.assertEqual(len(matchup.all_data), 2)
+        self.assertEqual(len(matchup.loaded_team_weeks()), 2)
         self.assertIsNone(matchup.error)
 
     def test_bye_matchup(self):
@@ -89,6 +97,12 @@ class MatchupTests(TestCase):
                 "home_data", "away_data")
         for key in keys:
             self.assertIn(key, data)
+        self.assertIsNone(data["home_data"])
+        self.assertNotIn("home_data", matchup.to_json(boxscores=False))
+        matchup.set_boxscore_data(self.matchup_data, 10)
+        data = matchup.to_json()
+        self.assertEqual(data["home_data"][0]["points"], 84.2)
+        self.assertEqual(len(data["away_data"][0]["slots"]), 14)
 
     def test_bye_matchup_json(self):
         # some fields should be excluded for byes
@@ -0,0 +1,127 @@
+import os
+import json
+import shutil
+import urllib.request
+from http.client import HTTPConnection
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from espyn import metrics
+from espyn.league import League
+from espyn.budget import BoxscoreBudget
+from espyn.caches import LocalCache
+from espyn.registry import PlayerRegistry
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    def test_counter_and_render(self):
+        counter = metrics.Counter("test_total", "Test counter.", ["kind"],
+                                  register=False)
+        counter.inc(kind="a")
+        counter.inc(2, kind='b"c')
+        self.assertEqual(counter.value(kind="a"), 1)
+        with self.assertRaises(ValueError):
+            counter.inc(other="a")
+        text = counter.render()
+        self.assertIn("# TYPE test_total counter", text)
+        self.assertIn('test_total{kind="a"} 1.0', text)
+        self.assertIn('test_total{kind="b\\"c"} 2.0', text)
+
+    def test_histogram(self):
+        hist = metrics.Histogram("test_seconds", "Test.", buckets=(1, 2),
+                                 register=False)
+        for value in (0.5, 1.5, 3):
+            hist.observe(value)
+        self.assertEqual(hist.value(), 3)
+        text = hist.render()
+        self.assertIn('test_seconds_bucket{le="1.0"} 1', text)
+        self.assertIn('test_seconds_bucket{le="2.0"} 2', text)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("test_seconds_sum 5.0", text)
+        self.assertIn("test_seconds_count 3", text)
+
+    def test_league_metrics(self):
+        league = League(1603206, 2020, cache=LocalCache(DATA_DIR),
+                        registry=PlayerRegistry())
+        league.get_matchups_by_number(10, boxscore=True)
+        self.assertEqual(metrics.LEAGUES_HYDRATED.value(), 1)
+        self.assertEqual(metrics.BOXSCORES_HYDRATED.value(), 5)
+        self.assertEqual(
+            metrics.CACHE_REQUESTS.value(cache="LocalCache", result="hit"), 2)
+        text = metrics.render_metrics()
+        self.assertIn('espyn_cache_hit_ratio{cache="LocalCache"} 1.0', text)
+        # no API responses yet, so no poll lag
+        self.assertNotIn("\nespyn_poll_lag_seconds ", text)
+
+    def test_cache_miss_recorded_once(self):
+        with open(os.path.join(DATA_DIR, "2020_1603206_sp10.json")) as f:
+            data = json.load(f)
+        with TemporaryDirectory() as tmp:
+            shutil.copy(os.path.join(DATA_DIR, "2020_1603206.json"), tmp)
+            league = League(1603206, 2020, cache=LocalCache(tmp),
+                            registry=PlayerRegistry())
+            with mock.patch.object(League, "_request_json",
+                                   return_value=data):
+                league.get_matchups_by_number(10, boxscore=True)
+        value = metrics.CACHE_REQUESTS.value
+        self.assertEqual(value(cache="LocalCache", result="hit"), 1)
+        self.assertEqual(value(cache="LocalCache", result="miss"), 1)
+
+    def test_failed_boxscores_not_counted(self):
+        with open(os.path.join(DATA_DIR, "2020_1603206_sp10.json")) as f:
+            data = json.load(f)
+        with TemporaryDirectory() as tmp:
+            shutil.copy(os.path.join(DATA_DIR, "2020_1603206.json"), tmp)
+            cache = LocalCache(tmp)
+            league = League(1603206, 2020, cache=cache,
+                            registry=PlayerRegistry(),
+                            budget=BoxscoreBudget(10 ** 6))
+            # matchup 9 entries in the period 10 payload have no rosters
+            cache.save(data, 9)
+            league.get_matchups_by_number(9, boxscore=True)
+        self.assertIsNotNone(league.get_matchup(9, 1).error)
+        self.assertEqual(metrics.BOXSCORES_HYDRATED.value(), 0)
+        self.assertEqual(len(league.budget), 0)
+        self.assertEqual(league.budget.resident, 0)
+
+    def test_request_metrics(self):
+        stream = mock.Mock()
+        stream.read.return_value = b"{}"
+        with mock.patch("urllib.request.urlopen", return_value=stream):
+            League._request_json("url")
+        stream.read.side_effect = urllib.request.URLError("")
+        with mock.patch("urllib.request.urlopen", return_value=stream):
+            League._request_json("url")
+        self.assertEqual(metrics.REQUESTS.value(outcome="ok"), 1)
+        self.assertEqual(metrics.REQUESTS.value(outcome="error"), 1)
+        self.assertEqual(metrics.REQUEST_SECONDS.value(), 2)
+        self.assertEqual(metrics.DOWNLOADED_BYTES.value(), 2)
+        text = metrics.render_metrics()
+        self.assertIn("\nespyn_poll_lag_seconds ", text)
+
+    def test_http_server(self):
+        server = metrics.start_http_server(0, "127.0.0.1")
+        try:
+            conn = HTTPConnection("127.0.0.1", server.server_address[1])
+            conn.request("GET", "/metrics")
+            res = conn.getresponse()
+            self.assertEqual(res.status, 200)
+            self.assertEqual(res.getheader("Content-Type"),
+                             metrics.CONTENT_TYPE)
+            self.assertIn(b"espyn_requests_total", res.read())
+            conn.request("GET", "/other")
+            res = conn.getresponse()
+            res.read()
+            self.assertEqual(res.status, 404)
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
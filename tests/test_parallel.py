@@ -0,0 +1,88 @@
+import os
+import json
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.parallel import _LeagueKey, _hydrate_period, hydrate_boxscores
+from espyn.registry import PlayerRegistry
+from espyn.team_week import TeamWeek
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
+
+
+class ParallelTests(TestCase):
+
+    def setUp(self):
+        with open(TEST_FILE) as f:
+            self.league_data = json.load(f)
+        self.tmp = TemporaryDirectory()
+        cache = LocalCache(self.tmp.name)
+        cache.set_league(mock.Mock(season=2020, league_id=1603206))
+        cache.save(self.league_data)
+        cache.save(self.league_data, 10)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hydrate_boxscores(self):
+        registry = PlayerRegistry()
+        league = League(1603206, season=2020,
+                        cache=LocalCache(self.tmp.name), registry=registry)
+        self.assertEqual(hydrate_boxscores(league, [10], max_workers=2), [10])
+        matchups = league.get_matchups_by_number(10)
+        self.assertTrue(all(m.boxscore_loaded for m in matchups))
+        tw = league.get_matchup(10, 1).home_data[0]
+        self.assertIsInstance(tw, TeamWeek)
+        self.assertAlmostEqual(tw.points, 84.2)
+        # players were merged into the league's registry
+        player = tw.slots[2].player
+        self.assertIs(registry.get(player.player_id, 2020), player)
+        # and so were their stat lines
+        stats = tw.slots[2]._coded_stats
+        self.assertIs(registry.stats.get(2020, 10, player.player_id), stats)
+        self.assertEqual(len(league.query(position="RB", min_points=20)), 4)
+        # already loaded matchups are skipped
+        self.assertEqual(hydrate_boxscores(league, [10]), [10])
+
+    def test_worker_results(self):
+        league = League(1603206, season=2020, registry=PlayerRegistry(),
+                        cache=LocalCache(self.tmp.name))
+        _, _, results = _hydrate_period(_LeagueKey(league), 10, 10)
+        self.assertEqual(len(results), 5)
+        for _, home, away, _ in results:
+            for pw in home.slots + away.slots:
+                # stats are converted, without API entries or registry
+                self.assertIsNone(pw._raw_stats)
+                self.assertIsNone(pw._registry)
+                self.assertIsNone(pw._raw_proj)
+            self.assertIsNone(home._registry)
+
+    def test_league_key(self):
+        league = League(1603206, season=2020, registry=PlayerRegistry(),
+                        cache=LocalCache(self.tmp.name, shared_stats=True))
+        key = _LeagueKey(league)
+        self.assertEqual(key.cache.cache_dir, self.tmp.name)
+        self.assertTrue(key.cache.shared_stats)
+
+    def test_missing_boxscore_data(self):
+        # matchup 9 entries in the period 10 payload have no rosters
+        cache = LocalCache(self.tmp.name)
+        league = League(1603206, season=2020, cache=cache)
+        cache.save(self.league_data, 9)
+        hydrate_boxscores(league, [9], max_workers=1)
+        m = league.get_matchup(9, 1)
+        self.assertFalse(m.boxscore_loaded)
+        self.assertIsNotNone(m.error)
+        with self.assertRaises(ValueError):
+            hydrate_boxscores(league, [99])
+
+    def test_serial_fallback(self):
+        cache = mock.Mock()
+        cache.load.return_value = self.league_data
+        league = League(1603206, season=2020, cache=cache)
+        self.assertEqual(hydrate_boxscores(league, [10]), [10])
+        self.assertTrue(league.get_matchup(10, 1).boxscore_loaded)
@@ -23,15 +23,9 @@ class PlayerTest(TestCase):
         self.assertEqual(player.full_name, "Josh Jacobs")
         self.assertEqual(player.position, "RB")
         self.assertEqual(player.pro_team, "LV")
-        self.assertEqual(player.pro_team_during_match, "LV")
         repr = "Josh Jacobs, RB, LV"
         self.assertEqual(player.__repr__(), repr)
 
-    def test_player_without_stats(self):
-        new_data = {k: v for k, v in self.player_data.items() if k != "stats"}
-        player = Player(new_data)
-        self.assertIsNone(player.pro_team_during_match)
-
     def test_player_json(self):
         player = Player(self.player_data)
         data = player.to_json()
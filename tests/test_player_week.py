@@ -1,9 +1,11 @@
 import os
+import copy
 import json
 from unittest import TestCase
 
 from espyn.player_week import PlayerWeek
 from espyn.player import Player
+from espyn.registry import PlayerRegistry
 
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
@@ -26,6 +28,18 @@ class PlayerTest(TestCase):
         for phrase in ("RB", "Josh Jacobs", "25.6 points"):
             self.assertIn(phrase, pweek.__repr__())
         self.assertIsInstance(pweek.player, Player)
+        self.assertEqual(pweek.pro_team_during_match, "LV")
+
+    def test_player_week_without_stats(self):
+        new_data = {**self.entry_data}
+        new_data["playerPoolEntry"]["player"]["stats"] = []
+        pweek = PlayerWeek(new_data)
+        self.assertIsNone(pweek.points)
+        self.assertIsNone(pweek.pro_team_during_match)
+        self.assertIsNone(pweek.projection_error)
+        self.assertEqual(pweek.stat_line, {})
+        self.assertIn("Inactive", pweek.__repr__())
+        self.assertFalse(hasattr(pweek, "__dict__"))
 
     def test_stat_line(self):
         pweek = PlayerWeek(self.entry_data)
@@ -49,3 +63,45 @@ class PlayerTest(TestCase):
                 "projected_points", "projection_error")
         for key in keys:
             assert key in data
+
+    def test_lazy_stat_codes(self):
+        pweek = PlayerWeek(self.entry_data, PlayerRegistry())
+        self.assertIsNone(pweek._stats)
+        self.assertEqual(pweek._coded_stats[24], 112)
+        self.assertIsNone(pweek._raw_stats)
+        self.assertIs(pweek._coded_stats, pweek._stats)
+        self.assertIn(24, pweek._coded_proj)
+
+    def test_shared_stat_line(self):
+        registry = PlayerRegistry()
+        pweek = PlayerWeek(self.entry_data, registry, 2020, 10)
+        stats = pweek._coded_stats
+        self.assertIs(registry.stats.get(2020, 10, 4047365), stats)
+        # later player-weeks of the same stat line reference it at once
+        other = PlayerWeek(self.entry_data, registry, 2020, 10)
+        self.assertIs(other._stats, stats)
+        self.assertIsNone(other._raw_stats)
+        self.assertEqual(other.stat_line, pweek.stat_line)
+        # other registries keep their own
+        self.assertIsNot(PlayerWeek(self.entry_data, PlayerRegistry(),
+                                    2020, 10)._coded_stats, stats)
+        # so do player-weeks without a season and scoring period
+        unkeyed = PlayerWeek(self.entry_data, registry)
+        self.assertEqual(unkeyed._coded_stats, stats)
+        self.assertIsNot(unkeyed._coded_stats, stats)
+
+    def test_changed_stat_line(self):
+        registry = PlayerRegistry()
+        pweek = PlayerWeek(self.entry_data, registry, 2020, 10)
+        stats = pweek._coded_stats
+        # e.g. a live week refetched with corrected stats
+        changed = copy.deepcopy(self.entry_data)
+        real = changed["playerPoolEntry"]["player"]["stats"][0]
+        real["stats"]["24"] += 10
+        other = PlayerWeek(changed, registry, 2020, 10)
+        self.assertIsNotNone(other._raw_stats)
+        self.assertEqual(other.stat_line["rush_yds"],
+                         pweek.stat_line["rush_yds"] + 10)
+        self.assertIs(registry.stats.get(2020, 10, 4047365),
+                      other._coded_stats)
+        self.assertIs(pweek._coded_stats, stats)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import datetime
+import threading
+from unittest import TestCase, mock
+from tempfile import TemporaryDirectory
+
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.prefetch import ReadAhead
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class ReadAheadTests(TestCase):
+
+    def get_mock_league(self, current=99, block=None):
+        league = mock.Mock()
+        league.current_matchup_num.return_value = current
+        league.schedule.scoring_periods.side_effect = \
+            lambda num: [num] if 0 < num <= 16 else None
+        league.schedule.matchups_by_number.return_value = [
+            mock.Mock(boxscore_loaded=False)]
+        if block is not None:
+            league._populate_boxscores.side_effect = \
+                lambda num: block.wait(5)
+        return league
+
+    def loaded(self, league):
+        return [c[0][0] for c in league._populate_boxscores.call_args_list]
+
+    def test_sequential(self):
+        with ReadAhead(depth=2) as read_ahead:
+            league = self.get_mock_league()
+            read_ahead.record(league, 3)
+            self.assertEqual(read_ahead.pending, 0)
+            read_ahead.record(league, 3)
+            read_ahead.record(league, 4)
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [5, 6])
+            self.assertEqual(read_ahead.prefetched, 2)
+            # backwards, within the schedule
+            read_ahead.record(league, 2)
+            read_ahead.record(league, 1)
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [5, 6])
+            read_ahead.record(league, 16)
+            read_ahead.record(league, 15)
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [5, 6, 14, 13])
+        self.assertEqual(read_ahead._threads, [])
+
+    def test_current_matchup(self):
+        with ReadAhead(depth=3) as read_ahead:
+            league = self.get_mock_league(current=6)
+            read_ahead.record(league, 4)
+            read_ahead.record(league, 5)
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [6])
+
+    def test_loaded_and_failed(self):
+        with ReadAhead() as read_ahead:
+            league = self.get_mock_league()
+            league._populate_boxscores.side_effect = RuntimeError()
+            read_ahead.record(league, 1)
+            read_ahead.record(league, 2)
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [3])
+            self.assertEqual(read_ahead.prefetched, 0)
+            league.schedule.matchups_by_number.return_value = [
+                mock.Mock(boxscore_loaded=True)]
+            read_ahead.record(league, 3)
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [3])
+
+    def test_bounded_and_cancelled(self):
+        block = threading.Event()
+        read_ahead = ReadAhead(depth=3, max_pending=4)
+        try:
+            league = self.get_mock_league(block=block)
+            other = self.get_mock_league(block=block)
+            read_ahead.record(league, 1)
+            read_ahead.record(league, 2)
+            # wait for the worker to take the first prefetch
+            with read_ahead._cond:
+                read_ahead._cond.wait_for(lambda: read_ahead._active, 5)
+            self.assertFalse(read_ahead.join(0.01))
+            read_ahead.record(other, 1)
+            read_ahead.record(other, 2)
+            read_ahead.record(league, 3)
+            # oldest dropped: league's 5 and other's 3
+            self.assertEqual(read_ahead.pending, 4)
+            self.assertEqual(read_ahead.dropped, 3)
+            # a jump cancels the league's queued prefetches only
+            read_ahead.record(league, 10)
+            self.assertEqual(read_ahead.pending, 2)
+            self.assertEqual(read_ahead.cancelled, 2)
+            self.assertEqual(read_ahead.cancel(other), 2)
+            self.assertEqual(read_ahead.pending, 0)
+            block.set()
+            self.assertTrue(read_ahead.join(5))
+            self.assertEqual(self.loaded(league), [3])
+            self.assertEqual(self.loaded(other), [])
+        finally:
+            block.set()
+            read_ahead.close()
+        read_ahead.record(league, 11)
+        self.assertEqual(read_ahead.pending, 0)
+        with self.assertRaises(ValueError):
+            ReadAhead(depth=0)
+
+    def test_league(self):
+        with TemporaryDirectory() as tmp:
+            shutil.copy(os.path.join(DATA_DIR, "2020_1603206.json"), tmp)
+            with ReadAhead() as read_ahead:
+                league = League(1603206, season=2020, cache=LocalCache(tmp),
+                                read_ahead=read_ahead,
+                                as_of=datetime.date(2020, 12, 31))
+                self.assertIs(league.read_ahead, read_ahead)
+                with mock.patch.object(league, "_populate_boxscores") as pop:
+                    league.get_matchups_by_number(8, boxscore=True)
+                    league.get_matchup(9, 1, boxscore=True)
+                    self.assertTrue(read_ahead.join(5))
+                    self.assertEqual([c[0][0] for c in pop.call_args_list],
+                                     [8, 9, 10])
+                # not pickled with the league
+                self.assertIsNone(league.__getstate__()["read_ahead"])
@@ -0,0 +1,61 @@
+import os
+import json
+from unittest import TestCase, mock
+
+from espyn.query import PlayerWeekIndex, PlayerWeekRow
+from espyn.matchup import Matchup
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
+
+
+class QueryTests(TestCase):
+
+    def setUp(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        league = mock.Mock(reg_season_weeks=12)
+        league.matchup_num_to_scoring_periods.return_value = [10]
+        matchup = Matchup(data["schedule"][46], league)
+        matchup.set_boxscore_data(data["schedule"][46], 10)
+        # boxscore not loaded, contributes no rows
+        unloaded = Matchup(data["schedule"][47], league)
+        self.index = PlayerWeekIndex.from_matchups([matchup, unloaded])
+
+    def test_rows(self):
+        self.assertEqual(len(self.index), 30)
+        row = self.index.rows[0]
+        self.assertIsInstance(row, PlayerWeekRow)
+        self.assertEqual((row.matchup_num, row.scoring_period), (10, 10))
+        self.assertIs(row.player, row.player_week.player)
+        self.assertIn("Scoring Period 10", str(row))
+        data = row.to_json()
+        for key in ("team_id", "matchup_num", "scoring_period", "player_week"):
+            self.assertIn(key, data)
+
+    def test_indexed_filters(self):
+        self.assertEqual(len(self.index.query()), 30)
+        rbs = self.index.query(position="RB", team_id=1)
+        self.assertEqual(len(rbs), 5)
+        flex = self.index.query(slot=["FLEX", "RB/WR"])
+        self.assertEqual({r.player.full_name for r in flex},
+                         {"Christian Kirk", "Diontae Johnson"})
+        self.assertEqual(len(self.index.query(pro_team="LV")), 2)
+        self.assertEqual(len(self.index.query(scoring_period=range(1, 10))), 0)
+        self.assertEqual(len(self.index.query(position="XX")), 0)
+
+    def test_value_filters(self):
+        rows = self.index.query(position="RB", min_points=20)
+        self.assertEqual({r.player.full_name for r in rows},
+                         {"Josh Jacobs", "D'Andre Swift"})
+        rows = self.index.query(min_points=20, max_points=21)
+        self.assertEqual([r.player.full_name for r in rows], ["D'Andre Swift"])
+        rows = self.index.query(stats={"rush_yds": 100})
+        self.assertEqual([r.player.full_name for r in rows],
+                         ["Josh Jacobs", "Kenyan Drake"])
+        rows = self.index.query(position="RB", stats={24: (None, 0)})
+        self.assertTrue(all(r.player_week.stat_line.get("rush_yds", 0) <= 0
+                            for r in rows))
+        with self.assertRaises(ValueError):
+            self.index.query(stats={"not_a_stat": 1})
@@ -0,0 +1,80 @@
+import os
+import copy
+import json
+from unittest import TestCase
+
+from espyn.registry import PlayerRegistry, default_registry
+from espyn.player_week import PlayerWeek
+from espyn.player import Player
+from espyn.lineup import LineupOptimizer
+from espyn.team_week import TeamWeek
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+TEST_FILE = os.path.join(DATA_DIR, "2020_1603206_sp10.json")
+
+
+class RegistryTests(TestCase):
+
+    def setUp(self):
+        with open(TEST_FILE) as f:
+            data = json.load(f)
+        self.data = data
+        home = data["schedule"][46]["home"]
+        self.entries = home["rosterForCurrentScoringPeriod"]["entries"]
+        self.player_data = self.entries[2]["playerPoolEntry"]["player"]
+
+    def test_intern(self):
+        registry = PlayerRegistry()
+        self.assertEqual(len(registry), 0)
+        player = registry.intern(self.player_data)
+        self.assertIsInstance(player, Player)
+        self.assertIs(registry.intern({**self.player_data}), player)
+        self.assertEqual(len(registry), 1)
+        self.assertIn(4047365, registry)
+        self.assertIs(registry.get(4047365), player)
+        self.assertIsNone(registry.get(-1))
+        self.assertEqual(list(registry), [player])
+        self.assertIn("1 players", str(registry))
+        registry.clear()
+        self.assertEqual(len(registry), 0)
+
+    def test_player_weeks_share_player(self):
+        registry = PlayerRegistry()
+        week1 = PlayerWeek(self.entries[2], registry)
+        week2 = PlayerWeek(self.entries[2], registry)
+        self.assertIsNot(week1, week2)
+        self.assertIs(week1.player, week2.player)
+        # default is process-wide registry
+        self.assertIs(PlayerWeek(self.entries[2]).player,
+                      default_registry.get(4047365))
+
+    def test_seasons(self):
+        registry = PlayerRegistry()
+        player = registry.intern(self.player_data, 2020)
+        traded = {**self.player_data, "proTeamId": 1,
+                  "eligibleSlots": [2, 23]}
+        other = registry.intern(traded, 2021)
+        self.assertIsNot(other, player)
+        self.assertEqual(other.pro_team, "ATL")
+        # interned players are never modified
+        self.assertEqual(player.pro_team, "LV")
+        self.assertIs(registry.intern(traded, 2020), player)
+        self.assertIs(registry.get(4047365, 2021), other)
+        self.assertIsNone(registry.get(4047365))
+        self.assertEqual(len(registry), 2)
+        self.assertIs(registry.add(Player(traded), 2021), other)
+
+    def test_seasons_lineups(self):
+        registry = PlayerRegistry()
+        counts = self.data["settings"]["rosterSettings"]["lineupSlotCounts"]
+        optimizer = LineupOptimizer({int(k): v for k, v in counts.items()})
+        tw = TeamWeek(self.data["schedule"][46]["home"], 10, registry, 2020)
+        self.assertAlmostEqual(optimizer.optimize(tw).optimal_points, 96.0)
+        # the same players in another season, eligible for no slot
+        later = copy.deepcopy(self.data["schedule"][46]["home"])
+        for entry in later["rosterForCurrentScoringPeriod"]["entries"]:
+            entry["playerPoolEntry"]["player"]["eligibleSlots"] = []
+        other = TeamWeek(later, 10, registry, 2021)
+        self.assertEqual(optimizer.optimize(other).optimal_points, 0)
+        self.assertAlmostEqual(optimizer.optimize(tw).optimal_points, 96.0)
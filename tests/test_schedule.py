@@ -0,0 +1,66 @@
+import os
+from unittest import TestCase
+
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.schedule import ScheduleIndex
+from espyn.synthetic import SyntheticCache
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class ScheduleIndexTests(TestCase):
+
+    def setUp(self):
+        self.league = League(1603206, season=2020, cache=LocalCache(DATA_DIR))
+        self.schedule = self.league.schedule
+
+    def test_periods(self):
+        schedule = ScheduleIndex({"1": [1], "2": [2, 3]})
+        self.assertEqual(schedule.scoring_periods(2), [2, 3])
+        self.assertIsNone(schedule.scoring_periods(3))
+        self.assertEqual(schedule.matchup_num(3), 2)
+        self.assertIsNone(schedule.matchup_num(4))
+        self.assertEqual(schedule.matchup_nums, [])
+        self.assertEqual(self.schedule.matchup_num(16), 14)
+        self.assertEqual(self.schedule.matchup_nums, list(range(1, 15)))
+
+    def test_matchups(self):
+        m = self.schedule.matchup(10, 7)
+        self.assertIn(7, m.team_ids)
+        self.assertIsNone(self.schedule.matchup(10, 99))
+        self.assertIsNone(self.schedule.matchup(99, 7))
+        self.assertIs(self.league.get_matchup(10, 7), m)
+        self.assertEqual(len(self.schedule.matchups_by_number(10)), 5)
+        with self.assertRaises(KeyError):
+            self.schedule.matchups_by_number(99)
+        matchups = self.schedule.team_matchups(7)
+        self.assertEqual([i.matchup_num for i in matchups],
+                         sorted(i.matchup_num for i in matchups))
+        self.assertIs(matchups[9], m)
+        self.assertIs(self.league.get_team_by_id(7).matchups[9], m)
+        self.assertEqual(self.schedule.team_matchups(99), [])
+
+    def test_opponents_and_flags(self):
+        m = self.schedule.matchup(10, 7)
+        opp = m.away_team_id if m.home_team_id == 7 else m.home_team_id
+        self.assertEqual(self.schedule.opponent(7, 10), opp)
+        self.assertEqual(self.schedule.opponent(opp, 10), 7)
+        self.assertIsNone(self.schedule.opponent(7, 99))
+        self.assertFalse(self.schedule.is_playoff(12))
+        self.assertTrue(self.schedule.is_playoff(13))
+        self.assertFalse(self.schedule.is_bye(7, 10))
+        self.assertTrue(self.schedule.is_bye(7, 99))
+
+    def test_byes(self):
+        # top seeds have a bye in the first playoff round
+        league = League(1, 2020, cache=SyntheticCache(
+            num_teams=6, reg_season_matchups=5, playoff_teams=6))
+        byes = [m for m in league.schedule.matchups_by_number(6)
+                if m.is_bye]
+        self.assertTrue(byes)
+        team_id = byes[0].home_team_id
+        self.assertTrue(league.schedule.is_bye(team_id, 6))
+        self.assertIsNone(league.schedule.opponent(
+            team_id, league.matchup_num_to_scoring_periods(6)[0]))
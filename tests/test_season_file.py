@@ -0,0 +1,87 @@
+import os
+import math
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.columnar import build_tables
+from espyn.season_file import SeasonFile, write_season, MAGIC
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class SeasonFileTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.league = League(1603206, season=2020, cache=LocalCache(DATA_DIR))
+        cls.league.load_boxscores([10])
+        cls.tables = build_tables(cls.league)
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "2020.espyn")
+        self.manifest = write_season(self.league, self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_layout(self):
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(len(MAGIC)), MAGIC)
+        self.assertTrue(all(i % 8 == 0 for i in self.manifest["sections"]))
+        with SeasonFile(self.path) as season:
+            self.assertEqual(season.table_names, list(self.tables))
+            for name, table in self.tables.items():
+                mapped = season.table(name)
+                self.assertEqual(len(mapped), table.num_rows)
+                self.assertEqual(mapped.column_names, table.column_names)
+            self.assertIn("player_weeks", repr(mapped))
+
+    def test_tables_round_trip(self):
+        with SeasonFile(self.path) as season:
+            teams = season.table("teams")
+            self.assertEqual(list(teams.columns["team_nickname"]),
+                             self.tables["teams"].columns["team_nickname"])
+            matchups = season.table("matchups")
+            self.assertEqual(matchups.rows(0, 1)[0]["matchup_num"], 1)
+            for expected, row in zip(self.tables["matchups"].iter_rows(),
+                                     matchups.rows()):
+                self.assertEqual(row["away_team_id"], expected[4])
+                self.assertIsInstance(row["is_bye"], bool)
+            self.assertEqual(teams.columns["team_id"][0:2],
+                             list(self.tables["teams"].columns["team_id"][:2]))
+
+    def test_week_and_player(self):
+        source = self.tables["player_weeks"]
+        with SeasonFile(self.path) as season:
+            rows = season.week(10)
+            self.assertEqual(len(rows), source.num_rows)
+            self.assertEqual(season.week(3), [])
+            self.assertEqual(len(season.week(10, "team_weeks")), 10)
+            rows = season.player(4047365)
+            self.assertEqual(len(rows), 1)
+            row = rows[0]
+            self.assertEqual(row["player_name"], "Josh Jacobs")
+            self.assertEqual(row["scoring_period"], 10)
+            pw = self.league.player_weeks(4047365)[10]
+            self.assertAlmostEqual(row["points"], pw.points)
+            self.assertEqual(row["stat_rush_yds"], pw.stat_line["rush_yds"])
+            self.assertEqual(season.player(-1), [])
+            ids = list(source.columns["player_id"])
+            for player_id in set(ids):
+                self.assertEqual(len(season.player(player_id)),
+                                 ids.count(player_id))
+            # missing floats are None
+            inactive = [r for r in season.week(10) if r["points"] is None]
+            expected = [v for v in source.columns["points"] if math.isnan(v)]
+            self.assertEqual(len(inactive), len(expected))
+
+    def test_invalid_file(self):
+        bad = os.path.join(self.tmp.name, "bad")
+        with open(bad, "wb") as f:
+            f.write(b"not a season file")
+        with self.assertRaises(ValueError):
+            SeasonFile(bad)
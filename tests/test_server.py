@@ -0,0 +1,168 @@
+import json
+import threading
+from http.client import HTTPConnection
+from unittest import TestCase, mock
+
+from espyn import server
+from espyn.__main__ import main
+from espyn.league import League, LeagueFetchError
+from espyn.synthetic import SyntheticCache
+
+
+class ServerTests(TestCase):
+
+    def setUp(self):
+        self.factory = mock.Mock(side_effect=lambda league_id, season: League(
+            league_id, season, cache=SyntheticCache(num_teams=4, seed=1)))
+        self.store = server.LeagueStore(capacity=2, factory=self.factory)
+
+    def start_server(self):
+        httpd = server.make_server(0, "127.0.0.1", store=self.store)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        conn = HTTPConnection("127.0.0.1", httpd.server_address[1])
+        self.addCleanup(conn.close)
+        return conn
+
+    def get(self, conn, path):
+        conn.request("GET", path)
+        res = conn.getresponse()
+        return res, json.loads(res.read())
+
+    def test_store_lru(self):
+        league = self.store.get(1, 2020)
+        self.assertIs(self.store.get(1, 2020), league)
+        self.store.get(2, 2020)
+        self.store.get(1, 2020)  # 2 is now least recently used
+        self.store.get(3, 2020)
+        self.assertEqual(len(self.store), 2)
+        self.assertIn((1, 2020), self.store)
+        self.assertNotIn((2, 2020), self.store)
+        self.assertEqual(self.factory.call_count, 3)
+        with self.assertRaises(ValueError):
+            server.LeagueStore(capacity=0)
+
+    def test_store_responses(self):
+        body = self.store.response(1, 2020, ("teams",))
+        self.assertIs(self.store.response(1, 2020, ("teams",)), body)
+        self.assertEqual(len(json.loads(body)), 4)
+        summary = self.store.response(1, 2020)
+        boxscores = json.loads(
+            self.store.response(1, 2020, ("matchups", "1", "boxscores")))
+        self.assertEqual(len(boxscores), 2)
+        self.assertTrue(all(m["home_data"] for m in boxscores))
+        # loading boxscores invalidates serialized league
+        self.assertIsNot(self.store.response(1, 2020), summary)
+        # bad paths are rejected without loading the league
+        with self.assertRaises(server.NotFound):
+            self.store.response(5, 2020, ("players",))
+        self.assertNotIn((5, 2020), self.store)
+        for parts in (("teams", "99"), ("matchups", "99"), ("players",),
+                      ("matchups", "1", "other"), ("teams", "x"),
+                      ("teams", "1_0"), ("matchups",)):
+            with self.assertRaises(server.NotFound):
+                self.store.response(1, 2020, parts)
+
+    def test_store_response_keys(self):
+        body = self.store.response(1, 2020, ("teams", "1"))
+        for team_id in ("01", "001"):
+            self.assertIs(self.store.response(1, 2020, ("teams", team_id)),
+                          body)
+        league, responses = self.store._entry(1, 2020)
+        self.assertEqual(list(responses), [("teams", "1")])
+        # responses depend on the current matchup number
+        with mock.patch.object(league, "current_matchup_num",
+                               return_value=2):
+            self.assertIsNot(self.store.response(1, 2020, ("teams", "1")),
+                             body)
+        # serialized responses per league are capped
+        store = server.LeagueStore(factory=self.factory, max_responses=2)
+        for team_id in ("1", "2", "3"):
+            store.response(1, 2020, ("teams", team_id))
+        self.assertEqual(list(store._entry(1, 2020)[1]),
+                         [("teams", "2"), ("teams", "3")])
+        with self.assertRaises(ValueError):
+            server.LeagueStore(max_responses=0)
+
+    def test_store_load_error(self):
+        league = self.store.get(1, 2020)
+        with mock.patch.object(league, "_populate_boxscores",
+                               side_effect=ValueError("bad data")):
+            with self.assertRaises(ValueError):
+                self.store.response(1, 2020, ("matchups", "1", "boxscores"))
+
+    def test_concurrent_requests(self):
+        release = threading.Event()
+
+        def factory(league_id, season):
+            release.wait(5)
+            return League(league_id, season,
+                          cache=SyntheticCache(num_teams=4))
+        store = server.LeagueStore(factory=mock.Mock(side_effect=factory))
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(store.response(1, 2020)))
+            for _ in range(4)]
+        for t in threads:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join()
+        store.factory.assert_called_once_with(1, 2020)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_http(self):
+        conn = self.start_server()
+        res, data = self.get(conn, "/leagues/1/2020")
+        self.assertEqual(res.status, 200)
+        self.assertEqual(res.getheader("Content-Type"), server.JSON_TYPE)
+        self.assertEqual(data["league_id"], 1)
+        res, data = self.get(conn, "/leagues/1/2020/teams/2")
+        self.assertEqual(data["team_id"], 2)
+        res, data = self.get(conn, "/leagues/1/2020/matchups/1")
+        self.assertNotIn("home_data", data[0])
+        for path in ("/", "/leagues/1/2020/teams/9", "/leagues/1/2020/x"):
+            res, data = self.get(conn, path)
+            self.assertEqual(res.status, 404)
+            self.assertIn("error", data)
+        res, data = self.get(conn, "/leagues/x/2020")
+        self.assertEqual(res.status, 400)
+
+    def test_http_chunked(self):
+        conn = self.start_server()
+        with mock.patch.object(server, "CHUNKED_THRESHOLD", 100), \
+                mock.patch.object(server, "CHUNK_SIZE", 100):
+            res, data = self.get(conn, "/leagues/1/2020/matchups/1/boxscores")
+        self.assertEqual(res.status, 200)
+        self.assertEqual(res.getheader("Transfer-Encoding"), "chunked")
+        self.assertEqual(len(data), 2)
+        # connection is reusable after a chunked response
+        res, data = self.get(conn, "/leagues/1/2020/teams")
+        self.assertEqual(len(data), 4)
+
+    def test_http_load_error(self):
+        self.factory.side_effect = LeagueFetchError("private")
+        conn = self.start_server()
+        res, data = self.get(conn, "/leagues/1/2020")
+        self.assertEqual(res.status, 502)
+        self.assertIn("private", data["error"])
+        # other errors are internal, and not exposed
+        self.factory.side_effect = ValueError("bug")
+        with self.assertLogs(level="ERROR"):
+            res, data = self.get(conn, "/leagues/2/2020")
+        self.assertEqual(res.status, 500)
+        self.assertNotIn("bug", data["error"])
+
+    def test_cli(self):
+        with mock.patch.object(server, "make_server") as make_server:
+            make_server.return_value.server_address = ("127.0.0.1", 8001)
+            make_server.return_value.serve_forever.side_effect = \
+                KeyboardInterrupt
+            with mock.patch("builtins.print"):
+                main(["serve", "--port", "8001", "--capacity", "4"])
+        make_server.assert_called_once_with(
+            8001, "127.0.0.1", cache_dir=None, capacity=4, budget=None)
+        make_server.return_value.server_close.assert_called_once()
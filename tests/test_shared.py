@@ -0,0 +1,150 @@
+import os
+import sys
+import math
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock, skipIf
+
+from espyn import shared
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.registry import PlayerRegistry
+from espyn.shared import SharedArrays, build_arrays, load_npy, save_npy
+from espyn.synthetic import SyntheticCache
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+NO_SHARED_MEMORY = sys.version_info < (3, 8)
+
+
+def sum_points(handle):
+    # runs in worker process
+    with SharedArrays.attach(handle) as arrays:
+        points = arrays["pw_points"]
+        total = sum(i for i in points.tolist() if not math.isnan(i))
+        del points
+    return total
+
+
+class SharedTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.league = League(1603206, season=2020, cache=LocalCache(DATA_DIR))
+        cls.league.load_boxscores([10])
+        cls.arrays = build_arrays(cls.league)
+
+    def test_build_arrays(self):
+        shapes = {k: v[0] for k, v in self.arrays.items()}
+        self.assertEqual(shapes["team_ids"], (10,))
+        self.assertEqual(shapes["scoring_periods"], (16,))
+        self.assertEqual(shapes["scores"], (10, 16))
+        num = shapes["pw_points"][0]
+        self.assertGreater(num, 0)
+        self.assertEqual(shapes["stats"], (num, shapes["stat_codes"][0]))
+        self.assertEqual(list(self.arrays["league_ids"][1]), [1603206])
+        self.assertEqual(set(self.arrays["team_league"][1]), {0})
+        # team 7's week 10 score
+        team, scores = self.arrays["team_ids"][1], self.arrays["scores"][1]
+        row = list(team).index(7)
+        m = self.league.get_matchup(10, 7)
+        expected = m.home_score if m.home_team_id == 7 else m.away_score
+        self.assertAlmostEqual(scores[row * 16 + 9], expected)
+        # stat matrix matches stat lines
+        tw = m.home_data[0]
+        pw = next(i for i in tw.slots if i.points)
+        idx = list(self.arrays["pw_player_id"][1]).index(pw.player.player_id)
+        codes = list(self.arrays["stat_codes"][1])
+        stats = self.arrays["stats"][1]
+        for code, value in pw._coded_stats.items():
+            self.assertEqual(stats[idx * len(codes) + codes.index(code)],
+                             value)
+
+    def test_build_arrays_leagues(self):
+        registry = PlayerRegistry()
+        leagues = [League(i, 2020, cache=SyntheticCache(num_teams=4),
+                          registry=registry) for i in (1, 2)]
+        leagues[1].load_boxscores([1])
+        arrays = build_arrays(leagues)
+        self.assertEqual(list(arrays["league_ids"][1]), [1, 2])
+        self.assertEqual(list(arrays["seasons"][1]), [2020, 2020])
+        # same team IDs in both leagues get their own rows
+        self.assertEqual(list(arrays["team_league"][1]), [0] * 4 + [1] * 4)
+        self.assertEqual(list(arrays["team_ids"][1]), [1, 2, 3, 4] * 2)
+        periods = arrays["scores"][0][1]
+        for row, (index, team_id) in enumerate(zip(
+                arrays["team_league"][1], arrays["team_ids"][1])):
+            m = leagues[index].get_matchup(1, team_id)
+            expected = m.home_score if m.home_team_id == team_id \
+                else m.away_score
+            self.assertAlmostEqual(arrays["scores"][1][row * periods],
+                                   expected)
+        # only the second league's boxscores are loaded
+        self.assertEqual(set(arrays["pw_league"][1]), {1})
+        self.assertEqual(len(arrays["pw_league"][1]),
+                         len(arrays["pw_team_id"][1]))
+
+    @skipIf(NO_SHARED_MEMORY, "shared memory is Python 3.8+")
+    def test_shared_memory(self):
+        with SharedArrays.create(self.arrays) as arrays:
+            self.assertEqual(arrays.keys(), list(self.arrays))
+            scores = arrays["scores"]
+            self.assertEqual(tuple(scores.shape), (10, 16))
+            self.assertEqual(scores[0, 0], self.arrays["scores"][1][0])
+            # read-only (numpy raises ValueError, memoryview TypeError)
+            with self.assertRaises((TypeError, ValueError)):
+                scores[0, 0] = 1.
+            with self.assertRaises(KeyError):
+                arrays["other"]
+            other = SharedArrays.attach(arrays.handle)
+            self.assertEqual(other["team_ids"].tolist(),
+                             list(self.arrays["team_ids"][1]))
+            other.close()
+            del scores
+
+    def test_shared_memory_unavailable(self):
+        with mock.patch.dict(sys.modules,
+                             {"multiprocessing.shared_memory": None}):
+            with self.assertRaisesRegex(ImportError, "3.8"):
+                SharedArrays.create(self.arrays)
+            with self.assertRaises(ImportError):
+                SharedArrays.attach(("name", ()))
+
+    def test_read_only_view(self):
+        buffer = bytearray(16)
+        view = shared._view(buffer, "d", (2,))
+        with self.assertRaises((TypeError, ValueError)):
+            view[0] = 1.
+        self.assertEqual(view.tolist(), [0., 0.])
+
+    @skipIf(NO_SHARED_MEMORY, "shared memory is Python 3.8+")
+    def test_worker_processes(self):
+        expected = sum(i for i in self.arrays["pw_points"][1]
+                       if not math.isnan(i))
+        with SharedArrays.create(self.arrays) as arrays:
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                totals = list(pool.map(sum_points, [arrays.handle] * 2))
+        for total in totals:
+            self.assertAlmostEqual(total, expected)
+
+    def test_npy(self):
+        with TemporaryDirectory() as tmp:
+            arrays = dict(self.arrays, empty=((0, 3), shared.array("d")))
+            paths = save_npy(arrays, tmp)
+            self.assertEqual(len(paths), len(arrays))
+            with open(paths[0], "rb") as f:
+                header = f.read(128)
+            self.assertTrue(header.startswith(b"\x93NUMPY"))
+            views = load_npy(tmp)
+            self.assertEqual(set(views), set(arrays))
+            self.assertEqual(views["stats"].tolist()[3],
+                             list(self.arrays["stats"][1][
+                                 3 * len(self.arrays["stat_codes"][1]):
+                                 4 * len(self.arrays["stat_codes"][1])]))
+            self.assertEqual(len(views["empty"]), 0)
+            self.assertEqual(list(load_npy(tmp, ["team_ids"])), ["team_ids"])
+            with open(os.path.join(tmp, "bad.npy"), "wb") as f:
+                f.write(b"not npy")
+            with self.assertRaises(ValueError):
+                load_npy(tmp, ["bad"])
+            del views
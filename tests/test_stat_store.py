@@ -0,0 +1,57 @@
+import pickle
+from unittest import TestCase
+
+from espyn.stat_store import StatLineStore, coded_stats
+from espyn.registry import PlayerRegistry
+
+
+class StatLineStoreTests(TestCase):
+
+    def test_intern(self):
+        store = StatLineStore()
+        stats = {"24": 112., "25": 2.}
+        line = store.intern(2020, 10, 1, stats)
+        self.assertEqual(line, {24: 112., 25: 2.})
+        self.assertIs(store.intern(2020, 10, 1, dict(stats)), line)
+        self.assertIs(store.get(2020, 10, 1), line)
+        self.assertIs(store.get(2020, 10, 1, stats), line)
+        self.assertIsNone(store.get(2020, 11, 1))
+        self.assertIn((2020, 10, 1), store)
+        # changed stats replace the stored line
+        self.assertIsNone(store.get(2020, 10, 1, {"24": 0.}))
+        line = store.intern(2020, 10, 1, {"24": 0.})
+        self.assertEqual(line, {24: 0.})
+        self.assertIs(store.get(2020, 10, 1), line)
+        self.assertIs(store.add(2020, 10, 1, {24: 0.}), line)
+        other = store.add(2021, 1, 1, {24: 0.})
+        self.assertIs(store.get(2021, 1, 1), other)
+        self.assertEqual(len(store), 2)
+        self.assertIn("2 stat lines", str(store))
+        self.assertEqual(store.discard_season(2021), 1)
+        self.assertEqual(len(store), 1)
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_coded_stats(self):
+        self.assertEqual(coded_stats({"3": 1., "210": 0.}), {3: 1., 210: 0.})
+        self.assertEqual(coded_stats({}), {})
+
+    def test_weak_lines(self):
+        store = StatLineStore()
+        line = store.intern(2020, 10, 1, {"24": 112.})
+        store.intern(2020, 10, 2, {"24": 1.})
+        # lines no longer referenced are dropped
+        self.assertEqual(len(store), 1)
+        copy, copied_line = pickle.loads(pickle.dumps((store, line)))
+        self.assertIs(copy.get(2020, 10, 1), copied_line)
+        del line
+        self.assertEqual(len(store), 0)
+
+    def test_registry_store(self):
+        registry = PlayerRegistry()
+        self.assertIsInstance(registry.stats, StatLineStore)
+        line = registry.stats.intern(2020, 1, 1, {"3": 1.})
+        registry.clear()
+        self.assertEqual(len(registry.stats), 0)
+        store = StatLineStore()
+        self.assertIs(PlayerRegistry(store).stats, store)
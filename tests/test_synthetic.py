@@ -0,0 +1,98 @@
+import os
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+
+from espyn import jsonlib
+from espyn.league import League
+from espyn.caches import LocalCache
+from espyn.registry import PlayerRegistry
+from espyn.synthetic import SyntheticCache, SyntheticLeague
+
+
+class SyntheticTests(TestCase):
+
+    def setUp(self):
+        self.kwargs = dict(num_teams=11, reg_season_matchups=6,
+                           matchup_length=2, playoff_teams=6,
+                           playoff_matchup_length=1, roster_size=12)
+        self.league = League(7, 2020, cache=SyntheticCache(**self.kwargs),
+                             registry=PlayerRegistry())
+
+    def test_league(self):
+        league = self.league
+        self.assertEqual(league.size, 11)
+        self.assertEqual(len(league.teams), 11)
+        # 6 regular-season matchups plus 3 playoff rounds
+        self.assertEqual(league.total_matchups, 9)
+        self.assertEqual(league.matchup_num_to_scoring_periods(6), [11, 12])
+        self.assertEqual(league.matchup_num_to_scoring_periods(9), [15])
+        self.assertEqual(league.lineup_slot_counts[20], 3)
+        for num in range(1, 10):
+            matchups = league.get_matchups_by_number(num)
+            # every team plays (or has a bye) exactly once per period
+            team_ids = [i for m in matchups for i in m.team_ids if i]
+            self.assertCountEqual(team_ids, range(1, 12))
+        byes = [m for m in league.get_matchups_by_number(1) if m.is_bye]
+        self.assertEqual(len(byes), 1)
+        wins = sum(t.wins for t in league.teams)
+        self.assertEqual(wins, sum(t.losses for t in league.teams))
+
+    def test_cache_per_league(self):
+        cache = self.league.cache
+        with self.assertRaises(ValueError):
+            League(8, 2020, cache=cache)
+        # the cache still serves its own league
+        m = self.league.get_matchup(1, 1, boxscore=True)
+        self.assertAlmostEqual(sum(tw.points for tw in m.home_data),
+                               m.home_score)
+
+    def test_boxscores(self):
+        league = self.league
+        league.load_boxscores(range(1, 10))
+        for m in league._matchups:
+            self.assertTrue(m.boxscore_loaded)
+            for tw in m.loaded_team_weeks():
+                self.assertEqual(len(tw.slots), 12)
+                starters = [pw.points or 0 for pw in tw.slots
+                            if pw.slot_id not in (20, 21)]
+                self.assertAlmostEqual(sum(starters), tw.points)
+                for pw in tw.slots:
+                    if pw.points is not None:
+                        self.assertAlmostEqual(
+                            pw.calculate_points(league.scoring_dict),
+                            pw.points)
+        self.assertEqual(len(league.registry), 11 * 12)
+
+    def test_deterministic(self):
+        a = SyntheticLeague(3, **self.kwargs)
+        b = SyntheticLeague(3, **self.kwargs)
+        c = SyntheticLeague(3, seed=1, **self.kwargs)
+        self.assertEqual(a.response(), b.response())
+        self.assertEqual(a.response(5), b.response(5))
+        self.assertNotEqual(a.response(5), c.response(5))
+        self.assertEqual(jsonlib.loads(a.response(5))["scoringPeriodId"], 5)
+        with self.assertRaises(ValueError):
+            a.scoring_period_data(99)
+        with self.assertRaises(ValueError):
+            SyntheticLeague(roster_size=5)
+
+    def test_stat_density(self):
+        def num_stats(density):
+            gen = SyntheticLeague(stat_density=density, projections=False)
+            entries, _ = gen.team_week(1, 1)
+            return sum(len(e["playerPoolEntry"]["player"]["stats"][0]["stats"])
+                       for e in entries if e["playerPoolEntry"]["player"]["stats"])
+        self.assertLess(num_stats(0.), num_stats(1.))
+
+    def test_write(self):
+        gen = SyntheticLeague(11, 2019, **self.kwargs)
+        with TemporaryDirectory() as tmp:
+            paths = gen.write(tmp)
+            self.assertEqual(len(paths), 1 + len(gen.scoring_periods))
+            self.assertTrue(all(os.path.exists(i) for i in paths))
+            league = League(11, 2019, cache=LocalCache(tmp))
+            self.assertEqual(league.to_json(),
+                             League(11, 2019, cache=SyntheticCache(
+                                 **self.kwargs)).to_json())
+            m = league.get_matchup(2, 1, boxscore=True)
+            self.assertTrue(m.boxscore_loaded)
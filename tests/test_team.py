@@ -19,6 +19,7 @@ class TeamTests(TestCase):
         league.name_from_user_id.return_value = "Mockboi"
         league.total_matchups = 14
         league.current_matchup_num.return_value = 5
+        league.schedule.team_matchups.return_value = []
         league.configure_mock(**kwargs)
         return league
 
@@ -55,23 +56,32 @@ class TeamTests(TestCase):
     def test_team_scores(self):
         league = self.get_mock_league()
         team = Team(self.team_data, league)
-        matchup = mock.Mock()
-        league.get_matchup.return_value = matchup
+        matchups = [mock.Mock(matchup_num=i) for i in range(1, 15)]
+        league.schedule.team_matchups.return_value = matchups
+        self.assertIs(team.matchups, matchups)
+        league.schedule.team_matchups.assert_called_with(1)
         # always home team
-        matchup.configure_mock(home_team_id=1, home_scores=[10],
-                               is_bye=False)
+        for matchup in matchups:
+            matchup.configure_mock(home_team_id=1, home_scores=[10],
+                                   is_bye=False)
         scores = team.scores()
         self.assertEqual(len(scores), 4)
         self.assertEqual(sum(scores), 40)
         # always away team
-        matchup.configure_mock(away_team_id=1, away_scores=[20],
-                               home_team_id=None)
+        for matchup in matchups:
+            matchup.configure_mock(away_team_id=1, away_scores=[20],
+                                   home_team_id=None)
         self.assertEqual(sum(team.scores()), 80)
+        # byes are skipped
+        matchups[0].is_bye = True
+        self.assertEqual(sum(team.scores()), 60)
+        matchups[0].is_bye = False
         # season over (expect `league.total_matchups` scores)
         league.current_matchup_num.return_value = SEASON_OVER
         self.assertEqual(len(team.scores()), league.total_matchups)
         # all playoff matchups (expect 0 scores)
-        matchup.configure_mock(is_playoff=True)
+        for matchup in matchups:
+            matchup.configure_mock(is_playoff=True)
         scores = team.scores(include_playoffs=False)
         self.assertEqual(len(scores), 0)
 
@@ -91,3 +101,4 @@ class TeamTests(TestCase):
                 "scores")
         for key in keys:
             self.assertIn(key, data)
+        self.assertNotIn("scores", team.to_json(scores=False))
@@ -26,8 +26,27 @@ class PlayerTest(TestCase):
         self.assertEqual(len(tweek.slots), 16)
         self.assertIsInstance(tweek.slots[0], PlayerWeek)
 
+    def test_team_week_json(self):
+        tweek = TeamWeek(self.roster_data, self.scoring_period)
+        data = tweek.to_json()
+        for key in ("team_id", "scoring_period", "points", "slots"):
+            self.assertIn(key, data)
+        self.assertEqual(len(data["slots"]), 16)
+
     def test_missing_player_id(self):
         new_data = {**self.roster_data}
         new_data["rosterForCurrentScoringPeriod"]["entries"][0]["playerId"] = None
         tweek = TeamWeek(new_data, self.scoring_period)
         self.assertEqual(len(tweek.slots), 15)
+
+    def test_lazy_slots(self):
+        tweek = TeamWeek(self.roster_data, self.scoring_period)
+        self.assertIsNone(tweek._slots)
+        streamed = list(tweek.iter_slots())
+        self.assertEqual(len(streamed), 16)
+        # iterating does not materialize slots
+        self.assertIsNone(tweek._slots)
+        slots = tweek.slots
+        self.assertIs(tweek.slots, slots)
+        self.assertIsNone(tweek._entries)
+        self.assertEqual(list(tweek.iter_slots()), slots)
@@ -1,8 +1,8 @@
 import datetime
 from unittest import TestCase
 
-from espyn.utils import (_labor_day, current_season,
-                         get_week_from_date)
+from espyn.utils import (_labor_day, current_season, current_week,
+                         get_week_from_date, SeasonCalendar)
 
 
 class UtilTests(TestCase):
@@ -23,3 +23,29 @@ class UtilTests(TestCase):
         year = today.year
         curr = current_season()
         self.assertTrue(year - 1 <= curr <= year)
+
+    def test_labor_day_first(self):
+        # September 1st is a Monday
+        self.assertEqual(_labor_day(2025), datetime.datetime(2025, 9, 1))
+
+    def test_calendar(self):
+        cal = SeasonCalendar(datetime.date(2020, 11, 15))
+        self.assertEqual(cal.now(), datetime.datetime(2020, 11, 15))
+        self.assertEqual(cal.season(), 2020)
+        self.assertEqual(cal.week(), 10)
+        self.assertEqual(cal.week(2019), 63)
+        self.assertEqual(SeasonCalendar.week_one(2020),
+                         datetime.datetime(2020, 9, 9))
+        jan = SeasonCalendar(datetime.datetime(2021, 1, 10))
+        self.assertEqual(jan.season(), 2020)
+        self.assertEqual(jan.week(), 18)
+        self.assertLess(jan.week(2021), 1)
+        self.assertIn("2021-01-10", repr(jan))
+
+    def test_calendar_clock(self):
+        now = [datetime.datetime(2020, 9, 9)]
+        cal = SeasonCalendar(clock=lambda: now[0])
+        self.assertEqual(cal.week(), 1)
+        now[0] += datetime.timedelta(days=7)
+        self.assertEqual(cal.week(), 2)
+        self.assertEqual(current_week(), SeasonCalendar().week())